@@ -0,0 +1,232 @@
+import asyncio
+import datetime
+import json
+import logging
+import os
+import time
+from datetime import UTC
+
+import discord
+
+from question_manager import get_question_set, load_questions
+from storage_manager import get_guild_directory, get_guild_ids
+
+logger = logging.getLogger(__name__)
+WAITLIST_FILE = "waitlist.json"
+WAITLIST_CHECK_INTERVAL = 5
+WAITLIST_BATCH_SIZE = 10
+WAITLIST_MAX_ATTEMPTS = 3
+SELECTION_COOLDOWN = float(os.getenv("SELECTION_COOLDOWN", "3") or 3)
+last_selections = {}
+
+
+def is_throttled(user_id):
+    now = time.monotonic()
+    last = last_selections.get(user_id)
+    if last is not None and now - last < SELECTION_COOLDOWN:
+        return True
+    if len(last_selections) > 10000:
+        for key, value in list(last_selections.items()):
+            if now - value >= SELECTION_COOLDOWN:
+                del last_selections[key]
+    last_selections[user_id] = now
+    return False
+
+
+def count_active_sessions(active_applications, guild_id, position, time_limit):
+    cutoff = datetime.datetime.now(UTC) - datetime.timedelta(minutes=time_limit)
+    count = 0
+    for application in active_applications.values():
+        if application.get("position") != position or str(
+            application.get("guild_id")
+        ) != str(guild_id):
+            continue
+        opened_at = application.get("start_time") or application.get("created_at")
+        if opened_at and datetime.datetime.fromisoformat(opened_at) > cutoff:
+            count += 1
+    return count
+
+
+def get_free_slots(active_applications, guild_id, position, position_settings):
+    max_sessions = position_settings.get("max_active_sessions", 0)
+    if not max_sessions:
+        return None
+    active = count_active_sessions(
+        active_applications,
+        guild_id,
+        position,
+        position_settings.get("time_limit", 60),
+    )
+    return max(0, max_sessions - active)
+
+
+def is_position_full(active_applications, guild_id, position, position_settings):
+    free_slots = get_free_slots(
+        active_applications, guild_id, position, position_settings
+    )
+    if free_slots is None:
+        return False
+    return free_slots == 0 or bool(load_waitlist(guild_id).get(position))
+
+
+def get_waitlist_path(guild_id=None):
+    return os.path.join(get_guild_directory(guild_id), WAITLIST_FILE)
+
+
+def load_waitlist(guild_id=None):
+    waitlist_path = get_waitlist_path(guild_id)
+    if not os.path.exists(waitlist_path):
+        return {}
+    try:
+        with open(waitlist_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Error loading waitlist: {e}")
+        return {}
+
+
+def save_waitlist(waitlist, guild_id=None):
+    try:
+        with open(get_waitlist_path(guild_id), "w") as f:
+            json.dump(waitlist, f, indent=4)
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        logger.error(f"Error saving waitlist: {e}")
+        return False
+
+
+def join_waitlist(guild_id, position, user, panel_id):
+    waitlist = load_waitlist(guild_id)
+    entries = waitlist.setdefault(position, [])
+    for place, entry in enumerate(entries, 1):
+        if entry["user_id"] == str(user.id):
+            return place
+    entries.append(
+        {
+            "user_id": str(user.id),
+            "user_name": user.name,
+            "panel_id": panel_id,
+            "queued_at": datetime.datetime.now(UTC).isoformat(),
+        }
+    )
+    save_waitlist(waitlist, guild_id)
+    return len(entries)
+
+
+async def open_session(bot, guild_id, position, entry):
+    from application_components import ApplicationStartView, save_active_applications
+
+    user_id = entry["user_id"]
+    question_set, questions = get_question_set(position, guild_id)
+    if not questions:
+        logger.error(f"No questions loaded for position {position}")
+        return False
+    application_data = {
+        "user_id": user_id,
+        "user_name": entry["user_name"],
+        "position": position,
+        "question_set": question_set,
+        "answers": [],
+        "current_question": 0,
+        "panel_id": entry["panel_id"],
+        "guild_id": guild_id,
+        "created_at": datetime.datetime.now(UTC).isoformat(),
+    }
+    bot.active_applications[user_id] = application_data
+    save_active_applications(bot.active_applications)
+    try:
+        user = bot.get_user(int(user_id)) or await bot.fetch_user(int(user_id))
+        dm = await user.create_dm()
+        position_settings = load_questions(guild_id).get(position, {})
+        welcome_message = position_settings.get(
+            "welcome_message", f"Thank you for applying for the {position} position!"
+        )
+        embed = discord.Embed(
+            title=f"{position} Application",
+            description=f"A slot has opened up and it's your turn!\n\n{welcome_message.format(position=position)}",
+            color=discord.Color.blue(),
+        )
+        message = await dm.send(
+            embed=embed, view=ApplicationStartView(bot, application_data)
+        )
+        application_data["message_id"] = str(message.id)
+        save_active_applications(bot.active_applications)
+        return True
+    except (discord.HTTPException, IndexError, KeyError, ValueError) as e:
+        logger.error(f"Error admitting waitlisted user {user_id} for {position}: {e}")
+        if bot.active_applications.get(user_id) is application_data:
+            del bot.active_applications[user_id]
+            save_active_applications(bot.active_applications)
+        return False
+
+
+def requeue_entries(guild_id, failed):
+    waitlist = load_waitlist(guild_id)
+    for position, entry in reversed(failed):
+        attempts = entry.get("attempts", 0) + 1
+        if attempts >= WAITLIST_MAX_ATTEMPTS:
+            logger.warning(
+                f"Removing waitlisted user {entry['user_id']} for {position} after {attempts} failed attempts"
+            )
+            continue
+        entries = waitlist.setdefault(position, [])
+        if all(queued["user_id"] != entry["user_id"] for queued in entries):
+            entries.insert(0, {**entry, "attempts": attempts})
+    save_waitlist(waitlist, guild_id)
+
+
+async def admit_waitlisted(bot):
+    for guild_id in get_guild_ids():
+        waitlist = load_waitlist(guild_id)
+        if not waitlist:
+            continue
+        questions = load_questions(guild_id)
+        admitted = []
+        changed = False
+        for position, entries in list(waitlist.items()):
+            free_slots = get_free_slots(
+                bot.active_applications, guild_id, position, questions.get(position, {})
+            )
+            if free_slots is None:
+                free_slots = len(entries)
+            remaining = []
+            for entry in entries:
+                active_app = bot.active_applications.get(entry["user_id"])
+                if active_app and active_app.get("position") == position:
+                    changed = True
+                elif (
+                    active_app is None
+                    and free_slots > 0
+                    and len(admitted) < WAITLIST_BATCH_SIZE
+                ):
+                    admitted.append((position, entry))
+                    free_slots -= 1
+                    changed = True
+                else:
+                    remaining.append(entry)
+            if remaining:
+                waitlist[position] = remaining
+            else:
+                del waitlist[position]
+        if not changed:
+            continue
+        save_waitlist(waitlist, guild_id)
+        failed = []
+        for position, entry in admitted:
+            if await open_session(bot, guild_id, position, entry):
+                logger.info(
+                    f"Admitted waitlisted user {entry['user_id']} for {position}"
+                )
+            else:
+                failed.append((position, entry))
+        if failed:
+            requeue_entries(guild_id, failed)
+
+
+async def run_waitlist(bot):
+    while not bot.is_closed():
+        try:
+            await admit_waitlisted(bot)
+        except Exception:
+            logger.exception("Error admitting waitlisted applicants")
+        await asyncio.sleep(WAITLIST_CHECK_INTERVAL)
@@ -0,0 +1,374 @@
+import contextlib
+import datetime
+import fcntl
+import json
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+ANALYTICS_DIRECTORY = "analytics"
+HEADERS_FILE = "headers.npz"
+JOURNAL_FILE = "journal.jsonl"
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+STATUSES = ("pending", "approved", "rejected", "deleted")
+PERCENTILES = (50, 90, 99)
+columns_cache = {}
+
+
+def get_analytics_directory(directory):
+    return os.path.join(directory, ANALYTICS_DIRECTORY)
+
+
+def analytics_exists(directory):
+    return os.path.exists(
+        os.path.join(get_analytics_directory(directory), HEADERS_FILE)
+    )
+
+
+@contextlib.contextmanager
+def lock_analytics(directory):
+    analytics_directory = get_analytics_directory(directory)
+    os.makedirs(analytics_directory, exist_ok=True)
+    with open(os.path.join(analytics_directory, "lock"), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield analytics_directory
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def get_timestamp(value):
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def get_header(app_id, application):
+    processed_by = application.get("processed_by") or {}
+    status = application.get("status", "pending")
+    return [
+        app_id,
+        application.get("position", ""),
+        status if status in STATUSES else "pending",
+        get_timestamp(application.get("submitted_at")),
+        get_timestamp(processed_by.get("timestamp")),
+        str(processed_by.get("id", "")),
+        processed_by.get("name", ""),
+    ]
+
+
+class HeaderColumns:
+    def __init__(self, data=None, mtime=None):
+        self.mtime = mtime
+        self.journal_offset = 0
+        if data is None:
+            self.ids = []
+            self.positions = []
+            self.reviewers = []
+            self.reviewer_names = []
+            self.position = np.zeros(0, np.int32)
+            self.status = np.zeros(0, np.int8)
+            self.reviewer = np.zeros(0, np.int32)
+            self.submitted = np.zeros(0, np.float64)
+            self.processed = np.zeros(0, np.float64)
+        else:
+            self.ids = data["ids"].tolist()
+            self.positions = data["positions"].tolist()
+            self.reviewers = data["reviewers"].tolist()
+            self.reviewer_names = data["reviewer_names"].tolist()
+            self.position = data["position"]
+            self.status = data["status"]
+            self.reviewer = data["reviewer"]
+            self.submitted = data["submitted"]
+            self.processed = data["processed"]
+        self.rows = dict(zip(self.ids, range(len(self.ids))))
+        self.position_codes = dict(zip(self.positions, range(len(self.positions))))
+        self.reviewer_codes = dict(zip(self.reviewers, range(len(self.reviewers))))
+
+    @classmethod
+    def load(cls, path, mtime):
+        with np.load(path) as data:
+            return cls(data, mtime)
+
+    def save(self, path):
+        with open(f"{path}.tmp", "wb") as f:
+            np.savez(
+                f,
+                ids=np.array(self.ids, dtype=str),
+                positions=np.array(self.positions, dtype=str),
+                reviewers=np.array(self.reviewers, dtype=str),
+                reviewer_names=np.array(self.reviewer_names, dtype=str),
+                position=self.position,
+                status=self.status,
+                reviewer=self.reviewer,
+                submitted=self.submitted,
+                processed=self.processed,
+            )
+        os.replace(f"{path}.tmp", path)
+        self.mtime = os.path.getmtime(path)
+
+    def get_position_code(self, position):
+        code = self.position_codes.get(position)
+        if code is None:
+            code = self.position_codes[position] = len(self.positions)
+            self.positions.append(position)
+        return code
+
+    def get_reviewer_code(self, reviewer_id, reviewer_name):
+        if not reviewer_id:
+            return -1
+        code = self.reviewer_codes.get(reviewer_id)
+        if code is None:
+            code = self.reviewer_codes[reviewer_id] = len(self.reviewers)
+            self.reviewers.append(reviewer_id)
+            self.reviewer_names.append(reviewer_name)
+        elif reviewer_name:
+            self.reviewer_names[code] = reviewer_name
+        return code
+
+    def apply(self, headers):
+        latest = {header[0]: header for header in headers}
+        if not latest:
+            return
+        new_ids = [app_id for app_id in latest if app_id not in self.rows]
+        if new_ids:
+            self.rows.update(
+                zip(new_ids, range(len(self.ids), len(self.ids) + len(new_ids)))
+            )
+            self.ids.extend(new_ids)
+            grow = len(new_ids)
+            self.position = np.concatenate([self.position, np.zeros(grow, np.int32)])
+            self.status = np.concatenate([self.status, np.zeros(grow, np.int8)])
+            self.reviewer = np.concatenate([self.reviewer, np.zeros(grow, np.int32)])
+            self.submitted = np.concatenate([self.submitted, np.zeros(grow)])
+            self.processed = np.concatenate([self.processed, np.zeros(grow)])
+        rows = np.array([self.rows[app_id] for app_id in latest], np.int64)
+        headers = list(latest.values())
+        self.position[rows] = [self.get_position_code(header[1]) for header in headers]
+        self.status[rows] = [STATUSES.index(header[2]) for header in headers]
+        self.reviewer[rows] = [
+            self.get_reviewer_code(header[5], header[6]) for header in headers
+        ]
+        self.submitted[rows] = np.array([header[3] for header in headers], np.float64)
+        self.processed[rows] = np.array([header[4] for header in headers], np.float64)
+
+    def read_journal(self, path):
+        try:
+            with open(path, "rb") as f:
+                f.seek(self.journal_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1
+        if end:
+            self.apply(json.loads(line) for line in data[:end].splitlines())
+            self.journal_offset += end
+
+
+def get_paths(directory):
+    analytics_directory = get_analytics_directory(directory)
+    return (
+        os.path.join(analytics_directory, HEADERS_FILE),
+        os.path.join(analytics_directory, JOURNAL_FILE),
+    )
+
+
+def append_headers(directory, headers):
+    try:
+        with (
+            lock_analytics(directory) as analytics_directory,
+            open(os.path.join(analytics_directory, JOURNAL_FILE), "a") as f,
+        ):
+            f.write("".join(json.dumps(header) + "\n" for header in headers))
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        logger.error(f"Error updating analytics headers in {directory}: {e}")
+        return False
+
+
+def record_header(directory, app_id, application):
+    return append_headers(directory, [get_header(app_id, application)])
+
+
+def remove_header(directory, app_id):
+    return append_headers(directory, [[app_id, "", "deleted", None, None, "", ""]])
+
+
+def rebuild_headers(directory, applications):
+    columns = HeaderColumns()
+    columns.apply(
+        get_header(app_id, application) for app_id, application in applications
+    )
+    headers_path, journal_path = get_paths(directory)
+    with lock_analytics(directory):
+        columns.save(headers_path)
+        open(journal_path, "w").close()
+    columns_cache[directory] = columns
+    return len(columns.ids)
+
+
+def compact_headers(directory, columns):
+    headers_path, journal_path = get_paths(directory)
+    with lock_analytics(directory):
+        columns.read_journal(journal_path)
+        columns.save(headers_path)
+        open(journal_path, "w").close()
+        columns.journal_offset = 0
+
+
+def get_columns(directory):
+    headers_path, journal_path = get_paths(directory)
+    mtime = os.path.getmtime(headers_path)
+    columns = columns_cache.get(directory)
+    journal_size = os.path.getsize(journal_path) if os.path.exists(journal_path) else 0
+    if (
+        columns is None
+        or columns.mtime != mtime
+        or journal_size < columns.journal_offset
+    ):
+        columns = columns_cache[directory] = HeaderColumns.load(headers_path, mtime)
+    columns.read_journal(journal_path)
+    if columns.journal_offset > JOURNAL_COMPACT_BYTES:
+        compact_headers(directory, columns)
+    return columns
+
+
+def get_group_percentiles(groups, values, group_count):
+    order = np.lexsort((values, groups))
+    values = values[order]
+    counts = np.bincount(groups, minlength=group_count)
+    starts = np.cumsum(counts) - counts
+    result = np.full((group_count, len(PERCENTILES)), np.nan)
+    present = counts > 0
+    ranks = starts[present, None] + np.array(PERCENTILES) / 100 * (
+        counts[present, None] - 1
+    )
+    lower = np.floor(ranks).astype(np.int64)
+    upper = np.minimum(lower + 1, (starts + counts - 1)[present, None])
+    weight = ranks - lower
+    result[present] = values[lower] * (1 - weight) + values[upper] * weight
+    return result
+
+
+def get_group_means(groups, values, group_count):
+    counts = np.bincount(groups, minlength=group_count)
+    totals = np.bincount(groups, weights=values, minlength=group_count)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return totals / counts
+
+
+def to_hours(seconds):
+    return None if np.isnan(seconds) else round(float(seconds) / 3600, 2)
+
+
+def get_rate(numerator, denominator):
+    return round(numerator / denominator, 4) if denominator else None
+
+
+def get_report(directory, since=None, positions=None, sessions=None):
+    columns = get_columns(directory)
+    position_count = len(columns.positions)
+    reviewer_count = len(columns.reviewers)
+    approved = STATUSES.index("approved")
+    rejected = STATUSES.index("rejected")
+    mask = columns.status != STATUSES.index("deleted")
+    if positions is not None:
+        allowed = [
+            columns.position_codes[p] for p in positions if p in columns.position_codes
+        ]
+        mask &= np.isin(columns.position, allowed)
+    decided_at = np.where(
+        np.isnan(columns.processed), columns.submitted, columns.processed
+    )
+    submitted_mask = mask
+    decided_mask = mask & ((columns.status == approved) | (columns.status == rejected))
+    if since is not None:
+        submitted_mask = mask & (columns.submitted >= since)
+        decided_mask &= decided_at >= since
+    elapsed = columns.processed - columns.submitted
+    timed_mask = decided_mask & ~np.isnan(elapsed)
+
+    position = columns.position[submitted_mask]
+    status = columns.status[submitted_mask]
+    submitted_counts = np.bincount(position, minlength=position_count)
+    status_counts = np.bincount(
+        position * len(STATUSES) + status,
+        minlength=position_count * len(STATUSES),
+    ).reshape(position_count, len(STATUSES))
+    timed_position = columns.position[timed_mask]
+    timed_elapsed = elapsed[timed_mask]
+    position_means = get_group_means(timed_position, timed_elapsed, position_count)
+    position_percentiles = get_group_percentiles(
+        timed_position, timed_elapsed, position_count
+    )
+
+    report_positions = {}
+    sessions = sessions or {}
+    names = {columns.positions[code] for code in np.flatnonzero(submitted_counts)}
+    for name in sorted(names | set(sessions)):
+        code = columns.position_codes.get(name)
+        counts = status_counts[code] if code is not None else np.zeros(len(STATUSES))
+        submitted = int(submitted_counts[code]) if code is not None else 0
+        started = int(sessions.get(name, {}).get("started", 0))
+        report_positions[name] = {
+            "started": started,
+            "expired": int(sessions.get(name, {}).get("expired", 0)),
+            "cancelled": int(sessions.get(name, {}).get("cancelled", 0)),
+            "submitted": submitted,
+            "pending": int(counts[STATUSES.index("pending")]),
+            "approved": int(counts[approved]),
+            "rejected": int(counts[rejected]),
+            "completion_rate": get_rate(submitted, started),
+            "approval_rate": get_rate(
+                int(counts[approved]), int(counts[approved] + counts[rejected])
+            ),
+            "decision_hours": {
+                "mean": to_hours(position_means[code]) if code is not None else None,
+                **{
+                    f"p{percentile}": to_hours(position_percentiles[code, i])
+                    if code is not None
+                    else None
+                    for i, percentile in enumerate(PERCENTILES)
+                },
+            },
+        }
+
+    reviewer_mask = decided_mask & (columns.reviewer >= 0)
+    reviewer = columns.reviewer[reviewer_mask]
+    decisions = np.bincount(reviewer, minlength=reviewer_count)
+    approvals = np.bincount(
+        reviewer,
+        weights=columns.status[reviewer_mask] == approved,
+        minlength=reviewer_count,
+    )
+    timed_reviewer_mask = reviewer_mask & timed_mask
+    timed_reviewer = columns.reviewer[timed_reviewer_mask]
+    reviewer_means = get_group_means(
+        timed_reviewer, elapsed[timed_reviewer_mask], reviewer_count
+    )
+    reviewer_percentiles = get_group_percentiles(
+        timed_reviewer, elapsed[timed_reviewer_mask], reviewer_count
+    )
+    report_reviewers = [
+        {
+            "id": columns.reviewers[code],
+            "name": columns.reviewer_names[code],
+            "decided": int(decisions[code]),
+            "approved": int(approvals[code]),
+            "rejected": int(decisions[code] - approvals[code]),
+            "mean_hours": to_hours(reviewer_means[code]),
+            "median_hours": to_hours(reviewer_percentiles[code, 0]),
+        }
+        for code in np.argsort(-decisions, kind="stable")
+        if decisions[code]
+    ]
+    return {
+        "records": int(submitted_mask.sum()),
+        "positions": report_positions,
+        "reviewers": report_reviewers,
+    }
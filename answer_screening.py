@@ -0,0 +1,204 @@
+import collections
+import json
+import logging
+import os
+import re
+import unicodedata
+
+from question_manager import get_questions_file, load_questions
+from storage_manager import get_guild_directory
+
+logger = logging.getLogger(__name__)
+BLOCKLISTS_FILE = "blocklists.json"
+SCREENING_ACTIONS = ("flag", "reject")
+IGNORED_PATTERN = re.compile(
+    "[\u0300-\u036f\u00ad\u034f\u061c\u115f\u1160\u17b4\u17b5\u180e"
+    "\u200b-\u200f\u202a-\u202e\u2060-\u206f\u3164\ufe00-\ufe0f\ufeff\uffa0]"
+)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+CONFUSABLES = str.maketrans(
+    {
+        "а": "a",
+        "г": "r",
+        "е": "e",
+        "ё": "e",
+        "о": "o",
+        "р": "p",
+        "с": "c",
+        "у": "y",
+        "х": "x",
+        "ѕ": "s",
+        "і": "i",
+        "ї": "i",
+        "ј": "j",
+        "ԁ": "d",
+        "ԛ": "q",
+        "ԝ": "w",
+        "һ": "h",
+        "ɑ": "a",
+        "ɡ": "g",
+        "ɩ": "i",
+        "ο": "o",
+        "α": "a",
+        "β": "b",
+        "ε": "e",
+        "η": "n",
+        "ι": "i",
+        "κ": "k",
+        "ν": "v",
+        "ρ": "p",
+        "τ": "t",
+        "υ": "u",
+        "χ": "x",
+        "ω": "w",
+        "ı": "i",
+        "ł": "l",
+        "ø": "o",
+        "đ": "d",
+        "ħ": "h",
+    }
+)
+screens = {}
+
+
+def fold_text(text):
+    text = unicodedata.normalize("NFKC", str(text)).casefold()
+    text = unicodedata.normalize("NFD", text)
+    text = IGNORED_PATTERN.sub("", text).translate(CONFUSABLES)
+    return WHITESPACE_PATTERN.sub(" ", text)
+
+
+class PatternAutomaton:
+    def __init__(self, patterns):
+        self.patterns = []
+        self.transitions = [{}]
+        self.fail = [0]
+        self.outputs = [()]
+        for pattern in patterns:
+            folded = fold_text(pattern).strip()
+            if not folded:
+                continue
+            node = 0
+            for char in folded:
+                child = self.transitions[node].get(char)
+                if child is None:
+                    child = self.transitions[node][char] = len(self.transitions)
+                    self.transitions.append({})
+                    self.fail.append(0)
+                    self.outputs.append(())
+                node = child
+            self.outputs[node] += (len(self.patterns),)
+            self.patterns.append(pattern)
+        queue = collections.deque(self.transitions[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.transitions[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.transitions[fallback].get(char, 0)
+                self.outputs[child] += self.outputs[self.fail[child]]
+
+    def find(self, text):
+        transitions = self.transitions
+        fail = self.fail
+        outputs = self.outputs
+        found = set()
+        node = 0
+        for char in fold_text(text):
+            while node and char not in transitions[node]:
+                node = fail[node]
+            node = transitions[node].get(char, 0)
+            if outputs[node]:
+                found.update(outputs[node])
+        return [self.patterns[index] for index in sorted(found)]
+
+
+def get_blocklists_path(guild_id=None):
+    return os.path.join(get_guild_directory(guild_id), BLOCKLISTS_FILE)
+
+
+def load_blocklists(guild_id=None):
+    blocklists_path = get_blocklists_path(guild_id)
+    if not os.path.exists(blocklists_path):
+        return {}
+    try:
+        with open(blocklists_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Error loading blocklists: {e}")
+        return {}
+
+
+def save_blocklists(blocklists, guild_id=None):
+    try:
+        blocklists_path = get_blocklists_path(guild_id)
+        with open(f"{blocklists_path}.tmp", "w") as f:
+            json.dump(blocklists, f, indent=4)
+        os.replace(f"{blocklists_path}.tmp", blocklists_path)
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        logger.error(f"Error saving blocklists: {e}")
+        return False
+
+
+def save_blocklist(position, patterns, guild_id=None):
+    blocklists = load_blocklists(guild_id)
+    patterns = [pattern.strip() for pattern in patterns if pattern.strip()]
+    if patterns:
+        blocklists[position] = patterns
+    elif blocklists.pop(position, None) is None:
+        return True
+    return save_blocklists(blocklists, guild_id)
+
+
+def rename_blocklist(old_position, new_position, guild_id=None):
+    blocklists = load_blocklists(guild_id)
+    if old_position not in blocklists:
+        return True
+    blocklists[new_position] = blocklists.pop(old_position)
+    return save_blocklists(blocklists, guild_id)
+
+
+def get_version(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def get_screen(guild_id, position):
+    blocklists_path = get_blocklists_path(guild_id)
+    version = get_version(blocklists_path)
+    if version is None:
+        return None, "flag"
+    version = (version, get_version(get_questions_file(guild_id)))
+    key = (blocklists_path, position)
+    screen = screens.get(key)
+    if screen is None or screen[0] != version:
+        patterns = load_blocklists(guild_id).get(position, [])
+        action = load_questions(guild_id).get(position, {}).get("screening_action")
+        automaton = PatternAutomaton(patterns) if patterns else None
+        if automaton is not None and not automaton.patterns:
+            automaton = None
+        screen = screens[key] = (
+            version,
+            automaton,
+            action if action in SCREENING_ACTIONS else "flag",
+        )
+    return screen[1], screen[2]
+
+
+def screen_answers(guild_id, position, answers, start=0):
+    automaton, action = get_screen(guild_id, position)
+    if automaton is None:
+        return action, []
+    matches = []
+    for offset, answer in enumerate(answers):
+        patterns = automaton.find(answer)
+        if patterns:
+            matches.append(
+                {"question": start + offset, "answer": answer, "patterns": patterns}
+            )
+    return action, matches
@@ -1,23 +1,93 @@
+import asyncio
+import contextlib
 import datetime
 import json
 import logging
 import os
-import pathlib
 import traceback
 import uuid
 from datetime import UTC
 import discord
 from discord.ui import Button, Item, Modal, Select, TextInput, View
-from dotenv import load_dotenv
+from admission_manager import is_position_full, is_throttled, join_waitlist
+from answer_screening import screen_answers
+from digest_manager import get_application_url, queue_submission
+from member_cache import get_member
 from panels_manager import load_panels
-from question_manager import get_questions, load_questions
+from question_manager import (
+    get_application_question_set,
+    get_application_questions,
+    get_question_set,
+    load_questions,
+)
+from rest_metrics import track_flow
+from storage_manager import (
+    STORAGE_DIRECTORY,
+    get_application_duplicates,
+    get_last_submission_time,
+    load_application,
+    record_event,
+    save_application,
+)
 
 logger = logging.getLogger(__name__)
-load_dotenv()
-pathlib.Path("storage").mkdir(exist_ok=True)
-APPS_DIRECTORY = "storage/applications"
-pathlib.Path(APPS_DIRECTORY).mkdir(exist_ok=True)
-ACTIVE_APPS_FILE = os.path.join("storage", "active_applications.json")
+ACTIVE_APPS_FILE = os.path.join(STORAGE_DIRECTORY, "active_applications.json")
+REVIEW_CLAIM_TTL = int(os.getenv("REVIEW_CLAIM_TTL", "900") or 900)
+QUESTIONS_PER_PAGE = 5
+PANEL_REFRESH_DELAY = float(os.getenv("PANEL_REFRESH_DELAY", "2") or 2)
+applicant_locks = {}
+panel_refreshes = {}
+
+
+def apply_screening(application, answers, start):
+    action, matches = screen_answers(
+        application.get("guild_id"), application["position"], answers, start
+    )
+    if not matches:
+        return False
+    checked_at = datetime.datetime.now(UTC).isoformat()
+    for match in matches:
+        entry = {
+            "question": match["question"],
+            "patterns": match["patterns"],
+            "action": "rejected" if action == "reject" else "flagged",
+            "checked_at": checked_at,
+        }
+        if action == "reject":
+            entry["answer"] = match["answer"]
+        application.setdefault("screening", []).append(entry)
+    return action == "reject"
+
+
+def add_screening_field(embed, screening):
+    if not screening:
+        return embed
+    embed.add_field(
+        name="🚩 Screening matches",
+        value="\n".join(
+            f"• Question {entry['question'] + 1}: {', '.join(entry['patterns'])} "
+            f"({entry['action']})"
+            for entry in screening
+        )[:1024],
+        inline=False,
+    )
+    return embed
+
+
+def add_duplicates_field(embed, duplicates):
+    if not duplicates:
+        return embed
+    embed.add_field(
+        name="⚠️ Possible duplicate answers",
+        value="\n".join(
+            f"• <@{duplicate['user_id']}> ({duplicate['user_name']}) - "
+            f"[{duplicate['position']}]({get_application_url(duplicate['id'])}), "
+            f"{int(duplicate['similarity'] * 100)}% similar"
+            for duplicate in duplicates
+        )[:1024],
+        inline=False,
+    )
+    return embed
 
 
 async def get_dm_link(bot, user):
@@ -43,8 +113,6 @@ def load_active_applications():
 
 def save_active_applications(applications):
     try:
-        if not os.path.exists(APPS_DIRECTORY):
-            os.makedirs(APPS_DIRECTORY)
         with open(ACTIVE_APPS_FILE, "w") as f:
             json.dump(applications, f, indent=4)
         return True
@@ -53,34 +121,71 @@ def save_active_applications(applications):
         return False
 
 
+@contextlib.asynccontextmanager
+async def applicant_lock(user_id):
+    entry = applicant_locks.get(user_id)
+    if entry is None:
+        entry = applicant_locks[user_id] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0 and applicant_locks.get(user_id) is entry:
+            del applicant_locks[user_id]
+
+
+@track_flow("answer")
 async def handle_dm_message(bot, message):
     if not isinstance(message.channel, discord.DMChannel):
         return
     if message.author.bot:
         return
+    async with applicant_lock(str(message.author.id)):
+        await process_dm_message(bot, message)
+
+
+def get_expired_time_limit(application):
+    if "start_time" not in application:
+        return None
+    start_time = datetime.datetime.fromisoformat(application["start_time"])
+    current_time = datetime.datetime.now(UTC)
+    time_elapsed = (current_time - start_time).total_seconds() / 60
+    questions = load_questions(application.get("guild_id"))
+    position_settings = questions.get(application["position"], {})
+    time_limit = position_settings.get("time_limit", 60)
+    if time_elapsed > time_limit:
+        return time_limit
+    return None
+
+
+async def process_dm_message(bot, message):
     if not hasattr(bot, "active_applications"):
         bot.active_applications = load_active_applications()
     application = bot.active_applications.get(str(message.author.id))
     if not application:
         return
-    if "start_time" not in application:
+    if "start_time" not in application or application.get("answer_mode") == "modal":
+        return
+    guild_id = application.get("guild_id")
+    time_limit = get_expired_time_limit(application)
+    if time_limit is not None:
+        record_event(application["position"], "expired", guild_id)
+        await message.channel.send(
+            f"⌛ Your application has expired. You had {time_limit} minutes to complete it. Please start a new application if you wish to apply."
+        )
+        del bot.active_applications[str(message.author.id)]
+        save_active_applications(bot.active_applications)
         return
-    if "start_time" in application:
-        start_time = datetime.datetime.fromisoformat(application["start_time"])
-        current_time = datetime.datetime.now(UTC)
-        time_elapsed = (current_time - start_time).total_seconds() / 60
-        questions = load_questions()
-        position_settings = questions.get(application["position"], {})
-        time_limit = position_settings.get("time_limit", 60)
-        if time_elapsed > time_limit:
-            await message.channel.send(
-                f"⌛ Your application has expired. You had {time_limit} minutes to complete it. Please start a new application if you wish to apply."
-            )
-            del bot.active_applications[str(message.author.id)]
-            save_active_applications(bot.active_applications)
-            return
     current_question = application["current_question"]
-    questions = application["questions"]
+    if apply_screening(application, [message.content], current_question):
+        save_active_applications(bot.active_applications)
+        await message.channel.send(
+            "⚠️ Your answer contains content that isn't allowed in this application. Please answer the question again."
+        )
+        return
+    questions = get_application_questions(application)
     application["answers"].append(message.content)
     if current_question + 1 < len(questions):
         application["current_question"] += 1
@@ -89,89 +194,101 @@ async def handle_dm_message(bot, message):
         )
         save_active_applications(bot.active_applications)
     else:
-        application_id = str(uuid.uuid4())
-        application_data = {
-            "id": application_id,
-            "user_id": application["user_id"],
-            "user_name": application["user_name"],
-            "position": application["position"],
-            "questions": application["questions"],
-            "answers": application["answers"],
-            "status": "pending",
-        }
-        app_path = os.path.join(APPS_DIRECTORY, f"{application_id}.json")
-        with open(app_path, "w") as f:
-            json.dump(application_data, f)
-        del bot.active_applications[str(message.author.id)]
-        save_active_applications(bot.active_applications)
-        questions = load_questions()
-        position_settings = questions.get(application["position"], {})
-        completion_message = position_settings.get(
-            "completion_message",
-            f"Thank you for completing your application for {application['position']}! Your responses have been submitted and will be reviewed soon.",
+        await submit_application(
+            bot, message.author, message.channel, application, guild_id
         )
-        embed = discord.Embed(
-            title=f"{application['position']} Application Submitted",
-            description=completion_message.format(position=application["position"]),
-            color=discord.Color.green(),
+
+
+@track_flow("submit")
+async def submit_application(bot, user, channel, application, guild_id):
+    application_id = str(uuid.uuid4())
+    application_data = {
+        "id": application_id,
+        "guild_id": guild_id,
+        "user_id": application["user_id"],
+        "user_name": application["user_name"],
+        "position": application["position"],
+        "question_set": get_application_question_set(application, guild_id),
+        "answers": application["answers"],
+        "status": "pending",
+        "submitted_at": datetime.datetime.now(UTC).isoformat(),
+    }
+    if application.get("screening"):
+        application_data["screening"] = application["screening"]
+    save_application(application_id, application_data, guild_id)
+    del bot.active_applications[str(user.id)]
+    save_active_applications(bot.active_applications)
+    questions = load_questions(guild_id)
+    position_settings = questions.get(application["position"], {})
+    completion_message = position_settings.get(
+        "completion_message",
+        f"Thank you for completing your application for {application['position']}! Your responses have been submitted and will be reviewed soon.",
+    )
+    embed = discord.Embed(
+        title=f"{application['position']} Application Submitted",
+        description=completion_message.format(position=application["position"]),
+        color=discord.Color.green(),
+    )
+    await channel.send(embed=embed)
+    if position_settings.get("log_mode") == "digest":
+        queue_submission(
+            guild_id,
+            application["position"],
+            application_id,
+            user.id,
+            user.name,
         )
-        await message.channel.send(embed=embed)
-        questions = load_questions()
-        position_settings = questions.get(application["position"], {})
-        log_channel_id = position_settings.get("log_channel")
-        if log_channel_id:
-            try:
-                log_channel = bot.get_channel(int(log_channel_id))
-                if log_channel:
-                    web_host = os.getenv("WEB_HOST", "localhost")
-                    web_port = os.getenv("WEB_PORT", "8080")
-                    application_url = (
-                        f"http://{web_host}:{web_port}/application/{application_id}"
-                    )
-                    web_external = os.getenv("WEB_EXTERNAL")
-                    if web_external:
-                        application_url = f"{web_external}/application/{application_id}"
-                    embed = discord.Embed(
-                        title=f"{message.author.name}'s {application['position']} application",
-                        description=f"Applicant: {message.author.mention} ({message.author.id})",
-                        color=0x808080,
-                    )
+        return
+    log_channel_id = position_settings.get("log_channel")
+    if log_channel_id:
+        try:
+            log_channel = bot.get_channel(int(log_channel_id))
+            if log_channel:
+                application_url = get_application_url(application_id)
+                embed = discord.Embed(
+                    title=f"{user.name}'s {application['position']} application",
+                    description=f"Applicant: {user.mention} ({user.id})",
+                    color=0x808080,
+                )
+                embed.description += (
+                    f"\n\n[Click here to view the application]({application_url})"
+                )
+                guild = log_channel.guild
+                member = await get_member(guild, user.id)
+                if member and member.joined_at:
                     embed.description += (
-                        f"\n\n[Click here to view the application]({application_url})"
+                        f"\n\nJoined server: <t:{int(member.joined_at.timestamp())}:R>"
                     )
-                    guild = log_channel.guild
-                    member = guild.get_member(message.author.id)
-                    if member and member.joined_at:
-                        embed.description += f"\n\nJoined server: <t:{int(member.joined_at.timestamp())}:R>"
-                    embed.set_thumbnail(url=message.author.display_avatar.url)
-                    embed.set_footer(text=f"{application_id}")
-                    view = ApplicationResponseView(
-                        application_id, application["position"]
+                add_screening_field(embed, application_data.get("screening"))
+                duplicates = await asyncio.to_thread(
+                    get_application_duplicates, application_id, guild_id
+                )
+                add_duplicates_field(embed, duplicates)
+                embed.set_thumbnail(url=user.display_avatar.url)
+                embed.set_footer(text=f"{application_id}")
+                view = ApplicationResponseView(application_id, application["position"])
+                view.bot = bot
+                ping_mentions = ""
+                ping_roles = position_settings.get("ping_roles", [])
+                if ping_roles:
+                    ping_mentions = " ".join(
+                        [f"<@&{role_id}>" for role_id in ping_roles]
                     )
-                    view.bot = bot
-                    ping_mentions = ""
-                    ping_roles = position_settings.get("ping_roles", [])
-                    if ping_roles:
-                        ping_mentions = " ".join(
-                            [f"<@&{role_id}>" for role_id in ping_roles]
+                log_message = await log_channel.send(
+                    content=ping_mentions if ping_mentions else None,
+                    embed=embed,
+                    view=view,
+                )
+                if position_settings.get("auto_thread", False):
+                    try:
+                        thread_name = f"{application['position']} - {user.name}"
+                        await log_message.create_thread(
+                            name=thread_name, auto_archive_duration=1440
                         )
-                    log_message = await log_channel.send(
-                        content=ping_mentions if ping_mentions else None,
-                        embed=embed,
-                        view=view,
-                    )
-                    if position_settings.get("auto_thread", False):
-                        try:
-                            thread_name = (
-                                f"{application['position']} - {message.author.name}"
-                            )
-                            await log_message.create_thread(
-                                name=thread_name, auto_archive_duration=1440
-                            )
-                        except Exception as e:
-                            logger.error(f"Error creating thread: {e}")
-            except Exception as e:
-                logger.error(f"Error logging application: {e}")
+                    except Exception as e:
+                        logger.error(f"Error creating thread: {e}")
+        except Exception as e:
+            logger.error(f"Error logging application: {e}")
 
 
 class StaffApplicationSelect(Select):
@@ -187,10 +304,18 @@ class StaffApplicationSelect(Select):
             max_values=1,
         )
 
+    @track_flow("apply")
     async def callback(self, interaction: discord.Interaction):
         try:
+            if is_throttled(interaction.user.id):
+                await interaction.response.send_message(
+                    "You are selecting positions too quickly. Please wait a few seconds and try again.",
+                    ephemeral=True,
+                )
+                return
             position = self.values[0]
-            questions_data = load_questions()
+            guild_id = str(interaction.guild_id)
+            questions_data = load_questions(guild_id)
             position_settings = questions_data.get(position, {})
             if not position_settings.get("enabled", True):
                 await interaction.response.send_message(
@@ -220,6 +345,22 @@ class StaffApplicationSelect(Select):
                 )
                 await self.refresh_select_menu(interaction)
                 return
+            cooldown_days = position_settings.get("reapply_cooldown_days", 0)
+            if cooldown_days:
+                last_submission = await asyncio.to_thread(
+                    get_last_submission_time, interaction.user.id, position, guild_id
+                )
+                if last_submission:
+                    available_at = last_submission + datetime.timedelta(
+                        days=cooldown_days
+                    )
+                    if available_at > datetime.datetime.now(UTC):
+                        await interaction.response.send_message(
+                            f"You have already applied for {position} recently. You can apply again <t:{int(available_at.timestamp())}:R>.",
+                            ephemeral=True,
+                        )
+                        await self.refresh_select_menu(interaction)
+                        return
             if hasattr(self.view.bot, "active_applications"):
                 active_app = self.view.bot.active_applications.get(
                     str(interaction.user.id)
@@ -230,7 +371,7 @@ class StaffApplicationSelect(Select):
                         and active_app["panel_id"] == self.panel_id
                     ):
                         if "start_time" not in active_app:
-                            await interaction.response.defer(ephemeral=True)
+                            await interaction.response.edit_message(view=self.view)
                             del self.view.bot.active_applications[
                                 str(interaction.user.id)
                             ]
@@ -272,7 +413,9 @@ class StaffApplicationSelect(Select):
                                 )
                                 await self.refresh_select_menu(interaction)
                                 return
-                            questions = get_questions(position)
+                            question_set, questions = get_question_set(
+                                position, guild_id
+                            )
                             if not questions or len(questions) == 0:
                                 logger.error(
                                     f"No questions loaded for position {position}"
@@ -287,10 +430,12 @@ class StaffApplicationSelect(Select):
                                 "user_id": str(interaction.user.id),
                                 "user_name": interaction.user.name,
                                 "position": position,
-                                "questions": questions,
+                                "question_set": question_set,
                                 "answers": [],
                                 "current_question": 0,
                                 "panel_id": self.panel_id,
+                                "guild_id": guild_id,
+                                "created_at": datetime.datetime.now(UTC).isoformat(),
                             }
                             self.view.bot.active_applications[
                                 str(interaction.user.id)
@@ -298,7 +443,7 @@ class StaffApplicationSelect(Select):
                             save_active_applications(self.view.bot.active_applications)
                             try:
                                 dm = await interaction.user.create_dm()
-                                questions_data = load_questions()
+                                questions_data = load_questions(guild_id)
                                 position_settings = questions_data.get(position, {})
                                 welcome_message = position_settings.get(
                                     "welcome_message",
@@ -361,7 +506,7 @@ class StaffApplicationSelect(Select):
                             )
                         await self.refresh_select_menu(interaction)
                         return
-            questions = get_questions(position)
+            question_set, questions = get_question_set(position, guild_id)
             if not questions or len(questions) == 0:
                 logger.error(f"No questions loaded for position {position}")
                 await interaction.response.send_message(
@@ -370,7 +515,7 @@ class StaffApplicationSelect(Select):
                 )
                 await self.refresh_select_menu(interaction)
                 return
-            questions_data = load_questions()
+            questions_data = load_questions(guild_id)
             position_settings = questions_data.get(position, {})
             log_channel_id = position_settings.get("log_channel")
             if not log_channel_id:
@@ -381,14 +526,33 @@ class StaffApplicationSelect(Select):
                 )
                 await self.refresh_select_menu(interaction)
                 return
+            if not hasattr(self.view.bot, "active_applications"):
+                self.view.bot.active_applications = load_active_applications()
+            if is_position_full(
+                self.view.bot.active_applications,
+                guild_id,
+                position,
+                position_settings,
+            ):
+                place = join_waitlist(
+                    guild_id, position, interaction.user, self.panel_id
+                )
+                await interaction.response.send_message(
+                    f"All {position} application slots are taken right now. You are number {place} in the waitlist and will get a DM when a slot opens.",
+                    ephemeral=True,
+                )
+                await self.refresh_select_menu(interaction)
+                return
             application_data = {
                 "user_id": str(interaction.user.id),
                 "user_name": interaction.user.name,
                 "position": position,
-                "questions": questions,
+                "question_set": question_set,
                 "answers": [],
                 "current_question": 0,
                 "panel_id": self.panel_id,
+                "guild_id": guild_id,
+                "created_at": datetime.datetime.now(UTC).isoformat(),
             }
             if not hasattr(self.view.bot, "active_applications"):
                 self.view.bot.active_applications = load_active_applications()
@@ -396,11 +560,11 @@ class StaffApplicationSelect(Select):
                 application_data
             )
             save_active_applications(self.view.bot.active_applications)
-            await interaction.response.defer(ephemeral=True)
+            await interaction.response.edit_message(view=self.view)
             dm_success = False
             try:
                 dm = await interaction.user.create_dm()
-                questions_data = load_questions()
+                questions_data = load_questions(guild_id)
                 position_settings = questions_data.get(position, {})
                 welcome_message = position_settings.get(
                     "welcome_message",
@@ -418,10 +582,7 @@ class StaffApplicationSelect(Select):
                         "message_id"
                     ] = str(welcome_message.id)
                     save_active_applications(self.view.bot.active_applications)
-                if (
-                    not application_data["questions"]
-                    or len(application_data["questions"]) == 0
-                ):
+                if not questions:
                     logger.error(f"No questions found for position {position}")
                     await dm.send(
                         "ERROR: No questions were found for this position. Please contact an administrator."
@@ -443,7 +604,7 @@ class StaffApplicationSelect(Select):
                 await self.refresh_select_menu(interaction)
             except Exception as e:
                 logger.error(f"Error sending DM questions: {e}")
-                logger.error(f"Application data: {application_data}")
+                logger.error("Application data: %s", application_data)
                 logger.error(f"Traceback: {traceback.format_exc()}")
                 try:
                     if "dm" in locals():
@@ -482,27 +643,41 @@ class StaffApplicationSelect(Select):
                     pass
 
     async def refresh_select_menu(self, interaction: discord.Interaction):
-        try:
-            panels = load_panels()
-            panel_data = panels.get(self.panel_id)
-            if panel_data:
-                new_view = StaffApplicationView(self.view.bot, panel_id=self.panel_id)
-                await interaction.message.edit(view=new_view)
-        except Exception as e:
-            logger.error(f"Error refreshing select menu: {e}")
-            logger.error(f"Error traceback: {traceback.format_exc()}")
+        if interaction.response.type == discord.InteractionResponseType.message_update:
+            return
+        schedule_panel_refresh(interaction.message, self.view)
+
+
+@track_flow("panel")
+async def refresh_panel_message(message, view):
+    await asyncio.sleep(PANEL_REFRESH_DELAY)
+    panel_refreshes.pop(message.id, None)
+    try:
+        await message.edit(view=view)
+    except Exception as e:
+        logger.error(f"Error refreshing select menu: {e}")
+        logger.error(f"Error traceback: {traceback.format_exc()}")
+
+
+def schedule_panel_refresh(message, view):
+    if message is None or message.id in panel_refreshes:
+        return
+    panel_refreshes[message.id] = asyncio.create_task(
+        refresh_panel_message(message, view)
+    )
 
 
 class StaffApplicationView(View):
-    def __init__(self, bot, options=None, panel_id=None):
+    def __init__(self, bot, options=None, panel_id=None, guild_id=None):
         super().__init__(timeout=None)
         self.bot = bot
         self.panel_id = str(panel_id) if panel_id is not None else "default"
+        self.guild_id = str(guild_id) if guild_id is not None else None
         if options:
             select = StaffApplicationSelect(bot, options, self.panel_id)
             self.add_item(select)
         else:
-            panels = load_panels()
+            panels = load_panels(self.guild_id)
             panel_data = panels.get(self.panel_id)
             if panel_data:
                 select_options = [
@@ -537,6 +712,144 @@ class StaffApplicationView(View):
         )
 
 
+def get_active_claim(application, user_id):
+    claim = application.get("claim")
+    if not claim or claim.get("id") == str(user_id):
+        return None
+    expires_at = datetime.datetime.fromisoformat(claim["expires_at"])
+    if expires_at <= datetime.datetime.now(UTC):
+        return None
+    return claim
+
+
+def get_roles(guild, role_ids):
+    roles = []
+    for role_id in role_ids:
+        role = guild.get_role(int(role_id))
+        if role:
+            roles.append(role)
+    return roles
+
+
+async def get_decision_roles(interaction, application, action):
+    position_settings = load_questions(interaction.guild_id).get(
+        application["position"], {}
+    )
+    accepted_roles = get_roles(
+        interaction.guild, position_settings.get("accepted_roles", [])
+    )
+    denied_roles = get_roles(
+        interaction.guild, position_settings.get("denied_roles", [])
+    )
+    if action == "accept":
+        roles_to_add, roles_to_remove = accepted_roles, denied_roles
+    else:
+        roles_to_add, roles_to_remove = denied_roles, accepted_roles
+    if not roles_to_add and not roles_to_remove:
+        return None, None
+    bot_member = interaction.guild.me
+    if not bot_member.guild_permissions.manage_roles:
+        logger.error("Bot does not have permission to manage roles!")
+        return (
+            None,
+            "Bot does not have permission to manage roles. Please check bot permissions.",
+        )
+    for role in roles_to_add + roles_to_remove:
+        if role.position >= bot_member.top_role.position:
+            logger.error(f"Bot cannot manage role {role.name} (position too high)")
+            return (
+                None,
+                f"Bot cannot manage role {role.name} (position too high). Please adjust role hierarchy.",
+            )
+    guild_member = await get_member(interaction.guild, application["user_id"])
+    if not guild_member:
+        logger.warning(
+            f"Could not find guild member for user ID: {application['user_id']}"
+        )
+        return None, None
+    return (guild_member, roles_to_add, roles_to_remove), None
+
+
+async def record_decision(interaction, application_id, action, processed_by):
+    application = load_application(application_id, interaction.guild_id)
+    if application is None:
+        return None, None, None, "This application could not be found."
+    if application.get("status") in ["approved", "rejected"]:
+        return None, None, None, "This application has already been processed."
+    claim = get_active_claim(application, interaction.user.id)
+    if claim and not interaction.user.guild_permissions.administrator:
+        expires_at = datetime.datetime.fromisoformat(claim["expires_at"])
+        return (
+            None,
+            None,
+            None,
+            f"This application is claimed by {claim['name']} until <t:{int(expires_at.timestamp())}:t>.",
+        )
+    user_id = int(application["user_id"])
+    applicant = interaction.client.get_user(user_id)
+    try:
+        if applicant is None:
+            applicant = await interaction.client.fetch_user(user_id)
+    except discord.HTTPException as e:
+        logger.error(f"Error fetching applicant {user_id}: {e}")
+        applicant = None
+    if not applicant:
+        return None, None, None, "Could not find the applicant."
+    roles, error = await get_decision_roles(interaction, application, action)
+    if error:
+        return None, None, None, error
+    version = application.get("version", 0)
+    application["status"] = "approved" if action == "accept" else "rejected"
+    application["processed_by"] = {
+        **processed_by,
+        "timestamp": datetime.datetime.now(UTC).isoformat(),
+    }
+    application.pop("claim", None)
+    if not save_application(
+        application_id, application, interaction.guild_id, expected_version=version
+    ):
+        return None, None, None, "This application has already been processed."
+    return application, applicant, roles, None
+
+
+def revert_decision(interaction, application_id, application):
+    application["status"] = "pending"
+    application.pop("processed_by", None)
+    if not save_application(
+        application_id,
+        application,
+        interaction.guild_id,
+        expected_version=application["version"],
+    ):
+        logger.error(f"Could not revert the decision on application {application_id}")
+
+
+async def complete_decision(interaction, application_id, application, roles):
+    if not roles:
+        return True
+    try:
+        await apply_roles(*roles)
+        return True
+    except discord.HTTPException as e:
+        logger.error(f"Error while managing roles: {e}")
+        revert_decision(interaction, application_id, application)
+        await interaction.followup.send(
+            f"Error while managing roles: {e}", ephemeral=True
+        )
+        return False
+
+
+async def apply_roles(member, roles_to_add, roles_to_remove):
+    add = [role for role in roles_to_add if role not in roles_to_remove]
+    if add:
+        await member.add_roles(*add)
+    if roles_to_remove:
+        await member.remove_roles(*roles_to_remove)
+    logger.info(
+        f"Updated roles: added {[r.name for r in roles_to_add]}, removed {[r.name for r in roles_to_remove]}"
+    )
+
+
 class ReasonModal(Modal):
     def __init__(self, action: str, application_id: str):
         super().__init__(title=f"{action.capitalize()} Application")
@@ -550,163 +863,45 @@ class ReasonModal(Modal):
         )
         self.add_item(self.reason)
 
+    @track_flow("decide")
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
-        app_path = os.path.join(APPS_DIRECTORY, f"{self.application_id}.json")
-        with open(app_path, "r") as f:
-            application = json.load(f)
-        if application.get("status") in ["accept", "reject"]:
-            await interaction.followup.send(
-                "This application has already been processed.", ephemeral=True
-            )
+        application, applicant, roles, error = await record_decision(
+            interaction,
+            self.application_id,
+            self.action,
+            {
+                "id": str(interaction.user.id),
+                "name": interaction.user.name,
+                "with_reason": True,
+                "reason": self.reason.value,
+            },
+        )
+        if error:
+            await interaction.followup.send(error, ephemeral=True)
             return
-        applicant = interaction.client.get_user(int(application["user_id"]))
-        if not applicant:
-            await interaction.followup.send(
-                "Could not find the applicant.", ephemeral=True
-            )
+        if not await complete_decision(
+            interaction, self.application_id, application, roles
+        ):
             return
-        questions = load_questions()
-        position_settings = questions.get(application["position"], {})
         dm_sent = False
         dm_error = None
         try:
-            dm_channel = None
-            for channel in interaction.client.private_channels:
-                if (
-                    isinstance(channel, discord.DMChannel)
-                    and channel.recipient.id == applicant.id
-                ):
-                    dm_channel = channel
-                    break
-            if not dm_channel:
-                dm_channel = await applicant.create_dm()
+            dm_channel = applicant.dm_channel or await applicant.create_dm()
             if self.action == "accept":
-                message = position_settings.get(
-                    "accepted_message", "Your application has been accepted!"
-                )
                 embed = discord.Embed(
                     title="Application Accepted!",
                     description=self.reason.value,
                     color=discord.Color.green(),
                 )
-                await dm_channel.send(embed=embed)
             else:
-                message = position_settings.get(
-                    "denied_message", "Your application has been denied."
-                )
                 embed = discord.Embed(
                     title="Application Denied",
                     description=self.reason.value,
                     color=discord.Color.red(),
                 )
-                await dm_channel.send(embed=embed)
+            await dm_channel.send(embed=embed)
             dm_sent = True
-            if dm_sent:
-                guild_member = interaction.guild.get_member(int(application["user_id"]))
-                if guild_member:
-                    if self.action == "accept":
-                        bot_member = interaction.guild.get_member(
-                            interaction.client.user.id
-                        )
-                        if not bot_member.guild_permissions.manage_roles:
-                            logger.error(
-                                "Bot does not have permission to manage roles!"
-                            )
-                            await interaction.followup.send(
-                                "Bot does not have permission to manage roles. Please check bot permissions.",
-                                ephemeral=True,
-                            )
-                            return
-                        roles_to_add = []
-                        for role_id in position_settings.get("accepted_roles", []):
-                            role = interaction.guild.get_role(int(role_id))
-                            if role:
-                                if role.position >= bot_member.top_role.position:
-                                    logger.error(
-                                        f"Bot cannot manage role {role.name} (position too high)"
-                                    )
-                                    await interaction.followup.send(
-                                        f"Bot cannot manage role {role.name} (position too high). Please adjust role hierarchy.",
-                                        ephemeral=True,
-                                    )
-                                    return
-                                roles_to_add.append(role)
-                                logger.info(
-                                    f"Found role to add: {role.name} (ID: {role.id})"
-                                )
-                        roles_to_remove = []
-                        for role_id in position_settings.get("denied_roles", []):
-                            role = interaction.guild.get_role(int(role_id))
-                            if role:
-                                if role.position >= bot_member.top_role.position:
-                                    logger.error(
-                                        f"Bot cannot manage role {role.name} (position too high)"
-                                    )
-                                    await interaction.followup.send(
-                                        f"Bot cannot manage role {role.name} (position too high). Please adjust role hierarchy.",
-                                        ephemeral=True,
-                                    )
-                                    return
-                                roles_to_remove.append(role)
-                                logger.info(
-                                    f"Found role to remove: {role.name} (ID: {role.id})"
-                                )
-                        try:
-                            if roles_to_add:
-                                await guild_member.add_roles(*roles_to_add)
-                                logger.info(
-                                    f"Added roles: {[r.name for r in roles_to_add]}"
-                                )
-                            if roles_to_remove:
-                                await guild_member.remove_roles(*roles_to_remove)
-                                logger.info(
-                                    f"Removed roles: {[r.name for r in roles_to_remove]}"
-                                )
-                        except discord.Forbidden as e:
-                            logger.error(f"Permission error while managing roles: {e}")
-                            await interaction.followup.send(
-                                f"Permission error while managing roles: {e}",
-                                ephemeral=True,
-                            )
-                            return
-                        except Exception as e:
-                            logger.error(f"Error while managing roles: {e}")
-                            await interaction.followup.send(
-                                f"Error while managing roles: {e}", ephemeral=True
-                            )
-                            return
-                    else:
-                        roles_to_add = []
-                        for role_id in position_settings.get("denied_roles", []):
-                            role = interaction.guild.get_role(int(role_id))
-                            if role:
-                                roles_to_add.append(role)
-                                logger.info(
-                                    f"Found role to add: {role.name} (ID: {role.id})"
-                                )
-                        roles_to_remove = []
-                        for role_id in position_settings.get("accepted_roles", []):
-                            role = interaction.guild.get_role(int(role_id))
-                            if role:
-                                roles_to_remove.append(role)
-                                logger.info(
-                                    f"Found role to remove: {role.name} (ID: {role.id})"
-                                )
-                        if roles_to_add:
-                            await guild_member.add_roles(*roles_to_add)
-                            logger.info(
-                                f"Added roles: {[r.name for r in roles_to_add]}"
-                            )
-                        if roles_to_remove:
-                            await guild_member.remove_roles(*roles_to_remove)
-                            logger.info(
-                                f"Removed roles: {[r.name for r in roles_to_remove]}"
-                            )
-                else:
-                    logger.warning(
-                        f"Could not find guild member for user ID: {application['user_id']}"
-                    )
         except discord.Forbidden:
             dm_error = "The bot does not have permission to send DMs to this user."
             logger.error(
@@ -722,17 +917,8 @@ class ReasonModal(Modal):
             logger.error(
                 f"Unexpected error when sending DM to user ID {application['user_id']}: {dm_error}"
             )
-        application["status"] = "approved" if self.action == "accept" else "rejected"
-        application["processed_by"] = {
-            "id": str(interaction.user.id),
-            "name": interaction.user.name,
-            "with_reason": True,
-            "reason": self.reason.value,
-        }
-        with open(app_path, "w") as f:
-            json.dump(application, f)
         try:
-            message = await interaction.channel.fetch_message(interaction.message.id)
+            message = interaction.message
             embed = message.embeds[0]
             embed.color = (
                 discord.Color.green()
@@ -753,7 +939,8 @@ class ReasonModal(Modal):
                 inline=False,
             )
             embed.add_field(name="Reason", value=self.reason.value, inline=False)
-            await message.edit(embed=embed, view=None)
+            if not message.flags.ephemeral:
+                await message.edit(embed=embed, view=None)
         except Exception as e:
             logger.error(f"Error updating embed: {e}")
         if dm_sent:
@@ -780,41 +967,36 @@ class ApplicationResponseButton(Button):
         self.application_id = application_id
         self.with_reason = with_reason
 
+    @track_flow("decide")
     async def callback(self, interaction: discord.Interaction):
         if self.with_reason:
             modal = ReasonModal(self.action, self.application_id)
             await interaction.response.send_modal(modal)
         else:
             await interaction.response.defer(ephemeral=True)
-            app_path = os.path.join(APPS_DIRECTORY, f"{self.application_id}.json")
-            with open(app_path, "r") as f:
-                application = json.load(f)
-            if application.get("status") in ["accept", "reject"]:
-                await interaction.followup.send(
-                    "This application has already been processed.", ephemeral=True
-                )
+            application, applicant, roles, error = await record_decision(
+                interaction,
+                self.application_id,
+                self.action,
+                {
+                    "id": str(interaction.user.id),
+                    "name": interaction.user.name,
+                    "with_reason": False,
+                },
+            )
+            if error:
+                await interaction.followup.send(error, ephemeral=True)
                 return
-            applicant = interaction.client.get_user(int(application["user_id"]))
-            if not applicant:
-                await interaction.followup.send(
-                    "Could not find the applicant.", ephemeral=True
-                )
+            if not await complete_decision(
+                interaction, self.application_id, application, roles
+            ):
                 return
-            questions = load_questions()
+            questions = load_questions(interaction.guild_id)
             position_settings = questions.get(application["position"], {})
             dm_sent = False
             dm_error = None
             try:
-                dm_channel = None
-                for channel in interaction.client.private_channels:
-                    if (
-                        isinstance(channel, discord.DMChannel)
-                        and channel.recipient.id == applicant.id
-                    ):
-                        dm_channel = channel
-                        break
-                if not dm_channel:
-                    dm_channel = await applicant.create_dm()
+                dm_channel = applicant.dm_channel or await applicant.create_dm()
                 if self.action == "accept":
                     message = position_settings.get(
                         "accepted_message", "Your application has been accepted!"
@@ -836,89 +1018,14 @@ class ApplicationResponseButton(Button):
                     )
                     await dm_channel.send(embed=embed)
                 dm_sent = True
-                if dm_sent:
-                    guild_member = interaction.guild.get_member(
-                        int(application["user_id"])
-                    )
-                    if guild_member:
-                        if self.action == "accept":
-                            roles_to_add = []
-                            for role_id in position_settings.get("accepted_roles", []):
-                                role = interaction.guild.get_role(int(role_id))
-                                if role:
-                                    roles_to_add.append(role)
-                                    logger.info(
-                                        f"Found role to add: {role.name} (ID: {role.id})"
-                                    )
-                            roles_to_remove = []
-                            for role_id in position_settings.get("denied_roles", []):
-                                role = interaction.guild.get_role(int(role_id))
-                                if role:
-                                    roles_to_remove.append(role)
-                                    logger.info(
-                                        f"Found role to remove: {role.name} (ID: {role.id})"
-                                    )
-                            if roles_to_add:
-                                await guild_member.add_roles(*roles_to_add)
-                                logger.info(
-                                    f"Added roles: {[r.name for r in roles_to_add]}"
-                                )
-                            if roles_to_remove:
-                                await guild_member.remove_roles(*roles_to_remove)
-                                logger.info(
-                                    f"Removed roles: {[r.name for r in roles_to_remove]}"
-                                )
-                        else:
-                            roles_to_add = []
-                            for role_id in position_settings.get("denied_roles", []):
-                                role = interaction.guild.get_role(int(role_id))
-                                if role:
-                                    roles_to_add.append(role)
-                                    logger.info(
-                                        f"Found role to add: {role.name} (ID: {role_id})"
-                                    )
-                            roles_to_remove = []
-                            for role_id in position_settings.get("accepted_roles", []):
-                                role = interaction.guild.get_role(int(role_id))
-                                if role:
-                                    roles_to_remove.append(role)
-                                    logger.info(
-                                        f"Found role to remove: {role.name} (ID: {role_id})"
-                                    )
-                            if roles_to_add:
-                                await guild_member.add_roles(*roles_to_add)
-                                logger.info(
-                                    f"Added roles: {[r.name for r in roles_to_add]}"
-                                )
-                            if roles_to_remove:
-                                await guild_member.remove_roles(*roles_to_remove)
-                                logger.info(
-                                    f"Removed roles: {[r.name for r in roles_to_remove]}"
-                                )
-                    else:
-                        logger.error(
-                            f"Could not find guild member for user ID: {application['user_id']}"
-                        )
             except discord.Forbidden:
                 dm_error = "The bot does not have permission to send DMs to this user."
             except discord.HTTPException as e:
                 dm_error = f"Failed to send DM: {str(e)}"
             except Exception as e:
                 dm_error = f"Unexpected error while sending DM: {str(e)}"
-            application["status"] = (
-                "approved" if self.action == "accept" else "rejected"
-            )
-            application["processed_by"] = {
-                "id": str(interaction.user.id),
-                "name": interaction.user.name,
-                "with_reason": False,
-            }
-            with open(app_path, "w") as f:
-                json.dump(application, f)
             try:
-                message = await interaction.channel.fetch_message(
-                    interaction.message.id
-                )
+                message = interaction.message
                 embed = message.embeds[0]
                 embed.color = (
                     discord.Color.green()
@@ -940,7 +1047,8 @@ class ApplicationResponseButton(Button):
                     value=f"{interaction.user.mention} (Default message)",
                     inline=False,
                 )
-                await message.edit(embed=embed, view=None)
+                if not message.flags.ephemeral:
+                    await message.edit(embed=embed, view=None)
             except Exception as e:
                 logger.error(f"Error updating embed: {e}")
             if dm_sent:
@@ -954,6 +1062,61 @@ class ApplicationResponseButton(Button):
                 )
 
 
+class ApplicationClaimButton(Button):
+    def __init__(self, application_id: str):
+        super().__init__(
+            label="Claim",
+            style=discord.ButtonStyle.secondary,
+            custom_id=f"app_claim_{application_id}",
+        )
+        self.application_id = application_id
+
+    async def callback(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+        application = load_application(self.application_id, interaction.guild_id)
+        if application is None:
+            await interaction.followup.send(
+                "This application could not be found.", ephemeral=True
+            )
+            return
+        if application.get("status") in ["approved", "rejected"]:
+            await interaction.followup.send(
+                "This application has already been processed.", ephemeral=True
+            )
+            return
+        claim = get_active_claim(application, interaction.user.id)
+        if claim:
+            await interaction.followup.send(
+                f"This application is already claimed by {claim['name']}.",
+                ephemeral=True,
+            )
+            return
+        version = application.get("version", 0)
+        expires_at = datetime.datetime.now(UTC) + datetime.timedelta(
+            seconds=REVIEW_CLAIM_TTL
+        )
+        application["claim"] = {
+            "id": str(interaction.user.id),
+            "name": interaction.user.name,
+            "expires_at": expires_at.isoformat(),
+        }
+        if not save_application(
+            self.application_id,
+            application,
+            interaction.guild_id,
+            expected_version=version,
+        ):
+            await interaction.followup.send(
+                "This application was updated by someone else. Please try again.",
+                ephemeral=True,
+            )
+            return
+        await interaction.followup.send(
+            f"You have claimed this application until <t:{int(expires_at.timestamp())}:t>. Other reviewers cannot accept or reject it until then.",
+            ephemeral=True,
+        )
+
+
 class ApplicationResponseView(View):
     def __init__(self, application_id: str, position: str):
         super().__init__(timeout=None)
@@ -967,6 +1130,7 @@ class ApplicationResponseView(View):
         self.add_item(
             ApplicationResponseButton("reject", application_id, with_reason=True)
         )
+        self.add_item(ApplicationClaimButton(application_id))
         self.bot = None
 
     def set_bot(self, bot):
@@ -975,7 +1139,7 @@ class ApplicationResponseView(View):
         return self
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        questions = load_questions()
+        questions = load_questions(interaction.guild_id)
         position_settings = questions.get(self.position, {})
         user_roles = [str(role.id) for role in interaction.user.roles]
         if interaction.user.guild_permissions.administrator:
@@ -994,6 +1158,18 @@ class ApplicationResponseView(View):
         elif custom_id.startswith("app_reject_reason"):
             button_type = "reject_reason"
             required_roles = position_settings.get("reject_reason_roles", [])
+        elif custom_id.startswith("app_claim"):
+            button_type = "claim"
+            required_roles = [
+                role_id
+                for key in [
+                    "accept_roles",
+                    "reject_roles",
+                    "accept_reason_roles",
+                    "reject_reason_roles",
+                ]
+                for role_id in position_settings.get(key, [])
+            ]
         else:
             button_type = "unknown"
             required_roles = position_settings.get("button_roles", [])
@@ -1037,14 +1213,26 @@ class ApplicationStartButton(Button):
         self.user_id = user_id
         self.position = position
 
+    @track_flow("start")
     async def callback(self, interaction: discord.Interaction):
+        async with applicant_lock(str(interaction.user.id)):
+            await self.handle_action(interaction)
+
+    async def handle_action(self, interaction: discord.Interaction):
         app_data = self.view.application_data
         if self.action == "start":
-            await interaction.response.defer()
-            questions = load_questions()
+            questions = load_questions(app_data.get("guild_id"))
             position = app_data.get("position", "")
             position_settings = questions.get(position, {})
             time_limit = position_settings.get("time_limit", 60)
+            app_questions = get_application_questions(app_data)
+            modal_mode = position_settings.get("answer_mode") == "modal"
+            if modal_mode:
+                await interaction.response.send_modal(
+                    ApplicationPageModal(self.view.bot, app_data, app_questions, 0)
+                )
+            else:
+                await interaction.response.defer()
             if (
                 hasattr(self.view.bot, "active_applications")
                 and str(interaction.user.id) in self.view.bot.active_applications
@@ -1055,14 +1243,28 @@ class ApplicationStartButton(Button):
                 self.view.bot.active_applications[str(interaction.user.id)][
                     "message_id"
                 ] = str(interaction.message.id)
+                if modal_mode:
+                    self.view.bot.active_applications[str(interaction.user.id)][
+                        "answer_mode"
+                    ] = "modal"
                 save_active_applications(self.view.bot.active_applications)
+                record_event(position, "started", app_data.get("guild_id"))
+            if modal_mode:
+                await interaction.message.edit(
+                    embed=build_page_embed(app_data, app_questions, 0, time_limit),
+                    view=ApplicationPageView(
+                        app_data["user_id"], 0, len(app_questions)
+                    ),
+                )
+                self.view.stop()
+                return
             dm_channel = interaction.channel
-            total_questions = len(app_data["questions"])
+            total_questions = len(app_questions)
             await dm_channel.send(
                 f"⏰ **Note:** You have {time_limit} minutes to complete all questions in this application."
             )
             await dm_channel.send(
-                f"**Question 1 of {total_questions}:** {app_data['questions'][0]}"
+                f"**Question 1 of {total_questions}:** {app_questions[0]}"
             )
             original_embed = interaction.message.embeds[0]
             original_embed.color = discord.Color.green()
@@ -1075,6 +1277,9 @@ class ApplicationStartButton(Button):
             ):
                 del self.view.bot.active_applications[str(interaction.user.id)]
                 save_active_applications(self.view.bot.active_applications)
+                record_event(
+                    app_data.get("position", ""), "cancelled", app_data.get("guild_id")
+                )
             await interaction.response.defer()
             original_embed = interaction.message.embeds[0]
             original_embed.color = discord.Color.red()
@@ -1103,8 +1308,8 @@ class ApplicationStartView(View):
 
     async def on_timeout(self):
         user_id = int(self.application_data["user_id"])
-        user = self.bot.get_user(user_id)
         try:
+            user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
             if user:
                 dm_channel = await user.create_dm()
                 await dm_channel.send(
@@ -1144,3 +1349,158 @@ class ApplicationStartView(View):
             except Exception as e:
                 logger.error(f"Error registering view with message ID: {e}")
         return view
+
+
+def get_page_bounds(page, total_questions):
+    start = page * QUESTIONS_PER_PAGE
+    return start, min(start + QUESTIONS_PER_PAGE, total_questions)
+
+
+def build_page_embed(application, questions, page, time_limit):
+    start, end = get_page_bounds(page, len(questions))
+    listed = "\n".join(f"**{i + 1}.** {questions[i][:750]}" for i in range(start, end))
+    embed = discord.Embed(
+        title=f"{application['position']} Application",
+        description=f"**Questions {start + 1}-{end} of {len(questions)}**\n\n{listed}"
+        "\n\nPress the button below to answer them.",
+        color=discord.Color.green(),
+    )
+    embed.set_footer(
+        text=f"You have {time_limit} minutes to complete all questions in this application."
+    )
+    return embed
+
+
+class ApplicationPageModal(Modal):
+    def __init__(self, bot, application, questions, page):
+        start, end = get_page_bounds(page, len(questions))
+        pages = -(-len(questions) // QUESTIONS_PER_PAGE)
+        super().__init__(
+            title=f"{application['position']} ({page + 1}/{pages})"[:45],
+            custom_id=f"app_page_form_{application['user_id']}_{page}",
+        )
+        self.bot = bot
+        self.user_id = str(application["user_id"])
+        self.page = page
+        self.start = start
+        for i in range(start, end):
+            label = f"{i + 1}. {questions[i]}"
+            self.add_item(
+                TextInput(
+                    label=label if len(label) <= 45 else f"{label[:44]}…",
+                    placeholder=questions[i][:100] if len(label) > 45 else None,
+                    style=discord.TextStyle.paragraph,
+                    required=True,
+                )
+            )
+
+    @track_flow("answer")
+    async def on_submit(self, interaction: discord.Interaction):
+        async with applicant_lock(self.user_id):
+            await self.save_page(interaction)
+
+    async def save_page(self, interaction: discord.Interaction):
+        application = self.bot.active_applications.get(self.user_id)
+        if not application:
+            await interaction.response.send_message(
+                "This application is no longer active. Please start a new application.",
+                ephemeral=True,
+            )
+            return
+        expired_limit = get_expired_time_limit(application)
+        if expired_limit is not None:
+            record_event(
+                application["position"], "expired", application.get("guild_id")
+            )
+            del self.bot.active_applications[self.user_id]
+            save_active_applications(self.bot.active_applications)
+            await interaction.response.edit_message(
+                content=f"⌛ Your application has expired. You had {expired_limit} minutes to complete it. Please start a new application if you wish to apply.",
+                embed=None,
+                view=None,
+            )
+            return
+        if len(application["answers"]) != self.start:
+            await interaction.response.send_message(
+                "These questions have already been answered.", ephemeral=True
+            )
+            return
+        values = [item.value for item in self.children]
+        if apply_screening(application, values, self.start):
+            save_active_applications(self.bot.active_applications)
+            await interaction.response.send_message(
+                "⚠️ Some of your answers contain content that isn't allowed in this application. Please open the form again and change them.",
+                ephemeral=True,
+            )
+            return
+        questions = get_application_questions(application)
+        application["answers"].extend(values)
+        application["current_question"] = len(application["answers"])
+        guild_id = application.get("guild_id")
+        if len(application["answers"]) < len(questions):
+            save_active_applications(self.bot.active_applications)
+            position_settings = load_questions(guild_id).get(
+                application["position"], {}
+            )
+            await interaction.response.edit_message(
+                embed=build_page_embed(
+                    application,
+                    questions,
+                    self.page + 1,
+                    position_settings.get("time_limit", 60),
+                ),
+                view=ApplicationPageView(self.user_id, self.page + 1, len(questions)),
+            )
+            return
+        embed = discord.Embed(
+            title=f"{application['position']} Application",
+            description=f"All {len(questions)} questions have been answered.",
+            color=discord.Color.green(),
+        )
+        embed.set_footer(text="Application has been submitted.")
+        await interaction.response.edit_message(embed=embed, view=None)
+        await submit_application(
+            self.bot, interaction.user, interaction.channel, application, guild_id
+        )
+
+
+class ApplicationPageView(View):
+    def __init__(self, user_id, page, total_questions):
+        super().__init__(timeout=None)
+        start, end = get_page_bounds(page, total_questions)
+        self.add_item(
+            Button(
+                label=f"Answer questions {start + 1}-{end}",
+                style=discord.ButtonStyle.primary,
+                custom_id=f"app_page_{user_id}_{page}",
+            )
+        )
+
+
+@track_flow("page")
+async def open_application_page(bot, interaction: discord.Interaction):
+    parts = interaction.data.get("custom_id", "").split("_")
+    user_id = parts[2]
+    page = int(parts[3])
+    if str(interaction.user.id) != user_id:
+        await interaction.response.send_message(
+            "This application doesn't belong to you.", ephemeral=True
+        )
+        return
+    application = bot.active_applications.get(user_id)
+    if not application or application.get("answer_mode") != "modal":
+        await interaction.response.send_message(
+            "Your application session has expired or was not found. Please start a new application.",
+            ephemeral=True,
+        )
+        return
+    start, _ = get_page_bounds(page, 0)
+    if len(application["answers"]) != start:
+        await interaction.response.send_message(
+            "These questions have already been answered.", ephemeral=True
+        )
+        return
+    questions = get_application_questions(application)
+    await interaction.response.send_modal(
+        ApplicationPageModal(bot, application, questions, page)
+    )
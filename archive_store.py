@@ -0,0 +1,140 @@
+import contextlib
+import gzip
+import json
+import logging
+import mmap
+import os
+import sqlite3
+import zlib
+
+logger = logging.getLogger(__name__)
+ARCHIVE_DIRECTORY = "archive"
+SEGMENT_SIZE = 64 * 1024 * 1024
+mapped_segments = {}
+
+
+def get_archive_directory(directory):
+    return os.path.join(directory, ARCHIVE_DIRECTORY)
+
+
+def archive_exists(directory):
+    return os.path.exists(os.path.join(get_archive_directory(directory), "index.db"))
+
+
+@contextlib.contextmanager
+def connect(directory):
+    archive_directory = get_archive_directory(directory)
+    os.makedirs(archive_directory, exist_ok=True)
+    connection = sqlite3.connect(os.path.join(archive_directory, "index.db"))
+    try:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            "app_id TEXT PRIMARY KEY, segment TEXT NOT NULL, "
+            "offset INTEGER NOT NULL, length INTEGER NOT NULL)"
+        )
+        yield connection
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def get_current_segment(directory):
+    archive_directory = get_archive_directory(directory)
+    segments = sorted(
+        name for name in os.listdir(archive_directory) if name.endswith(".seg")
+    )
+    if segments:
+        path = os.path.join(archive_directory, segments[-1])
+        if os.path.getsize(path) < SEGMENT_SIZE:
+            return segments[-1]
+        number = int(segments[-1].split("-")[1].split(".")[0]) + 1
+    else:
+        number = 1
+    return f"segment-{number:05d}.seg"
+
+
+def read_segment(path, offset, length):
+    mapped = mapped_segments.get(path)
+    if mapped is None or len(mapped) < offset + length:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        mapped_segments[path] = mapped
+    return mapped[offset : offset + length]
+
+
+def append_records(directory, records):
+    if not records:
+        return 0
+    with connect(directory) as connection:
+        segment = get_current_segment(directory)
+        path = os.path.join(get_archive_directory(directory), segment)
+        entries = []
+        with open(path, "ab") as f:
+            for app_id, application in records:
+                data = gzip.compress(json.dumps(application).encode())
+                offset = f.tell()
+                f.write(data)
+                entries.append((app_id, segment, offset, len(data)))
+            f.flush()
+            os.fsync(f.fileno())
+        connection.executemany(
+            "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)", entries
+        )
+    return len(entries)
+
+
+def load_archived(directory, app_id):
+    if not archive_exists(directory):
+        return None
+    with connect(directory) as connection:
+        row = connection.execute(
+            "SELECT segment, offset, length FROM records WHERE app_id = ?", (app_id,)
+        ).fetchone()
+    if row is None:
+        return None
+    path = os.path.join(get_archive_directory(directory), row[0])
+    return json.loads(gzip.decompress(read_segment(path, row[1], row[2])))
+
+
+def iter_archived(directory):
+    if not archive_exists(directory):
+        return
+    with connect(directory) as connection:
+        rows = connection.execute(
+            "SELECT app_id, segment, offset, length FROM records "
+            "ORDER BY segment, offset"
+        ).fetchall()
+    archive_directory = get_archive_directory(directory)
+    for app_id, segment, offset, length in rows:
+        path = os.path.join(archive_directory, segment)
+        try:
+            data = read_segment(path, offset, length)
+            yield app_id, json.loads(gzip.decompress(data))
+        except (OSError, EOFError, ValueError, zlib.error) as e:
+            logger.error(f"Error reading archived application {app_id}: {e}")
+
+
+def remove_archived(directory, app_id):
+    if not archive_exists(directory):
+        return False
+    with connect(directory) as connection:
+        cursor = connection.execute("DELETE FROM records WHERE app_id = ?", (app_id,))
+    return cursor.rowcount > 0
+
+
+def get_archive_stats(directory):
+    if not archive_exists(directory):
+        return {"records": 0, "segments": 0, "bytes": 0}
+    with connect(directory) as connection:
+        records = connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+    archive_directory = get_archive_directory(directory)
+    segments = [
+        os.path.join(archive_directory, name)
+        for name in os.listdir(archive_directory)
+        if name.endswith(".seg")
+    ]
+    return {
+        "records": records,
+        "segments": len(segments),
+        "bytes": sum(os.path.getsize(path) for path in segments),
+    }
@@ -1,72 +1,125 @@
 import asyncio
 import datetime
-import json
 import logging
 import os
-import pathlib
 import traceback
 import discord
-from discord import app_commands
-from dotenv import load_dotenv
 from application_components import (
     ApplicationResponseView,
     ApplicationStartView,
-    StaffApplicationSelect,
-    StaffApplicationView,
-    handle_dm_message,
+    add_duplicates_field,
+    add_screening_field,
+    applicant_lock,
+    apply_screening,
     load_active_applications,
+    open_application_page,
+)
+from admission_manager import run_waitlist
+from command_sync import sync_commands
+from digest_manager import (
+    DigestReviewView,
+    get_application_url,
+    queue_submission,
+    run_digests,
+)
+from gateway_config import get_gateway_options
+from panels_manager import register_panels, verify_panels
+from question_manager import (
+    get_application_question_set,
+    get_application_questions,
+    load_questions,
+)
+from rest_metrics import instrument
+from slash_commands import register_commands
+from startup_profile import timeline
+from storage_manager import (
+    ensure_storage,
+    get_application_duplicates,
+    save_application,
 )
-from question_manager import load_questions
 
 logger = logging.getLogger(__name__)
-load_dotenv()
 TOKEN = os.getenv("TOKEN")
-APPS_DIRECTORY = "storage/applications"
-pathlib.Path(APPS_DIRECTORY).mkdir(exist_ok=True)
 
 
-class ApplicationBot(discord.Client):
+class ApplicationBot(discord.AutoShardedClient):
     def __init__(self):
-        intents = discord.Intents.default()
-        intents.message_content = True
-        intents.members = True
-        super().__init__(intents=intents)
+        super().__init__(**get_gateway_options())
         self.tree = discord.app_commands.CommandTree(self)
-        self.active_applications = load_active_applications()
+        instrument(self.http)
+        with timeline.phase("storage open"):
+            ensure_storage()
+            self.active_applications = load_active_applications()
         self.views = {}
+        self.startup_reported = False
+        self.background_tasks = set()
 
     async def setup_hook(self):
+        with timeline.phase("view registration"):
+            await self.restore_views()
+            await self.register_saved_panels()
+        self.start_background_task(self.finish_startup())
+        self.start_background_task(run_digests(self))
+        self.start_background_task(run_waitlist(self))
+
+    def start_background_task(self, coro):
+        task = asyncio.create_task(coro)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        return task
+
+    async def finish_startup(self):
+        await self.wait_until_ready()
+        with timeline.phase("panel verification"):
+            try:
+                await verify_panels(self)
+            except Exception:
+                logger.exception("Error verifying panels")
+        with timeline.phase("command sync"):
+            await self.sync_commands()
+        timeline.report()
+
+    async def restore_views(self):
         for user_id, app_data in self.active_applications.items():
             if "start_time" not in app_data:
                 try:
-                    logger.info(f"Attempting to restore view for user {user_id}")
+                    logger.info("Attempting to restore view for user %s", user_id)
                     view = await ApplicationStartView.restore_view(self, app_data)
                     self.views[user_id] = view
-                    logger.info(f"Successfully restored view for user {user_id}")
+                    logger.info("Successfully restored view for user %s", user_id)
                 except Exception as e:
                     logger.error(f"Error restoring view for user {user_id}: {e}")
                     logger.error(f"Error traceback: {traceback.format_exc()}")
-        self.add_view(StaffApplicationSelect(self, []))
         self.add_view(ApplicationResponseView("", ""))
-        self.add_listener(handle_dm_message, "on_message")
-        from panels_manager import register_panels
+        self.add_view(DigestReviewView())
 
+    async def register_saved_panels(self):
         try:
             await register_panels(self)
             logger.info("Successfully registered saved panels")
         except Exception as e:
             logger.error(f"Error registering panels: {e}")
             logger.error(f"Error traceback: {traceback.format_exc()}")
+
+    async def sync_commands(self, force=False):
         try:
-            await self.tree.sync()
-            logger.info("Successfully synced application commands")
+            return await sync_commands(self, force)
         except Exception as e:
             logger.error(f"Error syncing commands: {e}")
             logger.error(f"Error traceback: {traceback.format_exc()}")
 
     async def on_ready(self):
         logger.info(f"Logged in as {self.user.name} ({self.user.id})")
-        await self.tree.sync()
+        if not self.startup_reported:
+            self.startup_reported = True
+            timeline.mark("gateway ready")
+
+    async def on_interaction(self, interaction):
+        if (
+            interaction.type == discord.InteractionType.component
+            and interaction.data.get("custom_id", "").startswith("app_page_")
+        ):
+            await open_application_page(self, interaction)
 
     async def on_message(self, message):
         if message.author == self.user:
@@ -75,97 +128,101 @@ class ApplicationBot(discord.Client):
             isinstance(message.channel, discord.DMChannel)
             and str(message.author.id) in self.active_applications
         ):
-            app_data = self.active_applications[str(message.author.id)]
-            logger.info(
-                f"Found active application for {message.author.name}: {app_data}"
-            )
-            if app_data.get("processing", False):
-                logger.info(
-                    f"Message from {message.author.name} ignored - application is being processed"
+            async with applicant_lock(str(message.author.id)):
+                await self._process_answer(message)
+
+    async def _process_answer(self, message):
+        app_data = self.active_applications.get(str(message.author.id))
+        if not app_data or app_data.get("answer_mode") == "modal":
+            return
+        try:
+            current_q_index = app_data["current_question"]
+            if apply_screening(app_data, [message.content], current_q_index):
+                await message.channel.send(
+                    "⚠️ Your answer contains content that isn't allowed in this application. Please answer the question again."
                 )
                 return
-            app_data["processing"] = True
-            logger.info(
-                f"Processing message from {message.author.name}: {message.content}"
-            )
-            try:
-                current_q_index = app_data["current_question"]
-                app_data["answers"].append(message.content)
-                if len(app_data["answers"]) >= len(app_data["questions"]):
-                    logger.info("All questions answered, completing application")
-                    await self._complete_application(message, app_data)
-                else:
-                    app_data["current_question"] = current_q_index + 1
-                    next_q_index = app_data["current_question"]
-                    if next_q_index < len(app_data["questions"]):
-                        next_question = app_data["questions"][next_q_index]
-                        await asyncio.sleep(1)
+            app_data["answers"].append(message.content)
+            questions = get_application_questions(app_data)
+            if len(app_data["answers"]) >= len(questions):
+                logger.debug("All questions answered, completing application")
+                await self._complete_application(message, app_data)
+            else:
+                app_data["current_question"] = current_q_index + 1
+                next_q_index = app_data["current_question"]
+                if next_q_index < len(questions):
+                    next_question = questions[next_q_index]
+                    await asyncio.sleep(1)
+                    try:
+                        await message.channel.send(
+                            f"**Question {next_q_index + 1}:** {next_question}"
+                        )
+                        logger.debug("Successfully sent question %s", next_q_index + 1)
+                    except Exception as e:
+                        logger.error(f"Error sending next question: {e}")
+                        logger.error(f"Error type: {type(e)}")
+                        logger.error(f"Error traceback: {traceback.format_exc()}")
                         try:
                             await message.channel.send(
-                                f"**Question {next_q_index + 1}:** {next_question}"
+                                "Sorry, there was an error sending the next question. Please try again."
                             )
-                            logger.info(
-                                f"Successfully sent question {next_q_index + 1}"
-                            )
-                        except Exception as e:
-                            logger.error(f"Error sending next question: {e}")
-                            logger.error(f"Error type: {type(e)}")
-                            logger.error(f"Error traceback: {traceback.format_exc()}")
-                            try:
-                                await message.channel.send(
-                                    "Sorry, there was an error sending the next question. Please try again."
-                                )
-                            except Exception:
-                                pass
-                    else:
-                        logger.error("Error: next_q_index is out of bounds")
-            except Exception as e:
-                logger.error(f"Error processing application message: {e}")
-                logger.error(f"Error type: {type(e)}")
-                logger.error(f"Error traceback: {traceback.format_exc()}")
-                try:
-                    await message.channel.send(
-                        "Sorry, there was an error processing your answer. Please try again."
-                    )
-                except Exception:
-                    pass
-            finally:
-                if str(message.author.id) in self.active_applications:
-                    self.active_applications[str(message.author.id)]["processing"] = (
-                        False
-                    )
-                logger.info(f"Finished processing message from {message.author.name}")
-            return
-        await self.process_commands(message)
+                        except Exception:
+                            pass
+                else:
+                    logger.error("Error: next_q_index is out of bounds")
+        except Exception as e:
+            logger.error(f"Error processing application message: {e}")
+            logger.error(f"Error type: {type(e)}")
+            logger.error(f"Error traceback: {traceback.format_exc()}")
+            try:
+                await message.channel.send(
+                    "Sorry, there was an error processing your answer. Please try again."
+                )
+            except Exception:
+                pass
 
     async def _complete_application(self, message, app_data):
-        logger.info("All questions answered, preparing submission")
-        qa_pairs = []
-        for i in range(len(app_data["questions"])):
-            qa_pairs.append(
-                {"question": app_data["questions"][i], "answer": app_data["answers"][i]}
-            )
+        logger.debug("All questions answered, preparing submission")
+        guild_id = app_data.get("guild_id")
         final_app_data = {
+            "guild_id": guild_id,
             "user_id": app_data["user_id"],
             "user_name": app_data["user_name"],
             "position": app_data["position"],
-            "questions_answers": qa_pairs,
+            "question_set": get_application_question_set(app_data, guild_id),
+            "answers": app_data["answers"],
             "status": "pending",
+            "submitted_at": datetime.datetime.now(datetime.UTC).isoformat(),
         }
+        if app_data.get("screening"):
+            final_app_data["screening"] = app_data["screening"]
         app_id = (
             f"{message.author.id}_{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
         )
-        json_path = os.path.join(APPS_DIRECTORY, f"{app_id}.json")
-        with open(json_path, "w") as f:
-            json.dump(final_app_data, f, indent=4)
+        save_application(app_id, final_app_data, guild_id)
+        if str(message.author.id) in self.active_applications:
+            del self.active_applications[str(message.author.id)]
+        logger.info(
+            "Application for %s submitted and removed from active applications",
+            message.author.name,
+        )
         embed = discord.Embed(
             title=f"{app_data['position']} Application Submitted",
             description="Thank you! Your application has been submitted for review. 🎉",
             color=discord.Color.green(),
         )
         await message.channel.send(embed=embed)
-        questions = load_questions()
+        questions = load_questions(guild_id)
         position_settings = questions.get(app_data["position"], {})
+        if position_settings.get("log_mode") == "digest":
+            queue_submission(
+                guild_id,
+                app_data["position"],
+                app_id,
+                message.author.id,
+                message.author.name,
+            )
+            return
         log_channel_id = position_settings.get("log_channel")
         if log_channel_id:
             log_channel = self.get_channel(int(log_channel_id))
@@ -182,15 +239,16 @@ class ApplicationBot(discord.Client):
                     color=discord.Color.green(),
                 )
                 embed.add_field(name="Application ID", value=app_id)
-                web_url = f"http://{os.getenv('WEB_HOST', 'localhost')}:{os.getenv('WEB_PORT', '8080')}/application/{app_id}"
-                web_external = os.getenv("WEB_EXTERNAL")
-                if web_external:
-                    web_url = f"{web_external}/application/{app_id}"
                 embed.add_field(
                     name="View Application",
-                    value=f"[Click Here]({web_url})",
+                    value=f"[Click Here]({get_application_url(app_id)})",
                     inline=False,
                 )
+                add_screening_field(embed, final_app_data.get("screening"))
+                duplicates = await asyncio.to_thread(
+                    get_application_duplicates, app_id, guild_id
+                )
+                add_duplicates_field(embed, duplicates)
                 view = ApplicationResponseView(app_id, app_data["position"]).set_bot(
                     self
                 )
@@ -208,46 +266,10 @@ class ApplicationBot(discord.Client):
                         )
                     except Exception as e:
                         logger.error(f"Error creating thread: {e}")
-        if str(message.author.id) in self.active_applications:
-            del self.active_applications[str(message.author.id)]
-        logger.info(
-            f"Application for {message.author.name} submitted and removed from active applications"
-        )
 
 
 bot = ApplicationBot()
-
-
-@bot.tree.command(
-    name="setup_applications", description="Set up the staff application system"
-)
-@app_commands.default_permissions(administrator=True)
-async def setup_applications(interaction: discord.Interaction):
-    embed = discord.Embed(
-        title="Staff Applications",
-        description="Select a position below to apply for our staff team!",
-        color=0x808080,
-    )
-    embed.set_footer(text="Applications are processed by our admin team")
-    view = StaffApplicationView(bot)
-    bot.add_view(view)
-    await interaction.response.send_message(embed=embed, view=view)
-
-
-@bot.tree.command(
-    name="panel_create",
-    description="Create a new application panel through the dashboard",
-)
-@app_commands.default_permissions(administrator=True)
-async def panel_create(interaction: discord.Interaction):
-    web_url = f"http://{os.getenv('WEB_HOST', 'localhost')}:{os.getenv('WEB_PORT', 8080)}/panels/create"
-    web_external = os.getenv("WEB_EXTERNAL")
-    if web_external:
-        web_url = f"{web_external}/panels/create"
-    await interaction.response.send_message(
-        f"Please use the web dashboard to create and manage panels. Visit the dashboard at {web_url}",
-        ephemeral=True,
-    )
+register_commands(bot)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+import hashlib
+import json
+import logging
+import os
+
+from storage_manager import STORAGE_DIRECTORY
+
+logger = logging.getLogger(__name__)
+COMMAND_SYNC_FILE = os.path.join(STORAGE_DIRECTORY, "command_sync.json")
+
+
+def serialize_command(command, tree):
+    try:
+        return command.to_dict(tree)
+    except TypeError:
+        return command.to_dict()
+
+
+def get_command_hash(tree):
+    commands = [serialize_command(command, tree) for command in tree.get_commands()]
+    commands.sort(key=lambda command: (command.get("type", 1), command["name"]))
+    payload = json.dumps(commands, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_sync_state():
+    if not os.path.exists(COMMAND_SYNC_FILE):
+        return {}
+    try:
+        with open(COMMAND_SYNC_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Error loading command sync state: {e}")
+        return {}
+
+
+def save_sync_state(state):
+    try:
+        with open(COMMAND_SYNC_FILE, "w") as f:
+            json.dump(state, f, indent=4)
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        logger.error(f"Error saving command sync state: {e}")
+        return False
+
+
+async def sync_commands(bot, force=False):
+    if not bot.tree.get_commands():
+        logger.warning("No application commands registered, skipping sync")
+        return False
+    command_hash = get_command_hash(bot.tree)
+    application_id = str(bot.application_id)
+    state = load_sync_state()
+    force = force or os.getenv("FORCE_COMMAND_SYNC", "").lower() in ("1", "true")
+    if not force and state.get(application_id) == command_hash:
+        logger.info("Application commands unchanged, skipping sync")
+        return False
+    await bot.tree.sync()
+    state[application_id] = command_hash
+    save_sync_state(state)
+    logger.info("Successfully synced application commands")
+    return True
@@ -0,0 +1,216 @@
+import asyncio
+import datetime
+import json
+import logging
+import os
+from datetime import UTC
+
+import discord
+from discord.ui import Select, View
+
+from question_manager import load_questions
+from storage_manager import (
+    get_application_duplicates,
+    get_guild_directory,
+    get_guild_ids,
+    load_application,
+)
+
+logger = logging.getLogger(__name__)
+DIGEST_FILE = "digests.json"
+DIGEST_CHUNK_SIZE = 20
+DIGEST_CHECK_INTERVAL = 30
+
+
+def get_digests_path(guild_id=None):
+    return os.path.join(get_guild_directory(guild_id), DIGEST_FILE)
+
+
+def load_digests(guild_id=None):
+    digests_path = get_digests_path(guild_id)
+    if not os.path.exists(digests_path):
+        return {}
+    try:
+        with open(digests_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Error loading digests: {e}")
+        return {}
+
+
+def save_digests(digests, guild_id=None):
+    try:
+        with open(get_digests_path(guild_id), "w") as f:
+            json.dump(digests, f, indent=4)
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        logger.error(f"Error saving digests: {e}")
+        return False
+
+
+def queue_submission(guild_id, position, application_id, user_id, user_name):
+    now = datetime.datetime.now(UTC).isoformat()
+    digests = load_digests(guild_id)
+    digest = digests.setdefault(position, {"opened_at": now, "entries": []})
+    digest["entries"].append(
+        {
+            "id": application_id,
+            "user_id": str(user_id),
+            "user_name": user_name,
+            "submitted_at": now,
+        }
+    )
+    return save_digests(digests, guild_id)
+
+
+def get_application_url(application_id):
+    web_external = os.getenv("WEB_EXTERNAL")
+    if web_external:
+        return f"{web_external}/application/{application_id}"
+    web_host = os.getenv("WEB_HOST", "localhost")
+    web_port = os.getenv("WEB_PORT", "8080")
+    return f"http://{web_host}:{web_port}/application/{application_id}"
+
+
+class DigestReviewSelect(Select):
+    def __init__(self, entries=()):
+        super().__init__(
+            placeholder="Review an application",
+            custom_id="app_digest_review",
+            min_values=1,
+            max_values=1,
+            options=[
+                discord.SelectOption(
+                    label=(entry["user_name"] or entry["user_id"])[:100],
+                    value=entry["id"],
+                    description=f"User ID {entry['user_id']}",
+                )
+                for entry in entries
+            ],
+        )
+
+    async def callback(self, interaction: discord.Interaction):
+        from application_components import (
+            ApplicationResponseView,
+            add_duplicates_field,
+            add_screening_field,
+        )
+
+        application_id = self.values[0]
+        application = load_application(application_id, interaction.guild_id)
+        if application is None:
+            await interaction.response.send_message(
+                "This application could not be found.", ephemeral=True
+            )
+            return
+        if application.get("status") in ["approved", "rejected"]:
+            await interaction.response.send_message(
+                f"This application has already been {application['status']}.",
+                ephemeral=True,
+            )
+            return
+        embed = discord.Embed(
+            title=f"{application.get('user_name')}'s {application['position']} application",
+            description=f"Applicant: <@{application['user_id']}> ({application['user_id']})"
+            f"\n\n[Click here to view the application]({get_application_url(application_id)})",
+            color=0x808080,
+        )
+        add_screening_field(embed, application.get("screening"))
+        duplicates = await asyncio.to_thread(
+            get_application_duplicates, application_id, interaction.guild_id
+        )
+        add_duplicates_field(embed, duplicates)
+        embed.set_footer(text=application_id)
+        view = ApplicationResponseView(application_id, application["position"])
+        view.bot = interaction.client
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+
+
+class DigestReviewView(View):
+    def __init__(self, entries=()):
+        super().__init__(timeout=None)
+        self.add_item(DigestReviewSelect(entries))
+
+
+async def post_digest(bot, position, entries, position_settings):
+    log_channel_id = position_settings.get("log_channel")
+    log_channel = bot.get_channel(int(log_channel_id)) if log_channel_id else None
+    if not log_channel:
+        logger.error(
+            f"Dropping digest of {len(entries)} {position} applications: log channel not found"
+        )
+        return
+    ping_roles = position_settings.get("ping_roles", [])
+    content = " ".join(f"<@&{role_id}>" for role_id in ping_roles) or None
+    opened_at = datetime.datetime.fromisoformat(entries[0]["submitted_at"])
+    for start in range(0, len(entries), DIGEST_CHUNK_SIZE):
+        chunk = entries[start : start + DIGEST_CHUNK_SIZE]
+        embed = discord.Embed(
+            title=f"{len(chunk)} new {position} applications",
+            description="\n".join(
+                f"• <@{entry['user_id']}> ({entry['user_name']}) - "
+                f"[View application]({get_application_url(entry['id'])})"
+                for entry in chunk
+            ),
+            color=0x808080,
+        )
+        embed.set_footer(
+            text=f"Submitted since {opened_at.strftime('%Y-%m-%d %H:%M')} UTC"
+        )
+        message = await log_channel.send(
+            content=content, embed=embed, view=DigestReviewView(chunk)
+        )
+        content = None
+        if start == 0 and position_settings.get("auto_thread", False):
+            try:
+                await message.create_thread(
+                    name=f"{position} applications", auto_archive_duration=1440
+                )
+            except discord.HTTPException as e:
+                logger.error(f"Error creating thread: {e}")
+
+
+async def flush_digests(bot, force=False):
+    now = datetime.datetime.now(UTC)
+    for guild_id in get_guild_ids():
+        digests = load_digests(guild_id)
+        if not digests:
+            continue
+        questions = load_questions(guild_id)
+        for position, digest in digests.items():
+            position_settings = questions.get(position, {})
+            window = datetime.timedelta(
+                minutes=position_settings.get("digest_window", 15)
+            )
+            opened_at = datetime.datetime.fromisoformat(digest["opened_at"])
+            if not force and now < opened_at + window:
+                continue
+            try:
+                await post_digest(bot, position, digest["entries"], position_settings)
+            except Exception:
+                logger.exception(f"Error posting {position} digest")
+                continue
+            sent = {entry["id"] for entry in digest["entries"]}
+            current = load_digests(guild_id)
+            remaining = [
+                entry
+                for entry in current.get(position, {}).get("entries", [])
+                if entry["id"] not in sent
+            ]
+            if remaining:
+                current[position] = {
+                    "opened_at": remaining[0]["submitted_at"],
+                    "entries": remaining,
+                }
+            else:
+                current.pop(position, None)
+            save_digests(current, guild_id)
+
+
+async def run_digests(bot):
+    while not bot.is_closed():
+        try:
+            await flush_digests(bot)
+        except Exception:
+            logger.exception("Error flushing digests")
+        await asyncio.sleep(DIGEST_CHECK_INTERVAL)
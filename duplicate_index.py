@@ -0,0 +1,190 @@
+import contextlib
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import zlib
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+DUPLICATE_DATABASE = "duplicates.db"
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+SHINGLE_SIZE = 3
+MIN_SHINGLES = 8
+PERMUTATIONS = 128
+BANDS = 32
+ROWS_PER_BAND = PERMUTATIONS // BANDS
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.6") or 0.6)
+SEEDS = np.frombuffer(
+    hashlib.shake_128(b"duplicate_index").digest(PERMUTATIONS * 16), dtype="<u8"
+)
+COEFFICIENTS = SEEDS[:PERMUTATIONS] | np.uint64(1)
+OFFSETS = SEEDS[PERMUTATIONS:]
+
+
+def get_database_path(directory):
+    return os.path.join(directory, DUPLICATE_DATABASE)
+
+
+@contextlib.contextmanager
+def connect(directory):
+    connection = sqlite3.connect(get_database_path(directory))
+    try:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS signatures ("
+            "app_id TEXT PRIMARY KEY, user_id TEXT, user_name TEXT, "
+            "position TEXT, signature BLOB)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "band INTEGER NOT NULL, bucket INTEGER NOT NULL, app_id TEXT NOT NULL, "
+            "PRIMARY KEY (band, bucket, app_id)) WITHOUT ROWID"
+        )
+        yield connection
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def duplicates_exist(directory):
+    return os.path.exists(get_database_path(directory))
+
+
+def get_shingles(answers):
+    words = WORD_PATTERN.findall(" ".join(str(answer) for answer in answers).casefold())
+    return {
+        " ".join(words[i : i + SHINGLE_SIZE])
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def get_signature(answers):
+    shingles = get_shingles(answers)
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode()) for shingle in shingles),
+        np.uint64,
+        len(shingles),
+    )
+    hashed = COEFFICIENTS[:, None] * hashes[None, :] + OFFSETS[:, None]
+    return (hashed >> np.uint64(32)).astype(np.uint32).min(axis=1)
+
+
+def get_buckets(signature):
+    return [
+        (
+            band,
+            int.from_bytes(
+                hashlib.blake2b(
+                    signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND],
+                    digest_size=8,
+                ).digest(),
+                "little",
+                signed=True,
+            ),
+        )
+        for band in range(BANDS)
+    ]
+
+
+def get_answers(application):
+    answers = list(application.get("answers", []))
+    for pair in application.get("questions_answers", []):
+        answers.append(pair.get("answer", ""))
+    return answers
+
+
+def add_signature(connection, app_id, application):
+    signature = get_signature(get_answers(application))
+    connection.execute(
+        "INSERT OR REPLACE INTO signatures VALUES (?, ?, ?, ?, ?)",
+        (
+            app_id,
+            str(application.get("user_id", "")),
+            application.get("user_name", ""),
+            application.get("position", ""),
+            signature.tobytes() if signature is not None else None,
+        ),
+    )
+    if signature is not None:
+        connection.executemany(
+            "INSERT OR IGNORE INTO buckets VALUES (?, ?, ?)",
+            [(band, bucket, app_id) for band, bucket in get_buckets(signature)],
+        )
+
+
+def index_signature(directory, app_id, application):
+    try:
+        with connect(directory) as connection:
+            row = connection.execute(
+                "SELECT 1 FROM signatures WHERE app_id = ?", (app_id,)
+            ).fetchone()
+            if row is None:
+                add_signature(connection, app_id, application)
+        return True
+    except (OSError, ValueError, sqlite3.Error) as e:
+        logger.error(f"Error indexing signature for application {app_id}: {e}")
+        return False
+
+
+def remove_signature(directory, app_id):
+    try:
+        with connect(directory) as connection:
+            connection.execute("DELETE FROM signatures WHERE app_id = ?", (app_id,))
+            connection.execute("DELETE FROM buckets WHERE app_id = ?", (app_id,))
+        return True
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"Error removing signature for application {app_id}: {e}")
+        return False
+
+
+def rebuild_signatures(directory, applications):
+    count = 0
+    with connect(directory) as connection:
+        connection.execute("DELETE FROM signatures")
+        connection.execute("DELETE FROM buckets")
+        for app_id, application in applications:
+            add_signature(connection, app_id, application)
+            count += 1
+    return count
+
+
+def find_duplicates(directory, app_id, positions=None, limit=5):
+    with connect(directory) as connection:
+        row = connection.execute(
+            "SELECT user_id, signature FROM signatures WHERE app_id = ?", (app_id,)
+        ).fetchone()
+        if row is None or row[1] is None:
+            return []
+        user_id = row[0]
+        signature = np.frombuffer(row[1], np.uint32)
+        buckets = get_buckets(signature)
+        probe = ", ".join("(?, ?)" for _ in buckets)
+        candidates = connection.execute(
+            f"WITH probe (band, bucket) AS (VALUES {probe}) "
+            "SELECT DISTINCT s.app_id, s.user_id, s.user_name, s.position, s.signature "
+            "FROM buckets b JOIN probe p ON b.band = p.band AND b.bucket = p.bucket "
+            "JOIN signatures s ON s.app_id = b.app_id "
+            "WHERE s.app_id != ? AND s.user_id != ?",
+            [value for bucket in buckets for value in bucket] + [app_id, user_id],
+        ).fetchall()
+    duplicates = []
+    for candidate_id, candidate_user, user_name, position, data in candidates:
+        if positions is not None and position not in positions:
+            continue
+        similarity = float(np.mean(np.frombuffer(data, np.uint32) == signature))
+        if similarity >= DUPLICATE_THRESHOLD:
+            duplicates.append(
+                {
+                    "id": candidate_id,
+                    "user_id": candidate_user,
+                    "user_name": user_name,
+                    "position": position,
+                    "similarity": round(similarity, 2),
+                }
+            )
+    duplicates.sort(key=lambda duplicate: -duplicate["similarity"])
+    return duplicates[:limit]
@@ -0,0 +1,42 @@
+import os
+
+import discord
+
+
+def get_shard_options():
+    options = {}
+    shard_count = os.getenv("SHARD_COUNT")
+    shard_ids = os.getenv("SHARD_IDS")
+    if shard_count:
+        options["shard_count"] = int(shard_count)
+    if shard_ids:
+        ids = []
+        for part in shard_ids.split(","):
+            if "-" in part:
+                start, end = part.split("-", 1)
+                ids.extend(range(int(start), int(end) + 1))
+            elif part.strip():
+                ids.append(int(part))
+        options["shard_ids"] = ids
+    return options
+
+
+def get_gateway_options():
+    profile = os.getenv("GATEWAY_PROFILE", "full").lower()
+    intents = discord.Intents.default()
+    if profile == "lean":
+        intents.members = False
+        intents.message_content = False
+        intents.guild_messages = False
+        intents.guild_typing = False
+        intents.dm_typing = False
+        intents.presences = False
+        return {
+            "intents": intents,
+            "member_cache_flags": discord.MemberCacheFlags.none(),
+            "chunk_guilds_at_startup": False,
+            **get_shard_options(),
+        }
+    intents.message_content = True
+    intents.members = True
+    return {"intents": intents, **get_shard_options()}
@@ -0,0 +1,105 @@
+import contextlib
+import logging
+import os
+import sqlite3
+
+logger = logging.getLogger(__name__)
+HISTORY_DATABASE = "history.db"
+
+
+def get_database_path(directory):
+    return os.path.join(directory, HISTORY_DATABASE)
+
+
+@contextlib.contextmanager
+def connect(directory):
+    connection = sqlite3.connect(get_database_path(directory))
+    try:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            "app_id TEXT PRIMARY KEY, user_id TEXT NOT NULL, position TEXT, "
+            "status TEXT, submitted_at TEXT)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS history_user "
+            "ON history (user_id, position, submitted_at)"
+        )
+        yield connection
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def get_row(app_id, application):
+    return (
+        app_id,
+        str(application.get("user_id", "")),
+        application.get("position", ""),
+        application.get("status", "pending"),
+        application.get("submitted_at"),
+    )
+
+
+def record_history(directory, app_id, application):
+    try:
+        with connect(directory) as connection:
+            connection.execute(
+                "INSERT INTO history VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (app_id) DO UPDATE SET user_id = excluded.user_id, "
+                "position = excluded.position, status = excluded.status, "
+                "submitted_at = COALESCE(excluded.submitted_at, submitted_at)",
+                get_row(app_id, application),
+            )
+        return True
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"Error recording history for application {app_id}: {e}")
+        return False
+
+
+def remove_history(directory, app_id):
+    try:
+        with connect(directory) as connection:
+            connection.execute("DELETE FROM history WHERE app_id = ?", (app_id,))
+        return True
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"Error removing application {app_id} from history: {e}")
+        return False
+
+
+def rebuild_history(directory, applications):
+    count = 0
+    with connect(directory) as connection:
+        connection.execute("DELETE FROM history")
+        for app_id, application in applications:
+            connection.execute(
+                "INSERT OR REPLACE INTO history VALUES (?, ?, ?, ?, ?)",
+                get_row(app_id, application),
+            )
+            count += 1
+    return count
+
+
+def history_exists(directory):
+    return os.path.exists(get_database_path(directory))
+
+
+def get_user_history(directory, user_id):
+    with connect(directory) as connection:
+        rows = connection.execute(
+            "SELECT app_id, position, status, submitted_at FROM history "
+            "WHERE user_id = ? ORDER BY submitted_at DESC",
+            (str(user_id),),
+        ).fetchall()
+    return [
+        {"id": row[0], "position": row[1], "status": row[2], "submitted_at": row[3]}
+        for row in rows
+    ]
+
+
+def get_last_submission(directory, user_id, position):
+    with connect(directory) as connection:
+        row = connection.execute(
+            "SELECT MAX(submitted_at) FROM history WHERE user_id = ? AND position = ?",
+            (str(user_id), position),
+        ).fetchone()
+    return row[0] if row else None
@@ -0,0 +1,239 @@
+import logging
+import os
+import time
+
+import aiohttp
+import discord
+from aiohttp import web
+
+from member_cache import get_member
+from rest_metrics import get_metrics
+from storage_manager import STORAGE_DIRECTORY
+
+logger = logging.getLogger(__name__)
+IPC_SOCKET = os.getenv("IPC_SOCKET") or os.path.join(STORAGE_DIRECTORY, "bot.sock")
+GUILD_CACHE_TTL = 5
+
+
+def serialize_member(member):
+    return {
+        "id": str(member.id),
+        "name": member.name,
+        "avatar": member.display_avatar.url if member.display_avatar else None,
+        "roles": [str(role.id) for role in member.roles],
+        "is_admin": member.guild_permissions.administrator,
+    }
+
+
+def serialize_guild(guild):
+    return {
+        "id": str(guild.id),
+        "name": guild.name,
+        "icon": guild.icon.url if guild.icon else None,
+        "member_count": guild.member_count,
+        "roles": [
+            {
+                "id": str(role.id),
+                "name": role.name,
+                "color": f"#{role.color.value:06x}",
+                "managed": role.managed,
+            }
+            for role in guild.roles
+        ],
+        "text_channels": [
+            {"id": str(channel.id), "name": channel.name}
+            for channel in guild.channels
+            if isinstance(channel, discord.TextChannel)
+        ],
+    }
+
+
+class LocalBackend:
+    methods = (
+        "get_guild",
+        "get_member",
+        "get_members",
+        "get_user_guilds",
+        "get_channel",
+        "create_panel",
+        "get_session",
+        "save_session",
+        "delete_session",
+        "get_rest_metrics",
+        "render_panels",
+        "get_panel_job",
+    )
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.sessions = {}
+
+    async def get_guild(self, guild_id):
+        guild = self.bot.get_guild(int(guild_id))
+        return serialize_guild(guild) if guild else None
+
+    async def get_member(self, guild_id, user_id):
+        guild = self.bot.get_guild(int(guild_id))
+        if not guild:
+            return None
+        member = await get_member(guild, user_id)
+        return serialize_member(member) if member else None
+
+    async def get_members(self, guild_id, user_ids):
+        guild = self.bot.get_guild(int(guild_id))
+        members = {}
+        if not guild:
+            return members
+        for user_id in user_ids:
+            member = await get_member(guild, user_id)
+            if member:
+                members[str(user_id)] = serialize_member(member)
+        return members
+
+    async def get_user_guilds(self, user_id):
+        guilds = []
+        for guild in self.bot.guilds:
+            member = await get_member(guild, user_id)
+            if member:
+                guilds.append(
+                    {
+                        "id": str(guild.id),
+                        "name": guild.name,
+                        "icon": guild.icon.url if guild.icon else None,
+                        "member": serialize_member(member),
+                    }
+                )
+        return guilds
+
+    async def get_channel(self, channel_id):
+        channel = self.bot.get_channel(int(channel_id))
+        if not channel or not getattr(channel, "guild", None):
+            return None
+        return {
+            "id": str(channel.id),
+            "name": channel.name,
+            "guild_id": str(channel.guild.id),
+        }
+
+    async def create_panel(self, channel_id, embed_data, positions):
+        from panels_manager import send_panel
+
+        channel = self.bot.get_channel(int(channel_id))
+        if not channel:
+            return None
+        embed = discord.Embed.from_dict(embed_data)
+        return await send_panel(self.bot, channel, embed, positions)
+
+    async def get_session(self, session_id):
+        return self.sessions.get(session_id)
+
+    async def save_session(self, session_id, session):
+        self.sessions[session_id] = session
+        return True
+
+    async def delete_session(self, session_id):
+        return self.sessions.pop(session_id, None) is not None
+
+    async def get_rest_metrics(self):
+        return get_metrics()
+
+    async def render_panels(self, guild_id, panel_ids):
+        from panels_manager import request_panel_render
+
+        return request_panel_render(self.bot, guild_id, panel_ids)
+
+    async def get_panel_job(self, guild_id):
+        from panels_manager import get_panel_job
+
+        return get_panel_job(guild_id)
+
+
+class IPCBackend:
+    def __init__(self, path=IPC_SOCKET):
+        self.path = path
+        self._session = None
+        self._guild_cache = {}
+
+    async def call(self, method, *args):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.UnixConnector(path=self.path)
+            )
+        async with self._session.post(
+            f"http://bot/call/{method}", json={"args": list(args)}
+        ) as response:
+            data = await response.json()
+            if response.status != 200:
+                raise RuntimeError(data.get("error", f"IPC call {method} failed"))
+            return data["result"]
+
+    async def get_guild(self, guild_id):
+        cached = self._guild_cache.get(str(guild_id))
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        guild = await self.call("get_guild", str(guild_id))
+        self._guild_cache[str(guild_id)] = (time.monotonic() + GUILD_CACHE_TTL, guild)
+        return guild
+
+    async def get_member(self, guild_id, user_id):
+        return await self.call("get_member", str(guild_id), str(user_id))
+
+    async def get_members(self, guild_id, user_ids):
+        return await self.call("get_members", str(guild_id), list(user_ids))
+
+    async def get_user_guilds(self, user_id):
+        return await self.call("get_user_guilds", str(user_id))
+
+    async def get_channel(self, channel_id):
+        return await self.call("get_channel", str(channel_id))
+
+    async def create_panel(self, channel_id, embed_data, positions):
+        return await self.call("create_panel", str(channel_id), embed_data, positions)
+
+    async def get_session(self, session_id):
+        return await self.call("get_session", session_id)
+
+    async def save_session(self, session_id, session):
+        return await self.call("save_session", session_id, session)
+
+    async def delete_session(self, session_id):
+        return await self.call("delete_session", session_id)
+
+    async def get_rest_metrics(self):
+        return await self.call("get_rest_metrics")
+
+    async def render_panels(self, guild_id, panel_ids):
+        return await self.call("render_panels", str(guild_id), list(panel_ids))
+
+    async def get_panel_job(self, guild_id):
+        return await self.call("get_panel_job", str(guild_id))
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+
+async def start_ipc_server(backend, path=IPC_SOCKET):
+    async def handle_call(request):
+        method = request.match_info["method"]
+        if method not in LocalBackend.methods:
+            return web.json_response({"error": "Unknown method"}, status=404)
+        try:
+            data = await request.json()
+            result = await getattr(backend, method)(*data.get("args", []))
+            return web.json_response({"result": result})
+        except Exception as e:
+            logger.exception(f"Error handling IPC call {method}")
+            return web.json_response({"error": str(e)}, status=500)
+
+    app = web.Application()
+    app.router.add_post("/call/{method}", handle_call)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    if os.path.exists(path):
+        os.remove(path)
+    site = web.UnixSite(runner, path)
+    await site.start()
+    os.chmod(path, 0o600)
+    logger.info(f"IPC server listening on {path}")
+    return runner
@@ -0,0 +1,723 @@
+import argparse
+import asyncio
+import collections
+import importlib
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import types
+
+import discord
+
+POSITION = "Moderator"
+PANEL_ID = "loadtest-panel"
+LOG_CHANNEL_ID = 900000000000000001
+GUILD_ID = 900000000000000000
+_ids = itertools.count(100000000000000000)
+
+
+class Harness:
+    def __init__(self, rest_latency, jitter):
+        self.rest_latency = rest_latency
+        self.jitter = jitter
+        self.rest_calls = collections.Counter()
+        self.record = None
+
+    async def rest(self, route):
+        self.rest_calls[route] += 1
+        if self.record:
+            self.record(route)
+        delay = self.rest_latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(0)
+
+
+class FakeMessage:
+    def __init__(self, harness, channel, author, content=None, embed=None, view=None):
+        self.harness = harness
+        self.id = next(_ids)
+        self.channel = channel
+        self.author = author
+        self.content = content or ""
+        self.embeds = [embed] if embed else []
+        self.view = view
+        self.guild = getattr(channel, "guild", None)
+        self.flags = discord.MessageFlags()
+
+    async def edit(self, **kwargs):
+        await self.harness.rest("PATCH /channels/{channel_id}/messages/{message_id}")
+        if kwargs.get("embed"):
+            self.embeds = [kwargs["embed"]]
+        if "view" in kwargs:
+            self.view = kwargs["view"]
+        return self
+
+    async def delete(self):
+        await self.harness.rest("DELETE /channels/{channel_id}/messages/{message_id}")
+
+    async def create_thread(self, **kwargs):
+        await self.harness.rest(
+            "POST /channels/{channel_id}/messages/{message_id}/threads"
+        )
+
+
+class FakeDMChannel(discord.DMChannel):
+    def __init__(self, harness, user):
+        self.harness = harness
+        self.id = next(_ids)
+        self.recipients = [user]
+        self.sent = []
+
+    async def send(self, content=None, *, embed=None, view=None, **kwargs):
+        await self.harness.rest("POST /channels/{channel_id}/messages")
+        message = FakeMessage(self.harness, self, None, content, embed, view)
+        self.sent.append(message)
+        return message
+
+    async def fetch_message(self, message_id):
+        await self.harness.rest("GET /channels/{channel_id}/messages/{message_id}")
+        for message in self.sent:
+            if message.id == message_id:
+                return message
+        raise discord.NotFound(types.SimpleNamespace(status=404, reason=""), "")
+
+
+class FakeGuild:
+    def __init__(self, harness):
+        self.harness = harness
+        self.id = GUILD_ID
+        self.name = "Load Test Guild"
+        self.members = {}
+
+    def get_member(self, user_id):
+        return self.members.get(user_id)
+
+    async def fetch_member(self, user_id):
+        await self.harness.rest("GET /guilds/{guild_id}/members/{user_id}")
+        return self.members.get(user_id)
+
+    def get_role(self, role_id):
+        return None
+
+
+class FakeTextChannel:
+    def __init__(self, harness, guild, channel_id):
+        self.harness = harness
+        self.guild = guild
+        self.id = channel_id
+        self.sent = []
+
+    async def send(self, content=None, *, embed=None, view=None, **kwargs):
+        await self.harness.rest("POST /channels/{channel_id}/messages")
+        message = FakeMessage(self.harness, self, None, content, embed, view)
+        self.sent.append(message)
+        return message
+
+
+class FakeUser:
+    def __init__(self, harness, index):
+        self.harness = harness
+        self.id = next(_ids)
+        self.name = f"applicant{index}"
+        self.mention = f"<@{self.id}>"
+        self.display_avatar = types.SimpleNamespace(url="https://cdn.invalid/a.png")
+        self.roles = []
+        self.bot = False
+        self.joined_at = None
+        self.dm_channel = None
+
+    async def create_dm(self):
+        if self.dm_channel is None:
+            await self.harness.rest("POST /users/@me/channels")
+            self.dm_channel = FakeDMChannel(self.harness, self)
+        return self.dm_channel
+
+
+class FakeResponse:
+    def __init__(self, harness):
+        self.harness = harness
+        self._done = False
+        self.type = None
+
+    def is_done(self):
+        return self._done
+
+    async def _respond(self):
+        if self._done:
+            raise discord.InteractionResponded(None)
+        self._done = True
+        await self.harness.rest("POST /interactions/{interaction_id}/{token}/callback")
+
+    async def send_message(self, content=None, **kwargs):
+        await self._respond()
+        self.type = discord.InteractionResponseType.channel_message
+        self.sent = kwargs
+
+    async def defer(self, **kwargs):
+        await self._respond()
+        self.type = discord.InteractionResponseType.deferred_message_update
+
+    async def edit_message(self, **kwargs):
+        await self._respond()
+        self.type = discord.InteractionResponseType.message_update
+        self.edited = kwargs
+
+    async def send_modal(self, modal):
+        await self._respond()
+        self.type = discord.InteractionResponseType.modal
+        self.modal = modal
+
+
+class FakeFollowup:
+    def __init__(self, harness):
+        self.harness = harness
+
+    async def send(self, content=None, **kwargs):
+        await self.harness.rest("POST /webhooks/{application_id}/{token}")
+
+
+class FakeInteraction:
+    def __init__(self, harness, bot, user, channel, message, guild=None, data=None):
+        self.id = next(_ids)
+        self.type = discord.InteractionType.component
+        self.user = user
+        self.channel = channel
+        self.message = message
+        self.guild = guild
+        self.guild_id = guild.id if guild else None
+        self.client = bot
+        self.data = data or {}
+        self.response = FakeResponse(harness)
+        self.followup = FakeFollowup(harness)
+
+
+class FakeBot:
+    def __init__(self, harness, guild, log_channel):
+        self.harness = harness
+        self.guild = guild
+        self.log_channel = log_channel
+        self.user = types.SimpleNamespace(id=next(_ids), name="ApplicationBot")
+        self.private_channels = []
+        self.active_applications = {}
+        self.views = {}
+        self.added_views = 0
+        self.users = {}
+
+    def add_view(self, view, message_id=None):
+        self.added_views += 1
+
+    def get_channel(self, channel_id):
+        if channel_id == self.log_channel.id:
+            return self.log_channel
+        return None
+
+    def get_guild(self, guild_id):
+        return self.guild if guild_id == self.guild.id else None
+
+    def get_user(self, user_id):
+        return None
+
+    async def fetch_user(self, user_id):
+        await self.harness.rest("GET /users/{user_id}")
+        if user_id not in self.users:
+            raise discord.NotFound(types.SimpleNamespace(status=404, reason=""), "")
+        return self.users[user_id]
+
+
+class LoopLagMonitor:
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.samples = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def write_fixtures(question_count, digest=False, modal=False, blocklist=0):
+    questions = {
+        POSITION: {
+            "enabled": True,
+            "questions": [
+                f"Load test question {i + 1}?" for i in range(question_count)
+            ],
+            "log_channel": str(LOG_CHANNEL_ID),
+            "welcome_message": "Welcome to the {position} application!",
+            "completion_message": "Thanks for applying for {position}!",
+            "restricted_roles": [],
+            "required_roles": [],
+            "ping_roles": [],
+            "auto_thread": False,
+            "time_limit": 60,
+            "answer_mode": "modal" if modal else "dm",
+            "log_mode": "digest" if digest else "immediate",
+            "digest_window": 15,
+        }
+    }
+    with open(os.path.join("storage", "questions.json"), "w") as f:
+        json.dump(questions, f, indent=4)
+    if blocklist:
+        blocklists = {
+            POSITION: ["answer-0"]
+            + [f"blocked phrase {i}" for i in range(blocklist - 1)]
+        }
+        with open(os.path.join("storage", "blocklists.json"), "w") as f:
+            json.dump(blocklists, f, indent=4)
+    panels = {
+        PANEL_ID: {
+            "id": PANEL_ID,
+            "channel_id": str(LOG_CHANNEL_ID),
+            "message_id": "1",
+            "positions": [POSITION],
+        }
+    }
+    with open(os.path.join("storage", "panels.json"), "w") as f:
+        json.dump(panels, f, indent=4)
+
+
+class Applicant:
+    def __init__(self, harness, index, question_count):
+        self.user = FakeUser(harness, index)
+        self.expected_answers = [
+            f"{self.user.id}-answer-{n}" for n in range(question_count)
+        ]
+        self.answer_latencies = []
+        self.errors = []
+
+
+async def run_applicant(harness, bot, components, applicant, panel_message, args):
+    select_view = components.StaffApplicationView(
+        bot,
+        [discord.SelectOption(label=POSITION, value=POSITION)],
+        PANEL_ID,
+    )
+    select = select_view.children[0]
+    select._values = [POSITION]
+    select._selected_values = [POSITION]
+    interaction = FakeInteraction(
+        harness,
+        bot,
+        applicant.user,
+        panel_message.channel,
+        panel_message,
+        guild=bot.guild,
+        data={"custom_id": select.custom_id, "values": [POSITION]},
+    )
+    await select.callback(interaction)
+    dm = applicant.user.dm_channel
+    welcome = next(
+        (m for m in reversed(dm.sent if dm else []) if m.view is not None), None
+    )
+    if welcome is None:
+        applicant.errors.append("no welcome message")
+        return
+    start_button = welcome.view.children[0]
+    start_interaction = FakeInteraction(harness, bot, applicant.user, dm, welcome)
+    await start_button.callback(start_interaction)
+    if args.modal:
+        await answer_pages(
+            harness, bot, components, applicant, welcome, start_interaction
+        )
+        return
+    tasks = []
+    for answer in applicant.expected_answers:
+        message = FakeMessage(harness, dm, applicant.user, content=answer)
+
+        async def deliver(message=message):
+            started = time.perf_counter()
+            try:
+                await components.handle_dm_message(bot, message)
+            except Exception as e:  # noqa: BLE001
+                applicant.errors.append(repr(e))
+            applicant.answer_latencies.append(time.perf_counter() - started)
+
+        if args.burst:
+            tasks.append(asyncio.create_task(deliver()))
+        else:
+            await deliver()
+            if args.think_time:
+                await asyncio.sleep(random.uniform(0, args.think_time))
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+async def answer_pages(harness, bot, components, applicant, welcome, interaction):
+    dm = applicant.user.dm_channel
+    modal = getattr(interaction.response, "modal", None)
+    answered = 0
+    while modal is not None:
+        page_answers = applicant.expected_answers[
+            answered : answered + len(modal.children)
+        ]
+        for item, answer in zip(modal.children, page_answers):
+            item._value = answer
+        answered += len(page_answers)
+        started = time.perf_counter()
+        try:
+            await modal.on_submit(
+                FakeInteraction(harness, bot, applicant.user, dm, welcome)
+            )
+        except Exception as e:  # noqa: BLE001
+            applicant.errors.append(repr(e))
+        applicant.answer_latencies.append(time.perf_counter() - started)
+        if answered >= len(applicant.expected_answers):
+            return
+        page_button = components.ApplicationPageView(
+            str(applicant.user.id),
+            answered // components.QUESTIONS_PER_PAGE,
+            len(applicant.expected_answers),
+        ).children[0]
+        interaction = FakeInteraction(
+            harness,
+            bot,
+            applicant.user,
+            dm,
+            welcome,
+            data={"custom_id": page_button.custom_id},
+        )
+        await components.open_application_page(bot, interaction)
+        modal = getattr(interaction.response, "modal", None)
+
+
+async def open_digest_reviews(harness, bot, digest_manager, reviewer):
+    await digest_manager.flush_digests(bot, force=True)
+    reviews = []
+    for message in list(bot.log_channel.sent):
+        if not isinstance(message.view, digest_manager.DigestReviewView):
+            continue
+        select = message.view.children[0]
+        for option in select.options:
+            select._values = [option.value]
+            select._selected_values = [option.value]
+            interaction = FakeInteraction(
+                harness,
+                bot,
+                reviewer,
+                bot.log_channel,
+                message,
+                guild=bot.guild,
+                data={"custom_id": select.custom_id, "values": [option.value]},
+            )
+            await select.callback(interaction)
+            sent = getattr(interaction.response, "sent", {})
+            review = FakeMessage(
+                harness,
+                bot.log_channel,
+                bot.user,
+                embed=sent.get("embed"),
+                view=sent.get("view"),
+            )
+            review.flags = discord.MessageFlags(ephemeral=True)
+            reviews.append(review)
+    return reviews
+
+
+async def decide_applications(harness, bot, components, reviewer, messages):
+    decided = 0
+    for message in messages:
+        if not isinstance(message.view, components.ApplicationResponseView):
+            continue
+        accept_button = message.view.children[0]
+        interaction = FakeInteraction(
+            harness,
+            bot,
+            reviewer,
+            bot.log_channel,
+            message,
+            guild=bot.guild,
+            data={"custom_id": accept_button.custom_id},
+        )
+        await accept_button.callback(interaction)
+        decided += 1
+    return decided
+
+
+def collect_submissions(apps_directory):
+    submissions = collections.defaultdict(list)
+    for filename in os.listdir(apps_directory):
+        if not filename.endswith(".json"):
+            continue
+        with open(os.path.join(apps_directory, filename), "r") as f:
+            record = json.load(f)
+        submissions[str(record.get("user_id"))].append(record)
+    return submissions
+
+
+def verify(applicants, submissions, modal=False, screened=False):
+    result = {
+        "lost": 0,
+        "duplicated": 0,
+        "misordered": 0,
+        "missing_submissions": 0,
+        "prompt_errors": 0,
+        "undecided": 0,
+        "unscreened": 0,
+    }
+    for applicant in applicants:
+        dm = applicant.user.dm_channel
+        prompts = [
+            m.content
+            for m in (dm.sent if dm else [])
+            if m.content.startswith("**Question ")
+        ]
+        expected_prompts = (
+            []
+            if modal
+            else [
+                f"**Question {n + 1} of {len(applicant.expected_answers)}:**"
+                for n in range(len(applicant.expected_answers))
+            ]
+        )
+        if [p.split("** ")[0] + "**" for p in prompts] != expected_prompts:
+            result["prompt_errors"] += 1
+        records = submissions.get(str(applicant.user.id), [])
+        if not records:
+            result["missing_submissions"] += 1
+            result["lost"] += len(applicant.expected_answers)
+            continue
+        if len(records) > 1:
+            result["duplicated"] += sum(len(r.get("answers", [])) for r in records[1:])
+        result["undecided"] += sum(
+            1 for record in records if record.get("status") != "approved"
+        )
+        if screened and not any(
+            entry["question"] == 0 for entry in records[0].get("screening", [])
+        ):
+            result["unscreened"] += 1
+        answers = records[0].get("answers", [])
+        expected = collections.Counter(applicant.expected_answers)
+        received = collections.Counter(answers)
+        result["lost"] += sum((expected - received).values())
+        result["duplicated"] += sum((received - expected).values())
+        if not (expected - received) and answers != applicant.expected_answers:
+            result["misordered"] += 1
+    return result
+
+
+async def run(args, components, rest_metrics):
+    harness = Harness(args.rest_latency / 1000, args.jitter / 1000)
+    harness.record = rest_metrics.record
+    guild = FakeGuild(harness)
+    log_channel = FakeTextChannel(harness, guild, LOG_CHANNEL_ID)
+    bot = FakeBot(harness, guild, log_channel)
+    panel_message = FakeMessage(harness, log_channel, bot.user)
+    applicants = [Applicant(harness, i, args.questions) for i in range(args.applicants)]
+    bot.users = {applicant.user.id: applicant.user for applicant in applicants}
+    reviewer = FakeUser(harness, "reviewer")
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(applicant):
+        async with semaphore:
+            try:
+                await run_applicant(
+                    harness, bot, components, applicant, panel_message, args
+                )
+            except Exception as e:  # noqa: BLE001
+                applicant.errors.append(repr(e))
+
+    monitor = LoopLagMonitor()
+    monitor.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(limited(applicant) for applicant in applicants))
+    elapsed = time.perf_counter() - started
+    await monitor.stop()
+    await asyncio.gather(*components.panel_refreshes.values())
+    review_messages = list(bot.log_channel.sent)
+    if args.digest:
+        digest_manager = importlib.import_module("digest_manager")
+        review_messages = await open_digest_reviews(
+            harness, bot, digest_manager, reviewer
+        )
+    await decide_applications(harness, bot, components, reviewer, review_messages)
+    latencies = [lat for a in applicants for lat in a.answer_latencies]
+    submissions = collect_submissions(os.path.join("storage", "applications"))
+    integrity = verify(applicants, submissions, args.modal, bool(args.blocklist))
+    answer_count = sum(len(a.expected_answers) for a in applicants)
+    errors = collections.Counter(e for a in applicants for e in a.errors)
+    return {
+        "applicants": args.applicants,
+        "questions": args.questions,
+        "concurrency": args.concurrency,
+        "burst": args.burst,
+        "modal": args.modal,
+        "elapsed_seconds": round(elapsed, 3),
+        "answers_per_second": round(answer_count / elapsed, 1) if elapsed else 0,
+        "applications_per_second": round(
+            sum(len(r) for r in submissions.values()) / elapsed, 1
+        )
+        if elapsed
+        else 0,
+        "answer_latency_ms": {
+            "mean": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0,
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "max": round(max(latencies, default=0) * 1000, 2),
+        },
+        "loop_lag_ms": {
+            "p50": round(percentile(monitor.samples, 50) * 1000, 2),
+            "p99": round(percentile(monitor.samples, 99) * 1000, 2),
+            "max": round(max(monitor.samples, default=0) * 1000, 2),
+        },
+        "integrity": integrity,
+        "rest_calls": dict(harness.rest_calls.most_common()),
+        "flows": {
+            name: {
+                key: stats[key] for key in ["runs", "mean_calls", "max_calls", "budget"]
+            }
+            for name, stats in rest_metrics.get_metrics().items()
+            if stats["runs"]
+        },
+        "over_budget": rest_metrics.get_budget_violations(),
+        "errors": dict(errors.most_common(10)),
+    }
+
+
+def print_report(report):
+    print(
+        f"{report['applicants']} applicants x {report['questions']} questions "
+        f"(concurrency {report['concurrency']}, burst={report['burst']}, "
+        f"modal={report['modal']}) "
+        f"in {report['elapsed_seconds']}s"
+    )
+    print(
+        f"Throughput: {report['answers_per_second']} answers/s, "
+        f"{report['applications_per_second']} applications/s"
+    )
+    lat = report["answer_latency_ms"]
+    print(
+        f"Answer latency (ms): mean {lat['mean']} p50 {lat['p50']} p95 {lat['p95']} "
+        f"p99 {lat['p99']} max {lat['max']}"
+    )
+    lag = report["loop_lag_ms"]
+    print(f"Event loop lag (ms): p50 {lag['p50']} p99 {lag['p99']} max {lag['max']}")
+    integrity = report["integrity"]
+    print(
+        f"Integrity: {integrity['lost']} lost, {integrity['duplicated']} duplicated, "
+        f"{integrity['misordered']} misordered answers, "
+        f"{integrity['missing_submissions']} missing submissions, "
+        f"{integrity['prompt_errors']} applicants with out-of-order prompts, "
+        f"{integrity['undecided']} applications not decided, "
+        f"{integrity['unscreened']} applications missing screening matches"
+    )
+    print("REST calls:")
+    for route, count in report["rest_calls"].items():
+        print(f"  {count:>8}  {route}")
+    print("REST calls per flow (mean / max / budget):")
+    for name, stats in report["flows"].items():
+        marker = "  OVER BUDGET" if name in report["over_budget"] else ""
+        print(
+            f"  {name:>8}  {stats['mean_calls']} / {stats['max_calls']} / "
+            f"{stats['budget']} over {stats['runs']} runs{marker}"
+        )
+    if report["errors"]:
+        print("Errors:")
+        for error, count in report["errors"].items():
+            print(f"  {count:>8}  {error}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Drive simulated applicants through the DM application flow."
+    )
+    parser.add_argument("--applicants", type=int, default=1000)
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument(
+        "--burst",
+        action="store_true",
+        help="Deliver each applicant's answers at once instead of one by one.",
+    )
+    parser.add_argument(
+        "--digest",
+        action="store_true",
+        help="Log submissions in digest mode and review them from the digests.",
+    )
+    parser.add_argument(
+        "--modal",
+        action="store_true",
+        help="Answer in pop-up forms, one submission per page of questions.",
+    )
+    parser.add_argument(
+        "--blocklist",
+        type=int,
+        default=0,
+        help="Screen answers against this many blocked patterns; the first "
+        "answer of every applicant matches one and must be flagged.",
+    )
+    parser.add_argument(
+        "--think-time", type=float, default=0.0, help="Max seconds between answers."
+    )
+    parser.add_argument(
+        "--rest-latency", type=float, default=0.0, help="Simulated REST latency in ms."
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Random extra REST latency in ms."
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    parser.add_argument(
+        "--workdir", help="Directory for the throwaway storage (default: a temp dir)."
+    )
+    return parser.parse_args(argv)
+
+
+def prepare(args, workdir):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    os.makedirs(os.path.join(workdir, "storage", "applications"), exist_ok=True)
+    os.chdir(workdir)
+    os.environ["SERVER_ID"] = str(GUILD_ID)
+    write_fixtures(args.questions, args.digest, args.modal, args.blocklist)
+    components = importlib.import_module("application_components")
+    rest_metrics = importlib.import_module("rest_metrics")
+    return components, rest_metrics
+
+
+def main():
+    args = parse_args()
+    random.seed(args.seed)
+    workdir = args.workdir or tempfile.mkdtemp(prefix="sab-loadtest-")
+    components, rest_metrics = prepare(args, workdir)
+    report = asyncio.run(run(args, components, rest_metrics))
+    report["workdir"] = workdir
+    if args.json:
+        print(json.dumps(report, indent=4))
+    else:
+        print_report(report)
+        print(f"Storage written to {workdir}")
+    integrity = report["integrity"]
+    if any(integrity.values()) or report["over_budget"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
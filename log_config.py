@@ -0,0 +1,102 @@
+import atexit
+import datetime
+import json
+import logging
+import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FILE = os.path.join("storage", "logs", "bot.log")
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+listeners = []
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": datetime.datetime.fromtimestamp(
+                record.created, datetime.UTC
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    def __init__(self):
+        super().__init__()
+        self.rate = float(os.getenv("LOG_RATE_LIMIT", "20") or 20)
+        self.burst = int(os.getenv("LOG_RATE_BURST", "100") or 100)
+        self.buckets = {}
+
+    def filter(self, record):
+        if self.rate <= 0 or record.levelno >= logging.WARNING:
+            return True
+        now = time.monotonic()
+        tokens, updated, dropped = self.buckets.get(record.name, (self.burst, now, 0))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens < 1:
+            self.buckets[record.name] = (tokens, now, dropped + 1)
+            return False
+        if dropped:
+            record.suppressed = dropped
+        self.buckets[record.name] = (tokens - 1, now, 0)
+        return True
+
+
+class LazyQueueHandler(QueueHandler):
+    def prepare(self, record):
+        args = record.args if isinstance(record.args, tuple) else (record.args,)
+        if record.args and any(isinstance(arg, (dict, list, set)) for arg in args):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def queue_handlers(logger, *handlers):
+    log_queue = queue.SimpleQueue()
+    queue_handler = LazyQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter())
+    logger.addHandler(queue_handler)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    listeners.append(listener)
+    return listener
+
+
+def stop_logging():
+    while listeners:
+        listeners.pop().stop()
+
+
+def setup_logging(log_file=LOG_FILE):
+    root = logging.getLogger()
+    root.setLevel((os.getenv("LOG_LEVEL") or "INFO").upper())
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handlers = []
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    handlers.append(stream_handler)
+    if log_file:
+        file_handler = RotatingFileHandler(
+            log_file, maxBytes=1024 * 1024, backupCount=5
+        )
+        if (os.getenv("LOG_FORMAT") or "json").lower() == "json":
+            file_handler.setFormatter(JsonFormatter())
+        else:
+            file_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(file_handler)
+    queue_handlers(root, *handlers)
+
+
+atexit.register(stop_logging)
@@ -1,16 +1,29 @@
 __version__ = "1.0.1"
+from startup_profile import timeline
 import asyncio
-import json
 import logging
 import os
-import pathlib
 import signal
 import sys
-from logging.handlers import RotatingFileHandler
 import discord
 from discord.ext import commands
-from dotenv import load_dotenv
-from webserver import start_web_server
+from application_components import ApplicationResponseView, load_active_applications
+from admission_manager import run_waitlist
+from command_sync import sync_commands
+from digest_manager import DigestReviewView, run_digests
+from gateway_config import get_gateway_options
+from log_config import setup_logging
+from member_cache import remember_member
+from panels_manager import register_panels, verify_panels
+from rest_metrics import instrument
+from slash_commands import register_commands
+from storage_manager import (
+    compact_applications,
+    ensure_indexes,
+    ensure_storage,
+    get_guild_ids,
+    iter_applications,
+)
 
 COLOR = "\033[38;2;243;221;182m"
 RESET = "\033[0m"
@@ -25,35 +38,11 @@ print("""
 """)
 print(f"Simple Applications Bot v{__version__} by Kre0lidge - Starting up...\n{RESET}")
 logger = logging.getLogger(__name__)
-
-
-def ensure_directories():
-    directories = ["storage", "storage/applications", "storage/logs"]
-    for directory in directories:
-        pathlib.Path(directory).mkdir(exist_ok=True)
-    files = [("storage/questions.json", "{}")]
-    for file_path, default_content in files:
-        if not os.path.exists(file_path):
-            with open(file_path, "w") as f:
-                f.write(default_content)
-            logger.info(f"Created default file: {file_path}")
-
-
-ensure_directories()
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        RotatingFileHandler(
-            "storage/logs/bot.log", maxBytes=1024 * 1024, backupCount=5
-        ),
-        logging.StreamHandler(),
-    ],
-)
-load_dotenv()
+timeline.mark("imports")
+ensure_storage()
+setup_logging()
 required_vars = {
     "TOKEN": "Discord Bot Token",
-    "SERVER_ID": "Discord Server ID",
     "WEB_HOST": "Web Server Host",
     "WEB_PORT": "Web Server Port",
     "OAUTH_CLIENT_ID": "Discord OAuth Client ID",
@@ -66,15 +55,22 @@ if missing_vars:
     for var in missing_vars:
         error_msg += f"- {var} ({required_vars[var]})\n"
     error_msg += "\nPlease create a .env file with these variables or set them in your environment."
-    logging.error(error_msg)
+    logger.error(error_msg)
     sys.exit(1)
+timeline.mark("config")
 TOKEN = os.getenv("TOKEN")
 SERVER_ID = os.getenv("SERVER_ID")
 WEB_HOST = os.getenv("WEB_HOST", "localhost")
 WEB_PORT = os.getenv("WEB_PORT", "8080")
+DASHBOARD_WORKERS = int(os.getenv("DASHBOARD_WORKERS", "0") or 0)
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "0") or 0)
+ARCHIVE_INTERVAL = int(os.getenv("ARCHIVE_INTERVAL", "3600") or 3600)
 bot = None
 web_runner = None
 web_site = None
+ipc_runner = None
+dashboard_workers = []
+background_tasks = set()
 shutdown_event = asyncio.Event()
 shutdown_lock = asyncio.Lock()
 
@@ -83,50 +79,164 @@ async def shutdown():
     async with shutdown_lock:
         if shutdown_event.is_set():
             return
-        logging.info("Starting shutdown...")
+        logger.info("Starting shutdown...")
         shutdown_event.set()
         if web_runner:
-            logging.info("Closing web server...")
+            logger.info("Closing web server...")
             await web_runner.cleanup()
+        if dashboard_workers:
+            logger.info("Stopping dashboard workers...")
+            for process in dashboard_workers:
+                if process.returncode is None:
+                    process.terminate()
+            await asyncio.gather(*(process.wait() for process in dashboard_workers))
+        if ipc_runner:
+            await ipc_runner.cleanup()
         if bot:
-            logging.info("Closing bot connection...")
+            logger.info("Closing bot connection...")
             await bot.close()
-        logging.info("Shutdown complete")
+        logger.info("Shutdown complete")
         os._exit(0)
 
 
+def start_background_task(coro):
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+
 def signal_handler(signum, frame):
-    logging.info(f"Received signal {signum}, initiating shutdown...")
+    logger.info(f"Received signal {signum}, initiating shutdown...")
     asyncio.create_task(shutdown())
 
 
 async def handle_exception(loop, context):
     exception = context.get("exception")
     if exception:
-        logging.error(f"Caught exception: {exception}")
+        logger.error(f"Caught exception: {exception}")
     else:
-        logging.error(f"Caught exception: {context.get('message', 'Unknown error')}")
+        logger.error(f"Caught exception: {context.get('message', 'Unknown error')}")
     if not shutdown_event.is_set():
-        logging.info("Initiating shutdown due to exception...")
+        logger.info("Initiating shutdown due to exception...")
+        await shutdown()
+
+
+async def start_dashboard_workers(bot):
+    global ipc_runner
+    from ipc import IPC_SOCKET, LocalBackend, start_ipc_server
+
+    ipc_runner = await start_ipc_server(LocalBackend(bot), IPC_SOCKET)
+    for _ in range(DASHBOARD_WORKERS):
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "webserver.py", IPC_SOCKET
+        )
+        dashboard_workers.append(process)
+    logger.info(f"Started {DASHBOARD_WORKERS} dashboard worker processes")
+
+
+async def start_dashboard(bot):
+    global web_runner, web_site
+    try:
+        with timeline.phase("web bind"):
+            if DASHBOARD_WORKERS > 0:
+                await start_dashboard_workers(bot)
+            else:
+                from webserver import start_web_server
+
+                web_runner, web_site = await start_web_server(bot)
+    except Exception:
+        logger.exception("Failed to start web dashboard")
         await shutdown()
 
 
+def load_pending_applications():
+    return [
+        (app_id, app_data.get("position", ""))
+        for guild_id in get_guild_ids()
+        for app_id, app_data in iter_applications(guild_id, include_archived=False)
+        if app_data.get("status") not in ["approved", "rejected"]
+    ]
+
+
+async def register_response_views(bot):
+    try:
+        with timeline.phase("response views"):
+            pending = await asyncio.to_thread(load_pending_applications)
+            for app_id, position in pending:
+                ApplicationResponseView(app_id, position).set_bot(bot)
+        logger.info(f"Registered {len(pending)} persistent application response views")
+    except Exception as e:
+        logger.error(f"Error registering application response views: {e}")
+
+
+async def compact_archives():
+    while not shutdown_event.is_set():
+        for guild_id in get_guild_ids():
+            try:
+                archived = await asyncio.to_thread(
+                    compact_applications, guild_id, ARCHIVE_AFTER_DAYS
+                )
+                if archived:
+                    logger.info(
+                        f"Archived {archived} decided applications for guild {guild_id}"
+                    )
+            except Exception:
+                logger.exception(f"Error archiving applications for guild {guild_id}")
+        await asyncio.sleep(ARCHIVE_INTERVAL)
+
+
+async def finish_startup(bot, startup_tasks):
+    with timeline.phase("panel verification"):
+        try:
+            panel_count = await verify_panels(bot)
+            logger.info(f"Verified {panel_count} application panels")
+        except Exception:
+            logger.exception("Error verifying panels")
+    with timeline.phase("index build"):
+        await asyncio.to_thread(ensure_indexes)
+    with timeline.phase("command sync"):
+        try:
+            await sync_commands(bot)
+        except discord.HTTPException as e:
+            logger.error(f"Error syncing commands: {e}")
+    await asyncio.gather(*startup_tasks)
+    timeline.report()
+
+
 async def main():
-    global bot, web_runner, web_site
+    global bot
     for sig in (signal.SIGINT, signal.SIGTERM):
         signal.signal(sig, signal_handler)
-    intents = discord.Intents.default()
-    intents.message_content = True
-    intents.members = True
-    bot = commands.Bot(command_prefix="!", intents=intents)
+    bot = commands.AutoShardedBot(command_prefix="!", **get_gateway_options())
+    instrument(bot.http)
+    register_commands(bot)
+    with timeline.phase("storage open"):
+        bot.active_applications = load_active_applications()
+    logger.info(f"Loaded {len(bot.active_applications)} active applications")
+    with timeline.phase("view registration"):
+        panel_count = await register_panels(bot)
+        bot.add_view(DigestReviewView())
+    logger.info(f"Registered {panel_count} application panels")
+    startup_tasks = [
+        asyncio.create_task(start_dashboard(bot)),
+        asyncio.create_task(register_response_views(bot)),
+    ]
 
     @bot.listen("on_interaction")
     async def handle_global_app_buttons(interaction):
+        remember_member(interaction.user)
         try:
             if not interaction.type == discord.InteractionType.component:
                 return
             custom_id = interaction.data.get("custom_id", "")
-            if custom_id.startswith("app_welcome_") and isinstance(
+            if custom_id.startswith("app_page_") and isinstance(
+                interaction.channel, discord.DMChannel
+            ):
+                from application_components import open_application_page
+
+                await open_application_page(bot, interaction)
+            elif custom_id.startswith("app_welcome_") and isinstance(
                 interaction.channel, discord.DMChannel
             ):
                 parts = custom_id.split("_")
@@ -134,10 +244,6 @@ async def main():
                     action = parts[2]
                     user_id = parts[3]
                     "_".join(parts[4:])
-                    if not hasattr(bot, "active_applications"):
-                        from application_components import load_active_applications
-
-                        bot.active_applications = load_active_applications()
                     if user_id in bot.active_applications:
                         from application_components import (
                             ApplicationStartButton,
@@ -195,73 +301,61 @@ async def main():
 
     @bot.event
     async def on_message(message):
-        await bot.process_commands(message)
-        if message.guild is None:
-            from application_components import handle_dm_message
+        if message.guild is not None:
+            return
+        from application_components import handle_dm_message
 
-            await handle_dm_message(bot, message)
+        await handle_dm_message(bot, message)
 
     @bot.event
     async def on_ready():
-        server = bot.get_guild(int(SERVER_ID))
-        server_name = server.name if server else "Unknown Server"
-        from application_components import load_active_applications
-
-        bot.active_applications = load_active_applications()
-        logging.info(f"Loaded {len(bot.active_applications)} active applications")
-        from panels_manager import register_panels
-
-        panel_count = await register_panels(bot)
-        logging.info(f"Registered {panel_count} application panels")
-        try:
-            from application_components import ApplicationResponseView
-
-            count = 0
-            apps_directory = "storage/applications"
-            if os.path.exists(apps_directory):
-                for filename in os.listdir(apps_directory):
-                    if filename.endswith(".json"):
-                        app_id = filename.split(".")[0]
-                        app_path = os.path.join(apps_directory, filename)
-                        with open(app_path, "r") as f:
-                            app_data = json.load(f)
-                            if app_data.get("status") not in ["accept", "reject"]:
-                                position = app_data.get("position", "")
-                                ApplicationResponseView(app_id, position).set_bot(bot)
-                                count += 1
-            logging.info(f"Registered {count} persistent application response views")
-        except Exception as e:
-            logging.error(f"Error registering application response views: {e}")
-        logging.info(f"Bot is ready! Connected to server: {server_name}")
+        if getattr(bot, "startup_finished", False):
+            logger.info("Reconnected to Discord")
+            return
+        bot.startup_finished = True
+        timeline.mark("gateway ready")
+        logger.info(
+            f"Serving {len(bot.guilds)} guilds on shards {sorted(bot.shards)} of {bot.shard_count}"
+        )
+        start_background_task(finish_startup(bot, startup_tasks))
+        start_background_task(run_digests(bot))
+        start_background_task(run_waitlist(bot))
+        if ARCHIVE_AFTER_DAYS > 0:
+            start_background_task(compact_archives())
+        if SERVER_ID:
+            server = bot.get_guild(int(SERVER_ID))
+            server_name = server.name if server else "Unknown Server"
+            logger.info(f"Bot is ready! Primary server: {server_name}")
+        else:
+            logger.info("Bot is ready!")
         dashboard_url = f"http://{WEB_HOST}:{WEB_PORT}"
         web_external = os.getenv("WEB_EXTERNAL")
         if web_external:
             dashboard_url = web_external
-        logging.info(f"Dashboard is available at: {dashboard_url}")
-        logging.info("Bot is now running!")
+        logger.info(f"Dashboard is available at: {dashboard_url}")
+        logger.info("Bot is now running!")
 
     loop = asyncio.get_running_loop()
     loop.set_exception_handler(handle_exception)
-    web_runner, web_site = await start_web_server(bot)
     try:
         try:
             await bot.start(TOKEN)
         except discord.PrivilegedIntentsRequired:
-            logging.error(
+            logger.error(
                 "Required Privileged Gateway Intents are disabled for this bot."
             )
-            logging.error(
+            logger.error(
                 "Make sure Server Members and Message Content intents are enabled in the Discord Developer Portal."
             )
             await shutdown()
         except Exception as e:
-            logging.error(f"Failed to start bot: {str(e)}")
+            logger.error(f"Failed to start bot: {str(e)}")
             await shutdown()
         while not shutdown_event.is_set():
             await asyncio.sleep(0.1)
         await shutdown()
     except Exception as e:
-        logging.error(f"Error starting bot: {e}")
+        logger.error(f"Error starting bot: {e}")
         await shutdown()
     finally:
         if not shutdown_event.is_set():
@@ -272,8 +366,8 @@ if __name__ == "__main__":
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
-        logging.info("Received keyboard interrupt, shutting down...")
+        logger.info("Received keyboard interrupt, shutting down...")
     except Exception as e:
-        logging.error(f"Unhandled exception: {e}")
+        logger.error(f"Unhandled exception: {e}")
     finally:
-        logging.info("Successfully shutdown the service.")
+        logger.info("Successfully shutdown the service.")
@@ -0,0 +1,44 @@
+import logging
+import os
+import time
+from collections import OrderedDict
+
+import discord
+
+logger = logging.getLogger(__name__)
+MEMBER_CACHE_SIZE = int(os.getenv("MEMBER_CACHE_SIZE", "5000") or 5000)
+MEMBER_CACHE_TTL = int(os.getenv("MEMBER_CACHE_TTL", "300") or 300)
+members = OrderedDict()
+
+
+def store(key, member):
+    members[key] = (time.monotonic() + MEMBER_CACHE_TTL, member)
+    members.move_to_end(key)
+    while len(members) > MEMBER_CACHE_SIZE:
+        members.popitem(last=False)
+
+
+def remember_member(member):
+    if isinstance(member, discord.Member):
+        store((member.guild.id, member.id), member)
+
+
+async def get_member(guild, user_id):
+    user_id = int(user_id)
+    member = guild.get_member(user_id)
+    if member is not None:
+        return member
+    key = (guild.id, user_id)
+    cached = members.get(key)
+    if cached and cached[0] > time.monotonic():
+        members.move_to_end(key)
+        return cached[1]
+    try:
+        member = await guild.fetch_member(user_id)
+    except discord.NotFound:
+        member = None
+    except discord.HTTPException as e:
+        logger.error(f"Error fetching member {user_id} in guild {guild.id}: {e}")
+        return None
+    store(key, member)
+    return member
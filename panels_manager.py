@@ -1,36 +1,43 @@
+import asyncio
+import collections
+import datetime
 import json
 import logging
 import os
-import pathlib
 import traceback
 import uuid
+from datetime import UTC
 import discord
-from dotenv import load_dotenv
+from question_manager import load_questions
+from storage_manager import get_guild_directory, get_guild_ids
 
 logger = logging.getLogger(__name__)
-load_dotenv()
-pathlib.Path("storage").mkdir(exist_ok=True)
-APPS_DIRECTORY = "storage/applications"
-pathlib.Path(APPS_DIRECTORY).mkdir(exist_ok=True)
-PANELS_DIRECTORY = "storage"
-pathlib.Path(PANELS_DIRECTORY).mkdir(exist_ok=True)
-PANELS_FILE = os.path.join(PANELS_DIRECTORY, "panels.json")
+PANEL_RENDER_CONCURRENCY = 3
+panel_indexes = {}
+panel_jobs = {}
+panel_render_requests = collections.defaultdict(set)
+panel_render_tasks = set()
 
 
-def load_panels():
-    if not os.path.exists(PANELS_FILE):
+def get_panels_file(guild_id=None):
+    return os.path.join(get_guild_directory(guild_id), "panels.json")
+
+
+def load_panels(guild_id=None):
+    panels_file = get_panels_file(guild_id)
+    if not os.path.exists(panels_file):
         return {}
     try:
-        with open(PANELS_FILE, "r") as f:
+        with open(panels_file, "r") as f:
             return json.load(f)
     except Exception as e:
         logger.error(f"Error loading panels: {str(e)}")
         return {}
 
 
-def save_panels(panels):
+def save_panels(panels, guild_id=None):
     try:
-        with open(PANELS_FILE, "w") as f:
+        with open(get_panels_file(guild_id), "w") as f:
             json.dump(panels, f, indent=4)
         return True
     except Exception as e:
@@ -38,38 +45,82 @@ def save_panels(panels):
         return False
 
 
-async def register_panels(bot):
-    from application_components import StaffApplicationView
+def get_position_name(position):
+    return position if isinstance(position, str) else position["name"]
+
+
+def get_panel_index(guild_id=None):
+    panels_file = get_panels_file(guild_id)
+    try:
+        mtime = os.path.getmtime(panels_file)
+    except OSError:
+        return {}
+    cached = panel_indexes.get(panels_file)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    index = collections.defaultdict(list)
+    for panel_id, panel_data in load_panels(guild_id).items():
+        for position in panel_data.get("positions", []):
+            index[get_position_name(position)].append(panel_id)
+    panel_indexes[panels_file] = (mtime, dict(index))
+    return panel_indexes[panels_file][1]
+
+
+def get_panel_options(panel_data, guild_id=None):
+    questions = load_questions(guild_id)
+    return [
+        discord.SelectOption(
+            label=get_position_name(position),
+            description=f"Apply for {get_position_name(position)} position",
+            value=get_position_name(position),
+        )
+        for position in panel_data["positions"]
+        if questions.get(get_position_name(position), {}).get("enabled", True)
+        and get_position_name(position) in questions
+    ]
+
+
+def update_panel_positions(guild_id, old_position, new_position=None):
+    panel_ids = get_panel_index(guild_id).get(old_position, [])
+    if not panel_ids:
+        return []
+    panels = load_panels(guild_id)
+    for panel_id in panel_ids:
+        panel_data = panels.get(panel_id)
+        if not panel_data:
+            continue
+        positions = [
+            new_position if get_position_name(position) == old_position else position
+            for position in panel_data["positions"]
+        ]
+        panel_data["positions"] = [
+            position for position in positions if position is not None
+        ]
+    save_panels(panels, guild_id)
+    return panel_ids
+
 
-    panels = load_panels()
+async def register_panels(bot):
     if hasattr(bot, "views"):
         bot.views.clear()
     else:
         bot.views = {}
     registered_count = 0
+    for guild_id in get_guild_ids():
+        registered_count += await register_guild_panels(bot, guild_id)
+    return registered_count
+
+
+async def register_guild_panels(bot, guild_id):
+    panels = load_panels(guild_id)
+    registered_count = 0
     for panel_id, panel_data in panels.items():
         try:
-            channel = bot.get_channel(int(panel_data["channel_id"]))
-            if not channel:
-                continue
-            try:
-                message = await channel.fetch_message(int(panel_data["message_id"]))
-            except discord.NotFound:
-                continue
-            except discord.Forbidden:
-                continue
-            select_options = [
-                discord.SelectOption(
-                    label=position if isinstance(position, str) else position["name"],
-                    description=f"Apply for {position if isinstance(position, str) else position['name']} position",
-                    value=position if isinstance(position, str) else position["name"],
-                )
-                for position in panel_data["positions"]
-            ]
-            view = StaffApplicationView(bot, select_options, panel_id)
+            message_id = int(panel_data["message_id"])
+            view = build_panel_view(bot, panel_id, panel_data, guild_id)
             bot.views[panel_id] = view
-            bot.views[str(message.id)] = view
-            bot.add_view(view, message_id=message.id)
+            bot.views[str(message_id)] = view
+            bot.add_view(view, message_id=message_id)
             registered_count += 1
         except Exception as e:
             logger.error(f"Error registering panel: {e}")
@@ -78,9 +129,40 @@ async def register_panels(bot):
     return registered_count
 
 
-async def create_panel(bot, channel_id, positions, embed_data):
-    from application_components import StaffApplicationView
+async def verify_panels(bot, concurrency=5):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def verify(guild_id, panel_id, panel_data):
+        if not bot.get_guild(int(guild_id)):
+            return True
+        async with semaphore:
+            channel = bot.get_channel(int(panel_data["channel_id"]))
+            if channel:
+                try:
+                    await channel.fetch_message(int(panel_data["message_id"]))
+                    return True
+                except (discord.NotFound, discord.Forbidden):
+                    pass
+                except discord.HTTPException as e:
+                    logger.error(f"Error verifying panel {panel_id}: {e}")
+                    return True
+        view = bot.views.pop(panel_id, None)
+        if view:
+            bot.views.pop(str(panel_data["message_id"]), None)
+            view.stop()
+        logger.warning(f"Panel {panel_id} message is gone, unregistered its view")
+        return False
+
+    checks = [
+        verify(guild_id, panel_id, panel_data)
+        for guild_id in get_guild_ids()
+        for panel_id, panel_data in load_panels(guild_id).items()
+    ]
+    results = await asyncio.gather(*checks)
+    return sum(results)
 
+
+async def create_panel(bot, channel_id, positions, embed_data):
     try:
         embed = discord.Embed(
             title=embed_data.get("title", "Staff Applications"),
@@ -107,30 +189,142 @@ async def create_panel(bot, channel_id, positions, embed_data):
         channel = bot.get_channel(int(channel_id))
         if not channel:
             return None
-        select_options = [
-            discord.SelectOption(
-                label=position,
-                value=position,
-                description=f"Apply for {position} position",
-            )
-            for position in positions
-        ]
-        panel_id = str(uuid.uuid4())
-        view = StaffApplicationView(bot, select_options, panel_id)
-        message = await channel.send(embed=embed, view=view)
-        bot.add_view(view, message_id=message.id)
-        panels = load_panels()
-        panel_data = {
-            "id": panel_id,
-            "channel_id": str(channel.id),
-            "message_id": str(message.id),
-            "positions": positions,
-        }
-        panels[panel_id] = panel_data
-        if not save_panels(panels):
-            return None
-        return panel_id
+        return await send_panel(bot, channel, embed, positions)
     except Exception as e:
         logger.error(f"Error creating panel: {e}")
         logger.error(f"Error traceback: {traceback.format_exc()}")
         return None
+
+
+async def send_panel(bot, channel, embed, positions):
+    from application_components import StaffApplicationView
+
+    select_options = [
+        discord.SelectOption(
+            label=position,
+            value=position,
+            description=f"Apply for {position} position",
+        )
+        for position in positions
+    ]
+    panel_id = str(uuid.uuid4())
+    guild_id = str(channel.guild.id)
+    view = StaffApplicationView(bot, select_options, panel_id, guild_id)
+    message = await channel.send(embed=embed, view=view)
+    bot.add_view(view, message_id=message.id)
+    panels = load_panels(guild_id)
+    panel_data = {
+        "id": panel_id,
+        "channel_id": str(channel.id),
+        "message_id": str(message.id),
+        "positions": positions,
+    }
+    panels[panel_id] = panel_data
+    if not save_panels(panels, guild_id):
+        return None
+    return panel_id
+
+
+def get_panel_job(guild_id):
+    return panel_jobs.get(str(guild_id))
+
+
+def request_panel_render(bot, guild_id, panel_ids):
+    guild_id = str(guild_id)
+    panel_render_requests[guild_id].update(panel_ids)
+    job = panel_jobs.get(guild_id)
+    if job and job["state"] == "running":
+        return job
+    job = {
+        "id": str(uuid.uuid4()),
+        "state": "running",
+        "total": 0,
+        "done": 0,
+        "failed": 0,
+        "errors": [],
+        "started_at": datetime.datetime.now(UTC).isoformat(),
+        "finished_at": None,
+    }
+    panel_jobs[guild_id] = job
+    task = asyncio.create_task(run_panel_render(bot, guild_id, job))
+    panel_render_tasks.add(task)
+    task.add_done_callback(panel_render_tasks.discard)
+    return job
+
+
+async def render_channel_panels(bot, guild_id, job, semaphore, panels, panel_ids):
+    async with semaphore:
+        for panel_id in panel_ids:
+            error = await render_panel(bot, guild_id, panel_id, panels[panel_id])
+            job["done"] += 1
+            if error:
+                job["failed"] += 1
+                job["errors"].append({"panel_id": panel_id, "error": error})
+
+
+async def run_panel_render(bot, guild_id, job):
+    semaphore = asyncio.Semaphore(PANEL_RENDER_CONCURRENCY)
+    try:
+        while panel_render_requests.get(guild_id):
+            panel_ids = panel_render_requests.pop(guild_id)
+            panels = load_panels(guild_id)
+            by_channel = collections.defaultdict(list)
+            for panel_id in panel_ids:
+                if panel_id in panels:
+                    by_channel[panels[panel_id]["channel_id"]].append(panel_id)
+            job["total"] += sum(len(ids) for ids in by_channel.values())
+            await asyncio.gather(
+                *(
+                    render_channel_panels(
+                        bot, guild_id, job, semaphore, panels, channel_panel_ids
+                    )
+                    for channel_panel_ids in by_channel.values()
+                )
+            )
+    except Exception as e:
+        logger.exception("Error re-rendering panels")
+        job["errors"].append({"panel_id": None, "error": str(e)})
+    job["state"] = "done"
+    job["finished_at"] = datetime.datetime.now(UTC).isoformat()
+    logger.info(
+        f"Re-rendered {job['done'] - job['failed']} of {job['total']} panels in guild {guild_id}"
+    )
+
+
+def build_panel_view(bot, panel_id, panel_data, guild_id=None):
+    from application_components import StaffApplicationView
+
+    select_options = get_panel_options(panel_data, guild_id)
+    if select_options:
+        return StaffApplicationView(bot, select_options, panel_id, guild_id)
+    view = StaffApplicationView(
+        bot,
+        [discord.SelectOption(label="No open positions", value="none")],
+        panel_id,
+        guild_id,
+    )
+    view.children[0].placeholder = "No positions are open right now."
+    view.children[0].disabled = True
+    return view
+
+
+async def render_panel(bot, guild_id, panel_id, panel_data):
+    channel = bot.get_channel(int(panel_data["channel_id"]))
+    if not channel:
+        return "channel not found"
+    message_id = int(panel_data["message_id"])
+    view = build_panel_view(bot, panel_id, panel_data, guild_id)
+    try:
+        await channel.get_partial_message(message_id).edit(view=view)
+    except discord.NotFound:
+        return "message not found"
+    except discord.HTTPException as e:
+        logger.error(f"Error re-rendering panel {panel_id}: {e}")
+        return str(e)
+    old_view = bot.views.get(panel_id)
+    if old_view and old_view is not view:
+        old_view.stop()
+    bot.views[panel_id] = view
+    bot.views[str(message_id)] = view
+    bot.add_view(view, message_id=message_id)
+    return None
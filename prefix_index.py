@@ -0,0 +1,119 @@
+import bisect
+import os
+
+from search_index import get_database_path, iter_entries
+
+indexes = {}
+
+
+class PrefixIndex:
+    def __init__(self, entries, mtime=None):
+        self.mtime = mtime
+        self.records = {}
+        self.users = {}
+        for app_id, user_name, user_id, position in entries:
+            self.records[app_id] = (user_name, str(user_id), position)
+            self.users.setdefault(str(user_id), set()).add(app_id)
+        self.keys = sorted(
+            (key, app_id)
+            for app_id, record in self.records.items()
+            for key in self.get_keys(record)
+        )
+
+    @staticmethod
+    def get_keys(record):
+        user_name, user_id, _ = record
+        keys = {user_id}
+        if user_name:
+            keys.add(user_name.casefold())
+        return keys
+
+    def add(self, app_id, user_name, user_id, position):
+        self.remove(app_id)
+        record = (user_name, str(user_id), position)
+        self.records[app_id] = record
+        self.users.setdefault(record[1], set()).add(app_id)
+        for key in self.get_keys(record):
+            bisect.insort(self.keys, (key, app_id))
+
+    def remove(self, app_id):
+        record = self.records.pop(app_id, None)
+        if record is None:
+            return
+        user_apps = self.users.get(record[1], set())
+        user_apps.discard(app_id)
+        if not user_apps:
+            self.users.pop(record[1], None)
+        for key in self.get_keys(record):
+            index = bisect.bisect_left(self.keys, (key, app_id))
+            if index < len(self.keys) and self.keys[index] == (key, app_id):
+                del self.keys[index]
+
+    def search(self, prefix, positions=None, limit=10):
+        prefix = prefix.casefold()
+        users = {}
+        index = bisect.bisect_left(self.keys, (prefix,))
+        while (
+            len(users) < limit
+            and index < len(self.keys)
+            and self.keys[index][0].startswith(prefix)
+        ):
+            user_name, user_id, _ = self.records[self.keys[index][1]]
+            index += 1
+            if user_id in users:
+                continue
+            count = sum(
+                1
+                for app_id in self.users[user_id]
+                if positions is None or self.records[app_id][2] in positions
+            )
+            if count:
+                users[user_id] = {
+                    "user_id": user_id,
+                    "user_name": user_name,
+                    "applications": count,
+                }
+        return list(users.values())
+
+
+def get_mtime(directory):
+    try:
+        return os.path.getmtime(get_database_path(directory))
+    except OSError:
+        return None
+
+
+def get_index(directory):
+    mtime = get_mtime(directory)
+    index = indexes.get(directory)
+    if index is None or index.mtime != mtime:
+        index = indexes[directory] = PrefixIndex(iter_entries(directory), mtime)
+    return index
+
+
+def is_current(directory):
+    index = indexes.get(directory)
+    return index is not None and index.mtime == get_mtime(directory)
+
+
+def record_application(directory, app_id, application, was_current):
+    index = indexes.get(directory)
+    if index is not None and not was_current:
+        del indexes[directory]
+    elif index is not None:
+        index.add(
+            app_id,
+            application.get("user_name", ""),
+            application.get("user_id", ""),
+            application.get("position", ""),
+        )
+        index.mtime = get_mtime(directory)
+
+
+def forget_application(directory, app_id, was_current):
+    index = indexes.get(directory)
+    if index is not None and not was_current:
+        del indexes[directory]
+    elif index is not None:
+        index.remove(app_id)
+        index.mtime = get_mtime(directory)
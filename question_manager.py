@@ -1,19 +1,21 @@
 import json
 import logging
 import os
-import pathlib
-from dotenv import load_dotenv
+from question_sets import resolve_questions, store_question_set
+from storage_manager import get_guild_directory
 
 logger = logging.getLogger(__name__)
-load_dotenv()
-pathlib.Path("storage").mkdir(exist_ok=True)
-QUESTIONS_FILE = "storage/questions.json"
 
 
-def load_questions():
-    if not os.path.exists(QUESTIONS_FILE):
+def get_questions_file(guild_id=None):
+    return os.path.join(get_guild_directory(guild_id), "questions.json")
+
+
+def load_questions(guild_id=None):
+    questions_file = get_questions_file(guild_id)
+    if not os.path.exists(questions_file):
         return {}
-    with open(QUESTIONS_FILE, "r") as f:
+    with open(questions_file, "r") as f:
         data = json.load(f)
         if isinstance(data, dict) and all(isinstance(v, list) for v in data.values()):
             new_data = {}
@@ -33,16 +35,23 @@ def load_questions():
                     "denied_removal_roles": [],
                     "viewer_roles": [],
                     "time_limit": 60,
+                    "answer_mode": "dm",
+                    "screening_action": "flag",
+                    "reapply_cooldown_days": 0,
+                    "log_mode": "immediate",
+                    "digest_window": 15,
+                    "max_active_sessions": 0,
                 }
-            save_questions(new_data)
+            save_questions(new_data, guild_id)
             return new_data
         return data
 
 
-def save_questions(questions):
+def save_questions(questions, guild_id=None):
     try:
-        os.makedirs(os.path.dirname(QUESTIONS_FILE), exist_ok=True)
-        with open(QUESTIONS_FILE, "w") as f:
+        questions_file = get_questions_file(guild_id)
+        os.makedirs(os.path.dirname(questions_file), exist_ok=True)
+        with open(questions_file, "w") as f:
             json.dump(questions, f, indent=4)
         return True
     except Exception as e:
@@ -50,9 +59,9 @@ def save_questions(questions):
         return False
 
 
-def get_questions(position):
+def get_questions(position, guild_id=None):
     try:
-        questions = load_questions()
+        questions = load_questions(guild_id)
         if position in questions:
             if not questions[position]["enabled"]:
                 logger.info(f"Position {position} is disabled")
@@ -75,8 +84,35 @@ def get_questions(position):
         return []
 
 
-def add_position(position, copy_from=None):
-    questions = load_questions()
+def get_question_set(position, guild_id=None):
+    questions = get_questions(position, guild_id)
+    if not questions:
+        return None, []
+    try:
+        set_id = store_question_set(get_guild_directory(guild_id), questions)
+    except (OSError, TypeError, ValueError) as e:
+        logger.error(f"Error storing question set for position {position}: {e}")
+        return None, []
+    return set_id, questions
+
+
+def get_application_questions(application, guild_id=None):
+    return resolve_questions(
+        get_guild_directory(guild_id or application.get("guild_id")), application
+    )
+
+
+def get_application_question_set(application, guild_id=None):
+    if application.get("question_set"):
+        return application["question_set"]
+    return store_question_set(
+        get_guild_directory(guild_id or application.get("guild_id")),
+        application.get("questions", []),
+    )
+
+
+def add_position(position, copy_from=None, guild_id=None):
+    questions = load_questions(guild_id)
     if position in questions:
         return False
     if copy_from and copy_from in questions:
@@ -106,57 +142,63 @@ def add_position(position, copy_from=None):
             "viewer_roles": [],
             "auto_thread": False,
             "time_limit": 60,
+            "answer_mode": "dm",
+            "screening_action": "flag",
+            "reapply_cooldown_days": 0,
+            "log_mode": "immediate",
+            "digest_window": 15,
+            "max_active_sessions": 0,
         }
-    return save_questions(questions)
+    return save_questions(questions, guild_id)
 
 
-def delete_position(position):
-    questions = load_questions()
+def delete_position(position, guild_id=None):
+    questions = load_questions(guild_id)
     if position in questions:
         del questions[position]
-        return save_questions(questions)
+        return save_questions(questions, guild_id)
     return False
 
 
-def update_position_settings(position, settings):
-    questions = load_questions()
+def update_position_settings(position, settings, guild_id=None):
+    questions = load_questions(guild_id)
     if position in questions:
         questions[position].update(settings)
-        return save_questions(questions)
+        return save_questions(questions, guild_id)
     return False
 
 
-def add_question_to_position(position, question):
-    questions = load_questions()
+def add_question_to_position(position, question, guild_id=None):
+    questions = load_questions(guild_id)
     if position in questions:
         questions[position]["questions"].append(question)
-        return save_questions(questions)
+        return save_questions(questions, guild_id)
     return False
 
 
-def remove_question(position, index):
-    questions = load_questions()
+def remove_question(position, index, guild_id=None):
+    questions = load_questions(guild_id)
     if position in questions and 0 <= index < len(questions[position]["questions"]):
         questions[position]["questions"].pop(index)
-        return save_questions(questions)
+        return save_questions(questions, guild_id)
     return False
 
 
-def update_question(position, index, new_question):
-    questions = load_questions()
+def update_question(position, index, new_question, guild_id=None):
+    questions = load_questions(guild_id)
     if position in questions and 0 <= index < len(questions[position]["questions"]):
         questions[position]["questions"][index] = new_question
-        return save_questions(questions)
+        return save_questions(questions, guild_id)
     return False
 
 
-def reorder_questions(position, new_order):
-    questions = load_questions()
+def reorder_questions(position, new_order, guild_id=None):
+    questions = load_questions(guild_id)
     if position in questions and len(new_order) == len(
         questions[position]["questions"]
     ):
         questions[position]["questions"] = [
             questions[position]["questions"][i] for i in new_order
         ]
-        return save_questions(questions)
+        return save_questions(questions, guild_id)
     return False
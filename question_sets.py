@@ -0,0 +1,54 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+QUESTION_SETS_DIRECTORY = "question_sets"
+
+
+def get_question_set_id(questions):
+    payload = json.dumps(questions, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def get_question_set_path(directory, set_id):
+    return os.path.join(directory, QUESTION_SETS_DIRECTORY, f"{set_id}.json")
+
+
+def store_question_set(directory, questions):
+    set_id = get_question_set_id(questions)
+    path = get_question_set_path(directory, set_id)
+    if os.path.exists(path):
+        return set_id
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(questions, f, indent=4)
+    os.replace(temp_path, path)
+    return set_id
+
+
+@functools.lru_cache(maxsize=1024)
+def read_question_set(path):
+    with open(path, "r") as f:
+        return tuple(json.load(f))
+
+
+def load_question_set(directory, set_id):
+    if not set_id or not set_id.isalnum():
+        return None
+    try:
+        return list(read_question_set(get_question_set_path(directory, set_id)))
+    except (OSError, TypeError, ValueError) as e:
+        logger.error(f"Error loading question set {set_id}: {e}")
+        return None
+
+
+def resolve_questions(directory, application):
+    if "questions" in application:
+        return application["questions"]
+    if "questions_answers" in application:
+        return [pair.get("question", "") for pair in application["questions_answers"]]
+    return load_question_set(directory, application.get("question_set")) or []
@@ -0,0 +1,113 @@
+import collections
+import contextlib
+import contextvars
+import functools
+import logging
+
+from discord.webhook.async_ import AsyncWebhookAdapter
+
+logger = logging.getLogger(__name__)
+FLOW_BUDGETS = {
+    "apply": 4,
+    "start": 4,
+    "answer": 1,
+    "page": 1,
+    "panel": 1,
+    "submit": 3,
+    "decide": 5,
+}
+current_flow = contextvars.ContextVar("rest_flow", default=None)
+route_calls = collections.Counter()
+
+
+def new_stats():
+    return {"runs": 0, "calls": 0, "max_calls": 0, "over_budget": 0}
+
+
+flow_stats = collections.defaultdict(new_stats)
+
+
+def record(route):
+    run = current_flow.get()
+    name = run["flow"] if run else "other"
+    route_calls[(name, route)] += 1
+    if run:
+        run["calls"] += 1
+
+
+@contextlib.contextmanager
+def flow(name):
+    run = {"flow": name, "calls": 0}
+    token = current_flow.set(run)
+    try:
+        yield run
+    finally:
+        current_flow.reset(token)
+        stats = flow_stats[name]
+        stats["runs"] += 1
+        stats["calls"] += run["calls"]
+        stats["max_calls"] = max(stats["max_calls"], run["calls"])
+        budget = FLOW_BUDGETS.get(name)
+        if budget is not None and run["calls"] > budget:
+            stats["over_budget"] += 1
+            logger.warning(
+                "Flow %s made %s REST calls (budget %s)", name, run["calls"], budget
+            )
+
+
+def track_flow(name):
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with flow(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def instrument(http):
+    request = http.request
+
+    async def counted_request(route, **kwargs):
+        record(f"{route.method} {route.path}")
+        return await request(route, **kwargs)
+
+    http.request = counted_request
+    if not getattr(AsyncWebhookAdapter, "instrumented", False):
+        webhook_request = AsyncWebhookAdapter.request
+
+        async def counted_webhook_request(self, route, session, **kwargs):
+            record(f"{route.method} {route.path}")
+            return await webhook_request(self, route, session, **kwargs)
+
+        AsyncWebhookAdapter.request = counted_webhook_request
+        AsyncWebhookAdapter.instrumented = True
+
+
+def get_metrics():
+    flows = {}
+    for name in sorted(set(FLOW_BUDGETS) | set(flow_stats) | {"other"}):
+        stats = flow_stats.get(name) or new_stats()
+        flows[name] = {
+            **stats,
+            "mean_calls": round(stats["calls"] / stats["runs"], 2)
+            if stats["runs"]
+            else 0,
+            "budget": FLOW_BUDGETS.get(name),
+            "routes": {},
+        }
+    for (name, route), count in route_calls.most_common():
+        flows[name]["routes"][route] = count
+        if name == "other":
+            flows[name]["calls"] += count
+    return flows
+
+
+def get_budget_violations():
+    return {
+        name: stats["max_calls"]
+        for name, stats in flow_stats.items()
+        if name in FLOW_BUDGETS and stats["max_calls"] > FLOW_BUDGETS[name]
+    }
@@ -0,0 +1,166 @@
+import collections
+import contextlib
+import datetime
+import logging
+import os
+import sqlite3
+from datetime import UTC
+
+logger = logging.getLogger(__name__)
+ROLLUP_DATABASE = "rollups.db"
+ROLLUP_METRICS = (
+    "submitted",
+    "started",
+    "expired",
+    "cancelled",
+    "approved",
+    "rejected",
+    "decision_seconds",
+)
+RECORD_METRICS = ("submitted", "approved", "rejected", "decision_seconds")
+
+
+def get_database_path(directory):
+    return os.path.join(directory, ROLLUP_DATABASE)
+
+
+@contextlib.contextmanager
+def connect(directory):
+    connection = sqlite3.connect(get_database_path(directory))
+    try:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS rollups ("
+            "day TEXT NOT NULL, position TEXT NOT NULL, metric TEXT NOT NULL, "
+            "value REAL NOT NULL, PRIMARY KEY (day, position, metric)) WITHOUT ROWID"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        yield connection
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def get_day(timestamp=None):
+    if timestamp is None:
+        return datetime.datetime.now(UTC).date().isoformat()
+    return datetime.datetime.fromisoformat(timestamp).astimezone(UTC).date().isoformat()
+
+
+def get_decision_values(application):
+    processed_at = (application.get("processed_by") or {}).get("timestamp")
+    status = application.get("status")
+    if status not in ["approved", "rejected"]:
+        return None, {}
+    values = {status: 1}
+    submitted_at = application.get("submitted_at")
+    if processed_at and submitted_at:
+        elapsed = (
+            datetime.datetime.fromisoformat(processed_at)
+            - datetime.datetime.fromisoformat(submitted_at)
+        ).total_seconds()
+        values["decision_seconds"] = max(0.0, elapsed)
+    return processed_at, values
+
+
+def add_rollups(connection, day, position, values):
+    connection.executemany(
+        "INSERT INTO rollups VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (day, position, metric) DO UPDATE SET value = value + excluded.value",
+        [(day, position, metric, value) for metric, value in values.items()],
+    )
+
+
+def record_rollup(directory, position, values, timestamp=None):
+    try:
+        with connect(directory) as connection:
+            add_rollups(connection, get_day(timestamp), position or "", values)
+        return True
+    except (OSError, TypeError, ValueError, sqlite3.Error) as e:
+        logger.error(f"Error recording rollup for {position}: {e}")
+        return False
+
+
+def is_backfilled(directory):
+    if not os.path.exists(get_database_path(directory)):
+        return False
+    with connect(directory) as connection:
+        row = connection.execute(
+            "SELECT value FROM meta WHERE key = 'backfilled'"
+        ).fetchone()
+    return row is not None
+
+
+def backfill_rollups(directory, applications):
+    count = 0
+    totals = collections.defaultdict(collections.Counter)
+    for _, application in applications:
+        position = application.get("position", "")
+        if application.get("submitted_at"):
+            totals[(get_day(application["submitted_at"]), position)]["submitted"] += 1
+        processed_at, values = get_decision_values(application)
+        decided_at = processed_at or application.get("submitted_at")
+        if values and decided_at:
+            totals[(get_day(decided_at), position)].update(values)
+        count += 1
+    placeholders = ", ".join("?" for _ in RECORD_METRICS)
+    with connect(directory) as connection:
+        connection.execute(
+            f"DELETE FROM rollups WHERE metric IN ({placeholders})", RECORD_METRICS
+        )
+        for (day, position), values in totals.items():
+            add_rollups(connection, day, position, values)
+        connection.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('backfilled', ?)",
+            (datetime.datetime.now(UTC).isoformat(),),
+        )
+    return count
+
+
+def get_totals(directory, since=None, positions=None):
+    query = "SELECT position, metric, SUM(value) FROM rollups"
+    parameters = ()
+    if since is not None:
+        query += " WHERE day >= ?"
+        parameters = (since.astimezone(UTC).date().isoformat(),)
+    with connect(directory) as connection:
+        rows = connection.execute(
+            f"{query} GROUP BY position, metric", parameters
+        ).fetchall()
+    totals = collections.defaultdict(dict)
+    for position, metric, value in rows:
+        if positions is None or position in positions:
+            totals[position][metric] = value
+    return dict(totals)
+
+
+def get_trends(directory, days=30, positions=None):
+    today = datetime.datetime.now(UTC).date()
+    labels = [
+        (today - datetime.timedelta(days=offset)).isoformat()
+        for offset in range(days - 1, -1, -1)
+    ]
+    series = {metric: [0] * days for metric in ROLLUP_METRICS}
+    by_position = collections.defaultdict(lambda: dict.fromkeys(ROLLUP_METRICS, 0))
+    slots = {day: i for i, day in enumerate(labels)}
+    with connect(directory) as connection:
+        rows = connection.execute(
+            "SELECT day, position, metric, value FROM rollups WHERE day >= ?",
+            (labels[0],),
+        ).fetchall()
+    for day, position, metric, value in rows:
+        if positions is not None and position not in positions:
+            continue
+        if metric not in series or day not in slots:
+            continue
+        series[metric][slots[day]] += value
+        by_position[position][metric] += value
+    decided = [series["approved"][i] + series["rejected"][i] for i in range(days)]
+    series["mean_decision_hours"] = [
+        round(series["decision_seconds"][i] / decided[i] / 3600, 2)
+        if decided[i]
+        else None
+        for i in range(days)
+    ]
+    return {"days": labels, "series": series, "positions": dict(by_position)}
@@ -0,0 +1,171 @@
+import contextlib
+import logging
+import os
+import re
+import sqlite3
+
+from question_sets import load_question_set
+
+logger = logging.getLogger(__name__)
+SEARCH_DATABASE = "search.db"
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def get_database_path(directory):
+    return os.path.join(directory, SEARCH_DATABASE)
+
+
+@contextlib.contextmanager
+def connect(directory):
+    connection = sqlite3.connect(get_database_path(directory))
+    try:
+        connection.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS applications USING fts5("
+            "app_id UNINDEXED, position UNINDEXED, status UNINDEXED, "
+            "user_name, user_id, content, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        yield connection
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def get_application_text(directory, application):
+    parts = []
+    for pair in application.get("questions_answers", []):
+        parts.extend([pair.get("question", ""), pair.get("answer", "")])
+    questions = (
+        application.get("questions")
+        or load_question_set(directory, application.get("question_set"))
+        or []
+    )
+    answers = application.get("answers", [])
+    for i, question in enumerate(questions):
+        parts.append(question)
+        if i < len(answers):
+            parts.append(answers[i])
+    return "\n".join(str(part) for part in parts)
+
+
+def get_row(directory, app_id, application):
+    return (
+        app_id,
+        application.get("position", ""),
+        application.get("status", "pending"),
+        application.get("user_name", ""),
+        str(application.get("user_id", "")),
+        get_application_text(directory, application),
+    )
+
+
+def index_application(directory, app_id, application):
+    try:
+        with connect(directory) as connection:
+            connection.execute("DELETE FROM applications WHERE app_id = ?", (app_id,))
+            connection.execute(
+                "INSERT INTO applications VALUES (?, ?, ?, ?, ?, ?)",
+                get_row(directory, app_id, application),
+            )
+        return True
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"Error indexing application {app_id}: {e}")
+        return False
+
+
+def remove_application(directory, app_id):
+    try:
+        with connect(directory) as connection:
+            connection.execute("DELETE FROM applications WHERE app_id = ?", (app_id,))
+        return True
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"Error removing application {app_id} from search index: {e}")
+        return False
+
+
+def rebuild_index(directory, applications):
+    count = 0
+    with connect(directory) as connection:
+        connection.execute("DELETE FROM applications")
+        for app_id, application in applications:
+            connection.execute(
+                "INSERT INTO applications VALUES (?, ?, ?, ?, ?, ?)",
+                get_row(directory, app_id, application),
+            )
+            count += 1
+    return count
+
+
+def iter_entries(directory):
+    with connect(directory) as connection:
+        yield from connection.execute(
+            "SELECT app_id, user_name, user_id, position FROM applications"
+        )
+
+
+def get_summaries(directory):
+    with connect(directory) as connection:
+        rows = connection.execute(
+            "SELECT app_id, position, status, user_name, user_id FROM applications"
+        ).fetchall()
+    return [
+        {
+            "id": row[0],
+            "position": row[1],
+            "status": row[2],
+            "user_name": row[3],
+            "user_id": row[4],
+        }
+        for row in rows
+    ]
+
+
+def get_status_counts(directory):
+    with connect(directory) as connection:
+        rows = connection.execute(
+            "SELECT lower(status), COUNT(*) FROM applications GROUP BY lower(status)"
+        ).fetchall()
+    return dict(rows)
+
+
+def index_exists(directory):
+    return os.path.exists(get_database_path(directory))
+
+
+def build_query(text):
+    tokens = TOKEN_PATTERN.findall(text)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens[:-1]]
+    terms.append(f'"{tokens[-1]}"*')
+    return " ".join(terms)
+
+
+def search(directory, text, positions=None, limit=50):
+    query = build_query(text)
+    if query is None or (positions is not None and not positions):
+        return []
+    sql = (
+        "SELECT app_id, position, status, user_name, user_id, "
+        "snippet(applications, 5, '[', ']', '...', 12) "
+        "FROM applications WHERE applications MATCH ?"
+    )
+    params = [query]
+    if positions is not None:
+        sql += f" AND position IN ({', '.join('?' for _ in positions)})"
+        params.extend(positions)
+    sql += " ORDER BY bm25(applications, 0, 0, 0, 2.0, 2.0, 1.0) LIMIT ?"
+    params.append(limit)
+    with connect(directory) as connection:
+        rows = connection.execute(sql, params).fetchall()
+    return [
+        {
+            "id": row[0],
+            "position": row[1],
+            "status": row[2],
+            "user_name": row[3],
+            "user_id": row[4],
+            "snippet": row[5],
+        }
+        for row in rows
+    ]
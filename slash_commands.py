@@ -0,0 +1,64 @@
+import logging
+import os
+
+import discord
+from discord import app_commands
+
+from application_components import StaffApplicationView
+from command_sync import sync_commands
+
+logger = logging.getLogger(__name__)
+
+
+def register_commands(bot):
+    @bot.tree.command(
+        name="setup_applications", description="Set up the staff application system"
+    )
+    @app_commands.default_permissions(administrator=True)
+    async def setup_applications(interaction: discord.Interaction):
+        embed = discord.Embed(
+            title="Staff Applications",
+            description="Select a position below to apply for our staff team!",
+            color=0x808080,
+        )
+        embed.set_footer(text="Applications are processed by our admin team")
+        view = StaffApplicationView(bot)
+        bot.add_view(view)
+        await interaction.response.send_message(embed=embed, view=view)
+
+    @bot.tree.command(
+        name="panel_create",
+        description="Create a new application panel through the dashboard",
+    )
+    @app_commands.default_permissions(administrator=True)
+    async def panel_create(interaction: discord.Interaction):
+        web_url = f"http://{os.getenv('WEB_HOST', 'localhost')}:{os.getenv('WEB_PORT', '8080')}/panels/create"
+        web_external = os.getenv("WEB_EXTERNAL")
+        if web_external:
+            web_url = f"{web_external}/panels/create"
+        await interaction.response.send_message(
+            f"Please use the web dashboard to create and manage panels. Visit the dashboard at {web_url}",
+            ephemeral=True,
+        )
+
+    @bot.tree.command(
+        name="sync_commands",
+        description="Force a resync of the bot's application commands",
+    )
+    @app_commands.default_permissions(administrator=True)
+    async def force_sync_commands(interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+        try:
+            synced = await sync_commands(bot, force=True)
+        except discord.HTTPException as e:
+            logger.error(f"Error syncing commands: {e}")
+            synced = False
+        if synced:
+            await interaction.followup.send(
+                "Application commands synced successfully.", ephemeral=True
+            )
+        else:
+            await interaction.followup.send(
+                "Failed to sync application commands. Check the logs for details.",
+                ephemeral=True,
+            )
@@ -0,0 +1,42 @@
+import contextlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimeline:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last_mark = self.started
+        self.phases = []
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, self.last_mark - self.started, now - self.last_mark))
+        self.last_mark = now
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append(
+                (name, start - self.started, time.perf_counter() - start)
+            )
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def report(self, title="Startup profile"):
+        lines = [f"{title} ({self.elapsed() * 1000:.0f} ms since launch):"]
+        for name, offset, duration in sorted(self.phases, key=lambda p: p[1]):
+            lines.append(
+                f"  {name:<24} +{offset * 1000:>8.0f} ms {duration * 1000:>8.0f} ms"
+            )
+        logger.info("\n".join(lines))
+        return self.phases
+
+
+timeline = StartupTimeline()
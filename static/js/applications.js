@@ -0,0 +1,43 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const lookup = document.getElementById('applicantLookup');
+    const results = document.getElementById('applicantResults');
+    if (!lookup || !results) {
+        return;
+    }
+    let requestId = 0;
+
+    function renderResults(applicants) {
+        results.innerHTML = '';
+        applicants.forEach(function(applicant) {
+            const item = document.createElement('li');
+            const link = document.createElement('a');
+            link.className = 'dropdown-item';
+            link.href = `/applications?user_id=${encodeURIComponent(applicant.user_id)}`;
+            link.textContent = `${applicant.user_name} (${applicant.user_id}) - ${applicant.applications}`;
+            item.appendChild(link);
+            results.appendChild(item);
+        });
+        results.classList.toggle('show', applicants.length > 0);
+    }
+
+    lookup.addEventListener('input', function() {
+        const prefix = lookup.value.trim();
+        const currentRequest = ++requestId;
+        if (!prefix) {
+            renderResults([]);
+            return;
+        }
+        fetch(`/api/applicants?prefix=${encodeURIComponent(prefix)}`)
+            .then(response => response.json())
+            .then(data => {
+                if (currentRequest === requestId) {
+                    renderResults(data.results || []);
+                }
+            })
+            .catch(error => console.error('Error looking up applicants:', error));
+    });
+
+    lookup.addEventListener('blur', function() {
+        setTimeout(() => results.classList.remove('show'), 200);
+    });
+});
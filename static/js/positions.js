@@ -86,6 +86,16 @@ async function submitEditPosition(event) {
         accepted_removal_roles: Array.from(document.getElementById('acceptedRemovalRoles').selectedOptions).map(option => option.value),
         denied_removal_roles: Array.from(document.getElementById('deniedRemovalRoles').selectedOptions).map(option => option.value),
         time_limit: parseInt(document.getElementById('timeLimit').value) || 60,
+        answer_mode: document.getElementById('answerMode').value,
+        blocked_patterns: document.getElementById('blockedPatterns').value
+            .split('\n')
+            .map(pattern => pattern.trim())
+            .filter(pattern => pattern !== ''),
+        screening_action: document.getElementById('screeningAction').value,
+        reapply_cooldown_days: parseInt(document.getElementById('reapplyCooldown').value) || 0,
+        log_mode: document.getElementById('logMode').value,
+        digest_window: parseInt(document.getElementById('digestWindow').value) || 15,
+        max_active_sessions: parseInt(document.getElementById('maxActiveSessions').value) || 0,
         questions: Array.from(document.querySelectorAll('.question-item'))
             .map(item => item.querySelector('input').value.trim())
             .filter(question => question !== '') // Filter out empty questions
@@ -107,6 +117,7 @@ async function submitEditPosition(event) {
         if (response.ok) {
             sessionStorage.setItem('toastMessage', 'Position updated successfully');
             sessionStorage.setItem('toastType', 'success');
+            sessionStorage.setItem('watchPanelJob', 'true');
             window.location.href = '/positions';
         } else {
             const responseText = await response.text();
@@ -167,6 +178,7 @@ async function deletePosition(position) {
             // Store the success message in sessionStorage
             sessionStorage.setItem('toastMessage', 'Position deleted successfully');
             sessionStorage.setItem('toastType', 'failure');
+            sessionStorage.setItem('watchPanelJob', 'true');
             setTimeout(() => location.reload(), 1000);
         } else {
             showErrorToast(`Failed to delete position: ${responseText}`);
@@ -177,6 +189,36 @@ async function deletePosition(position) {
     }
 }
 
+async function watchPanelJob() {
+    let announced = false;
+    while (true) {
+        let job;
+        try {
+            const response = await fetch('/api/panels/job');
+            if (!response.ok) return;
+            job = (await response.json()).job;
+        } catch (error) {
+            console.error('Error:', error);
+            return;
+        }
+        if (!job) return;
+        if (job.state === 'done') {
+            if (!announced && Date.now() - Date.parse(job.finished_at) > 30000) return;
+            if (job.failed) {
+                showErrorToast(`Updated ${job.done - job.failed} of ${job.total} panels, ${job.failed} failed`);
+            } else {
+                showSuccessToast(`Updated ${job.total} panels`);
+            }
+            return;
+        }
+        if (!announced) {
+            showSuccessToast(`Updating panels that show this position (${job.done}/${job.total})...`);
+            announced = true;
+        }
+        await new Promise(resolve => setTimeout(resolve, 2000));
+    }
+}
+
 // Modal functions
 function openAddPositionModal() {
     const modal = document.getElementById('addPositionModal');
@@ -208,6 +250,12 @@ function openEditPositionModal(button) {
     document.getElementById('positionEnabled').checked = data.enabled;
     document.getElementById('autoThread').checked = data.auto_thread;
     document.getElementById('timeLimit').value = data.time_limit || 60;
+    document.getElementById('answerMode').value = data.answer_mode || 'dm';
+    document.getElementById('screeningAction').value = data.screening_action || 'flag';
+    document.getElementById('reapplyCooldown').value = data.reapply_cooldown_days || 0;
+    document.getElementById('logMode').value = data.log_mode || 'immediate';
+    document.getElementById('digestWindow').value = data.digest_window || 15;
+    document.getElementById('maxActiveSessions').value = data.max_active_sessions || 0;
     document.getElementById('logChannel').value = data.log_channel;
     document.getElementById('welcomeMessage').value = data.welcome_message;
     document.getElementById('acceptedMessage').value = data.accepted_message;
@@ -432,6 +480,10 @@ document.addEventListener('DOMContentLoaded', function() {
         sessionStorage.removeItem('toastMessage');
         sessionStorage.removeItem('toastType');
     }
+    if (sessionStorage.getItem('watchPanelJob')) {
+        sessionStorage.removeItem('watchPanelJob');
+        watchPanelJob();
+    }
     
     // Close modals when clicking outside
     window.onclick = function(event) {
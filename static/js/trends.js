@@ -0,0 +1,61 @@
+const trendCharts = {};
+
+function renderTrendChart(id, type, labels, datasets, options = {}) {
+    if (trendCharts[id]) {
+        trendCharts[id].destroy();
+    }
+    trendCharts[id] = new Chart(document.getElementById(id), {
+        type: type,
+        data: { labels: labels, datasets: datasets },
+        options: {
+            responsive: true,
+            interaction: { mode: 'index', intersect: false },
+            ...options
+        }
+    });
+}
+
+async function loadTrends() {
+    const days = document.getElementById('trendDays').value;
+    try {
+        const response = await fetch(`/api/analytics/trends?days=${days}`);
+        if (!response.ok) {
+            showErrorToast('Failed to load application trends');
+            return;
+        }
+        const data = await response.json();
+        const labels = data.days.map(day => day.slice(5));
+        const series = data.series;
+        renderTrendChart('activityChart', 'line', labels, [
+            { label: 'Started', data: series.started, borderColor: '#0dcaf0', tension: 0.3 },
+            { label: 'Submitted', data: series.submitted, borderColor: '#0d6efd', tension: 0.3 },
+            { label: 'Expired', data: series.expired, borderColor: '#adb5bd', tension: 0.3 },
+            { label: 'Cancelled', data: series.cancelled, borderColor: '#ffc107', tension: 0.3 }
+        ], { scales: { y: { beginAtZero: true, ticks: { precision: 0 } } } });
+        renderTrendChart('decisionChart', 'bar', labels, [
+            { label: 'Approved', data: series.approved, backgroundColor: '#198754', stack: 'decisions' },
+            { label: 'Rejected', data: series.rejected, backgroundColor: '#dc3545', stack: 'decisions' },
+            {
+                label: 'Hours to decision',
+                data: series.mean_decision_hours,
+                type: 'line',
+                borderColor: '#6f42c1',
+                yAxisID: 'hours',
+                spanGaps: true
+            }
+        ], {
+            scales: {
+                y: { beginAtZero: true, stacked: true, ticks: { precision: 0 } },
+                hours: { beginAtZero: true, position: 'right', grid: { drawOnChartArea: false } }
+            }
+        });
+    } catch (error) {
+        console.error('Error:', error);
+        showErrorToast('Failed to load application trends');
+    }
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    document.getElementById('trendDays').addEventListener('change', loadTrends);
+    loadTrends();
+});
@@ -0,0 +1,248 @@
+import argparse
+import collections
+import concurrent.futures
+import datetime
+import json
+import os
+import sys
+import time
+
+from analytics_index import rebuild_headers
+from archive_store import get_archive_stats, iter_archived
+from duplicate_index import rebuild_signatures
+from history_index import history_exists, rebuild_history
+from rollup_index import backfill_rollups
+from search_index import index_exists, rebuild_index
+from storage_manager import (
+    STORAGE_DIRECTORY,
+    get_apps_directory,
+    get_guild_directory,
+    get_guild_ids,
+)
+
+CHECKPOINT_FILE = os.path.join(STORAGE_DIRECTORY, "migrate_checkpoint.json")
+CHECKPOINT_INTERVAL = 1000
+
+
+def read_application(path):
+    app_id = os.path.basename(path)[:-5]
+    try:
+        with open(path, "r") as f:
+            application = json.load(f)
+    except (OSError, ValueError) as e:
+        return app_id, None, str(e), []
+    if not isinstance(application, dict):
+        return app_id, None, "not a JSON object", []
+    missing = []
+    if application.get("id") != app_id:
+        application["id"] = app_id
+        missing.append("id")
+    if not application.get("status"):
+        application["status"] = "pending"
+        missing.append("status")
+    if not application.get("submitted_at"):
+        application["submitted_at"] = datetime.datetime.fromtimestamp(
+            os.path.getmtime(path), datetime.UTC
+        ).isoformat()
+        missing.append("submitted_at")
+    return app_id, application, None, missing
+
+
+def migrate_application(path):
+    app_id, application, error, missing = read_application(path)
+    if application is not None and missing:
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(application, f, indent=4)
+        os.replace(temp_path, path)
+    return app_id, application, error, missing
+
+
+def get_application_paths(guild_id, after=None):
+    apps_directory = get_apps_directory(guild_id)
+    filenames = sorted(
+        filename
+        for filename in os.listdir(apps_directory)
+        if filename.endswith(".json")
+    )
+    return [
+        os.path.join(apps_directory, filename)
+        for filename in filenames
+        if after is None or filename > after
+    ]
+
+
+def process_files(executor, worker, paths, on_progress=None):
+    for i, result in enumerate(executor.map(worker, paths, chunksize=64), 1):
+        yield result
+        if on_progress and i % CHECKPOINT_INTERVAL == 0:
+            on_progress(paths[i - 1])
+
+
+def load_checkpoint():
+    try:
+        with open(CHECKPOINT_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_checkpoint(checkpoint):
+    temp_path = f"{CHECKPOINT_FILE}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(temp_path, CHECKPOINT_FILE)
+
+
+def report_errors(errors):
+    for app_id, error in errors:
+        print(f"  corrupt: {app_id}.json ({error})")
+
+
+def reindex(executor, guild_id):
+    directory = get_guild_directory(guild_id)
+    applications = []
+    errors = []
+    for app_id, application, error, _ in process_files(
+        executor, read_application, get_application_paths(guild_id)
+    ):
+        if application is None:
+            errors.append((app_id, error))
+        else:
+            applications.append((app_id, application))
+    file_ids = {app_id for app_id, _ in applications}
+    applications.extend(
+        (app_id, application)
+        for app_id, application in iter_archived(directory)
+        if app_id not in file_ids
+    )
+    indexed = rebuild_index(directory, applications)
+    rebuild_history(directory, applications)
+    backfill_rollups(directory, applications)
+    rebuild_headers(directory, applications)
+    rebuild_signatures(directory, applications)
+    print(f"Guild {guild_id}: indexed {indexed} applications")
+    report_errors(errors)
+    return not errors
+
+
+def verify(executor, guild_id):
+    errors = []
+    missing_fields = collections.Counter()
+    total = 0
+    for app_id, application, error, missing in process_files(
+        executor, read_application, get_application_paths(guild_id)
+    ):
+        total += 1
+        if application is None:
+            errors.append((app_id, error))
+        missing_fields.update(missing)
+    print(f"Guild {guild_id}: {total} files, {len(errors)} corrupt")
+    for field, count in sorted(missing_fields.items()):
+        print(f"  missing {field}: {count}")
+    report_errors(errors)
+    return not errors
+
+
+def migrate(executor, guild_id, checkpoint):
+    key = str(guild_id)
+    paths = get_application_paths(guild_id, checkpoint.get(key))
+    if checkpoint.get(key):
+        print(f"Guild {guild_id}: resuming after {checkpoint[key]}")
+
+    def on_progress(path):
+        checkpoint[key] = os.path.basename(path)
+        save_checkpoint(checkpoint)
+
+    errors = []
+    updated = 0
+    for app_id, application, error, missing in process_files(
+        executor, migrate_application, paths, on_progress
+    ):
+        if application is None:
+            errors.append((app_id, error))
+        elif missing:
+            updated += 1
+    if paths:
+        on_progress(paths[-1])
+    print(f"Guild {guild_id}: checked {len(paths)} files, backfilled {updated}")
+    report_errors(errors)
+    directory = get_guild_directory(guild_id)
+    if updated and (index_exists(directory) or history_exists(directory)):
+        reindex(executor, guild_id)
+    return not errors
+
+
+def stats(guild_id):
+    statuses = collections.Counter()
+    positions = collections.Counter()
+    size = 0
+    for path in get_application_paths(guild_id):
+        size += os.path.getsize(path)
+        try:
+            with open(path, "r") as f:
+                application = json.load(f)
+        except (OSError, ValueError):
+            statuses["corrupt"] += 1
+            continue
+        statuses[application.get("status", "pending")] += 1
+        positions[application.get("position", "")] += 1
+    directory = get_guild_directory(guild_id)
+    archive = get_archive_stats(directory)
+    print(f"Guild {guild_id} ({directory})")
+    print(f"  files: {sum(statuses.values())} ({size} bytes)")
+    for status, count in sorted(statuses.items()):
+        print(f"    {status}: {count}")
+    for position, count in sorted(positions.items()):
+        print(f"    position {position or '(none)'}: {count}")
+    print(
+        f"  archive: {archive['records']} records in {archive['segments']} segments "
+        f"({archive['bytes']} bytes)"
+    )
+    print(f"  search index: {'yes' if index_exists(directory) else 'no'}")
+    print(f"  history index: {'yes' if history_exists(directory) else 'no'}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Offline maintenance for the application storage directory."
+    )
+    parser.add_argument("command", choices=["reindex", "verify", "migrate", "stats"])
+    parser.add_argument(
+        "--guild", action="append", help="Guild ID to process (default: all guilds)."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Parser processes (default: CPUs)."
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the migrate checkpoint and start from the beginning.",
+    )
+    args = parser.parse_args()
+    guild_ids = args.guild or get_guild_ids()
+    start = time.perf_counter()
+    ok = True
+    if args.command == "stats":
+        for guild_id in guild_ids:
+            ok = stats(guild_id) and ok
+    else:
+        checkpoint = {} if args.restart else load_checkpoint()
+        with concurrent.futures.ProcessPoolExecutor(args.workers) as executor:
+            for guild_id in guild_ids:
+                if args.command == "reindex":
+                    ok = reindex(executor, guild_id) and ok
+                elif args.command == "verify":
+                    ok = verify(executor, guild_id) and ok
+                else:
+                    ok = migrate(executor, guild_id, checkpoint) and ok
+        if args.command == "migrate" and os.path.exists(CHECKPOINT_FILE):
+            os.remove(CHECKPOINT_FILE)
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+import contextlib
+import datetime
+import fcntl
+import json
+import logging
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+import zlib
+
+from dotenv import load_dotenv
+
+from analytics_index import (
+    analytics_exists,
+    get_report,
+    rebuild_headers,
+    record_header,
+    remove_header,
+)
+from archive_store import append_records, iter_archived, load_archived, remove_archived
+from duplicate_index import (
+    duplicates_exist,
+    find_duplicates,
+    index_signature,
+    rebuild_signatures,
+    remove_signature,
+)
+from history_index import (
+    get_last_submission,
+    get_user_history,
+    history_exists,
+    rebuild_history,
+    record_history,
+    remove_history,
+)
+from prefix_index import (
+    forget_application,
+    get_index,
+    is_current,
+    record_application,
+)
+from rollup_index import (
+    backfill_rollups,
+    get_decision_values,
+    get_totals,
+    get_trends,
+    is_backfilled,
+    record_rollup,
+)
+from search_index import (
+    get_status_counts,
+    get_summaries,
+    index_application,
+    index_exists,
+    rebuild_index,
+    remove_application,
+    search,
+)
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+STORAGE_DIRECTORY = "storage"
+GUILDS_DIRECTORY = os.path.join(STORAGE_DIRECTORY, "guilds")
+DEFAULT_GUILD_ID = os.getenv("SERVER_ID")
+LOCK_STRIPES = 64
+index_build_lock = threading.Lock()
+
+
+def ensure_storage():
+    for directory in ["applications", "guilds", "logs"]:
+        pathlib.Path(STORAGE_DIRECTORY, directory).mkdir(parents=True, exist_ok=True)
+    questions_file = os.path.join(STORAGE_DIRECTORY, "questions.json")
+    if not os.path.exists(questions_file):
+        with open(questions_file, "w") as f:
+            f.write("{}")
+        logger.info(f"Created default file: {questions_file}")
+
+
+def resolve_guild_id(guild_id=None):
+    if guild_id:
+        return str(guild_id)
+    return DEFAULT_GUILD_ID
+
+
+def get_guild_directory(guild_id=None):
+    guild_id = resolve_guild_id(guild_id)
+    if not guild_id or guild_id == DEFAULT_GUILD_ID:
+        return STORAGE_DIRECTORY
+    directory = os.path.join(GUILDS_DIRECTORY, guild_id)
+    pathlib.Path(directory, "applications").mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def get_apps_directory(guild_id=None):
+    return os.path.join(get_guild_directory(guild_id), "applications")
+
+
+def get_guild_ids():
+    guild_ids = [DEFAULT_GUILD_ID] if DEFAULT_GUILD_ID else []
+    if os.path.isdir(GUILDS_DIRECTORY):
+        for name in sorted(os.listdir(GUILDS_DIRECTORY)):
+            if name.isdigit() and name not in guild_ids:
+                guild_ids.append(name)
+    return guild_ids
+
+
+def get_application_path(app_id, guild_id=None):
+    return os.path.join(get_apps_directory(guild_id), f"{app_id}.json")
+
+
+def load_application(app_id, guild_id=None):
+    app_path = get_application_path(app_id, guild_id)
+    try:
+        if not os.path.exists(app_path):
+            return load_archived(get_guild_directory(guild_id), app_id)
+        with open(app_path, "r") as f:
+            return json.load(f)
+    except (OSError, EOFError, ValueError, sqlite3.Error, zlib.error) as e:
+        logger.error(f"Error loading application {app_id}: {e}")
+        return None
+
+
+@contextlib.contextmanager
+def lock_application(app_id, guild_id=None):
+    lock_directory = os.path.join(get_guild_directory(guild_id), "locks")
+    os.makedirs(lock_directory, exist_ok=True)
+    stripe = zlib.crc32(app_id.encode()) % LOCK_STRIPES
+    with open(os.path.join(lock_directory, f"{stripe}.lock"), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def save_application(app_id, application, guild_id=None, expected_version=None):
+    try:
+        app_path = get_application_path(app_id, guild_id)
+        with lock_application(app_id, guild_id):
+            current = load_application(app_id, guild_id)
+            version = current.get("version", 0) if current else 0
+            if expected_version is not None and version != expected_version:
+                logger.warning(
+                    f"Not saving application {app_id}: expected version "
+                    f"{expected_version} but found {version}"
+                )
+                return False
+            application["version"] = version + 1
+            with open(f"{app_path}.tmp", "w") as f:
+                json.dump(application, f)
+            os.replace(f"{app_path}.tmp", app_path)
+        directory = get_guild_directory(guild_id)
+        record_status_change(directory, current, application)
+        if index_exists(directory):
+            was_current = is_current(directory)
+            index_application(directory, app_id, application)
+            record_application(directory, app_id, application, was_current)
+        if history_exists(directory):
+            record_history(directory, app_id, application)
+        if analytics_exists(directory):
+            record_header(directory, app_id, application)
+        if duplicates_exist(directory):
+            index_signature(directory, app_id, application)
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        logger.error(f"Error saving application {app_id}: {e}")
+        return False
+
+
+def delete_application(app_id, guild_id=None):
+    app_path = get_application_path(app_id, guild_id)
+    directory = get_guild_directory(guild_id)
+    deleted = remove_archived(directory, app_id)
+    if os.path.exists(app_path):
+        os.remove(app_path)
+    elif not deleted:
+        return False
+    if index_exists(directory):
+        was_current = is_current(directory)
+        remove_application(directory, app_id)
+        forget_application(directory, app_id, was_current)
+    if history_exists(directory):
+        remove_history(directory, app_id)
+    if analytics_exists(directory):
+        remove_header(directory, app_id)
+    if duplicates_exist(directory):
+        remove_signature(directory, app_id)
+    return True
+
+
+def iter_applications(guild_id=None, include_archived=True):
+    apps_directory = get_apps_directory(guild_id)
+    app_ids = set()
+    for filename in os.listdir(apps_directory):
+        if not filename.endswith(".json"):
+            continue
+        app_ids.add(filename[:-5])
+        try:
+            with open(os.path.join(apps_directory, filename), "r") as f:
+                yield filename[:-5], json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading application file {filename}: {e}")
+    if not include_archived:
+        return
+    for app_id, application in iter_archived(get_guild_directory(guild_id)):
+        if app_id not in app_ids:
+            yield app_id, application
+
+
+def compact_applications(guild_id=None, older_than_days=30, batch_size=500):
+    apps_directory = get_apps_directory(guild_id)
+    directory = get_guild_directory(guild_id)
+    cutoff = time.time() - older_than_days * 86400
+    archived = 0
+    batch = []
+
+    def flush():
+        append_records(directory, [(app_id, app) for app_id, app, _, _ in batch])
+        for app_id, _, path, modified in batch:
+            with lock_application(app_id, guild_id):
+                if os.path.exists(path) and os.path.getmtime(path) == modified:
+                    os.remove(path)
+        count = len(batch)
+        batch.clear()
+        return count
+
+    for filename in os.listdir(apps_directory):
+        if not filename.endswith(".json"):
+            continue
+        path = os.path.join(apps_directory, filename)
+        try:
+            modified = os.path.getmtime(path)
+            if modified > cutoff:
+                continue
+            with open(path, "r") as f:
+                application = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading application file {filename}: {e}")
+            continue
+        if application.get("status") not in ["approved", "rejected"]:
+            continue
+        batch.append((filename[:-5], application, path, modified))
+        if len(batch) >= batch_size:
+            archived += flush()
+    if batch:
+        archived += flush()
+    return archived
+
+
+def ensure_search_index(guild_id=None):
+    directory = get_guild_directory(guild_id)
+    if index_exists(directory):
+        return directory
+    with index_build_lock:
+        if not index_exists(directory):
+            count = rebuild_index(directory, iter_applications(guild_id))
+            logger.info(f"Built search index with {count} applications in {directory}")
+    return directory
+
+
+def search_applications(text, guild_id=None, positions=None, limit=50):
+    return search(ensure_search_index(guild_id), text, positions, limit)
+
+
+def list_applications(guild_id=None):
+    return get_summaries(ensure_search_index(guild_id))
+
+
+def count_applications(guild_id=None):
+    return get_status_counts(ensure_search_index(guild_id))
+
+
+def lookup_applicants(prefix, guild_id=None, positions=None, limit=10):
+    return get_index(ensure_search_index(guild_id)).search(prefix, positions, limit)
+
+
+def ensure_duplicate_index(guild_id=None):
+    directory = get_guild_directory(guild_id)
+    if duplicates_exist(directory):
+        return directory
+    with index_build_lock:
+        if not duplicates_exist(directory):
+            count = rebuild_signatures(directory, iter_applications(guild_id))
+            logger.info(
+                f"Built duplicate index with {count} applications in {directory}"
+            )
+    return directory
+
+
+def get_application_duplicates(app_id, guild_id=None, positions=None):
+    try:
+        return find_duplicates(ensure_duplicate_index(guild_id), app_id, positions)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        logger.error(f"Error looking up duplicates of application {app_id}: {e}")
+        return []
+
+
+def iter_history_entries(guild_id=None):
+    for app_id, application in iter_applications(guild_id):
+        app_path = get_application_path(app_id, guild_id)
+        if not application.get("submitted_at") and os.path.exists(app_path):
+            application["submitted_at"] = datetime.datetime.fromtimestamp(
+                os.path.getmtime(app_path), datetime.UTC
+            ).isoformat()
+        yield app_id, application
+
+
+def ensure_history(guild_id=None):
+    directory = get_guild_directory(guild_id)
+    if history_exists(directory):
+        return directory
+    with index_build_lock:
+        if not history_exists(directory):
+            count = rebuild_history(directory, iter_history_entries(guild_id))
+            logger.info(
+                f"Built application history with {count} entries in {directory}"
+            )
+    return directory
+
+
+def get_application_history(user_id, guild_id=None):
+    return get_user_history(ensure_history(guild_id), user_id)
+
+
+def record_event(position, metric, guild_id=None):
+    return record_rollup(get_guild_directory(guild_id), position, {metric: 1})
+
+
+def record_status_change(directory, previous, application):
+    position = application.get("position", "")
+    if previous is None and application.get("submitted_at"):
+        record_rollup(
+            directory, position, {"submitted": 1}, application["submitted_at"]
+        )
+    if previous is not None and previous.get("status") in ["approved", "rejected"]:
+        if application.get("status") not in ["approved", "rejected"]:
+            processed_at, values = get_decision_values(previous)
+            record_rollup(
+                directory,
+                position,
+                {metric: -value for metric, value in values.items()},
+                processed_at,
+            )
+        return
+    processed_at, values = get_decision_values(application)
+    if values:
+        record_rollup(directory, position, values, processed_at)
+
+
+def ensure_rollups(guild_id=None):
+    directory = get_guild_directory(guild_id)
+    if is_backfilled(directory):
+        return directory
+    with index_build_lock:
+        if not is_backfilled(directory):
+            count = backfill_rollups(directory, iter_applications(guild_id))
+            logger.info(
+                f"Backfilled daily rollups from {count} applications in {directory}"
+            )
+    return directory
+
+
+def get_application_trends(guild_id=None, days=30, positions=None):
+    return get_trends(ensure_rollups(guild_id), days, positions)
+
+
+def ensure_analytics(guild_id=None):
+    directory = get_guild_directory(guild_id)
+    if analytics_exists(directory):
+        return directory
+    with index_build_lock:
+        if not analytics_exists(directory):
+            count = rebuild_headers(directory, iter_applications(guild_id))
+            logger.info(
+                f"Built analytics columns with {count} applications in {directory}"
+            )
+    return directory
+
+
+def ensure_indexes():
+    for guild_id in get_guild_ids():
+        try:
+            ensure_search_index(guild_id)
+            ensure_history(guild_id)
+            ensure_rollups(guild_id)
+            ensure_analytics(guild_id)
+            ensure_duplicate_index(guild_id)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.error(f"Error building indexes for guild {guild_id}: {e}")
+
+
+def get_application_reports(guild_id=None, days=None, positions=None):
+    directory = ensure_analytics(guild_id)
+    since = None
+    if days:
+        since = datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=days)
+    sessions = get_totals(ensure_rollups(guild_id), since, positions)
+    return get_report(
+        directory, since.timestamp() if since else None, positions, sessions
+    )
+
+
+def get_last_submission_time(user_id, position, guild_id=None):
+    submitted_at = get_last_submission(ensure_history(guild_id), user_id, position)
+    if not submitted_at:
+        return None
+    return datetime.datetime.fromisoformat(submitted_at)
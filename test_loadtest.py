@@ -0,0 +1,21 @@
+import asyncio
+
+import pytest
+
+import loadtest
+
+FLOWS = {"apply", "start", "answer", "submit", "decide"}
+
+
+@pytest.mark.parametrize("options", [[], ["--modal"], ["--digest"], ["--burst"]])
+def test_flows_stay_within_rest_budgets(tmp_path, monkeypatch, options):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SERVER_ID", str(loadtest.GUILD_ID))
+    args = loadtest.parse_args(["--applicants", "3", "--concurrency", "3", *options])
+    components, rest_metrics = loadtest.prepare(args, str(tmp_path))
+    rest_metrics.flow_stats.clear()
+    rest_metrics.route_calls.clear()
+    report = asyncio.run(loadtest.run(args, components, rest_metrics))
+    assert not any(report["integrity"].values())
+    assert FLOWS <= set(report["flows"])
+    assert rest_metrics.get_budget_violations() == {}
@@ -1,27 +1,43 @@
+import asyncio
 import datetime
 import json
 import logging
 import math
 import os
-import pathlib
 import secrets
+import sys
 import urllib.parse
-import uuid
 from datetime import UTC
 import aiohttp
 import aiohttp_jinja2
 import discord
 import jinja2
 from aiohttp import web
-from dotenv import load_dotenv
-from application_components import StaffApplicationView
-from panels_manager import load_panels, save_panels
-from question_manager import load_questions, save_questions
+from ipc import IPC_SOCKET, IPCBackend, LocalBackend
+from log_config import queue_handlers, setup_logging
+from panels_manager import get_panel_index, load_panels, update_panel_positions
+from answer_screening import load_blocklists, rename_blocklist, save_blocklist
+from question_manager import (
+    get_application_questions,
+    load_questions,
+    save_questions,
+)
+from storage_manager import (
+    count_applications,
+    get_application_duplicates,
+    get_application_history,
+    get_application_reports,
+    get_application_trends,
+    list_applications,
+    load_application,
+    lookup_applicants,
+    save_application,
+    search_applications,
+)
+from storage_manager import delete_application as delete_application_record
 
-load_dotenv()
 WEB_HOST = os.getenv("WEB_HOST", "localhost")
 WEB_PORT = int(os.getenv("WEB_PORT") or 8080)
-APPS_DIRECTORY = "storage/applications"
 CLIENT_ID = os.getenv("OAUTH_CLIENT_ID")
 CLIENT_SECRET = os.getenv("OAUTH_CLIENT_SECRET")
 REDIRECT_URI = os.getenv("OAUTH_REDIRECT_URI", "http://localhost:8080/auth/callback")
@@ -29,55 +45,66 @@ SERVER_ID = os.getenv("SERVER_ID")
 API_ENDPOINT = "https://discord.com/api/v10"
 TOKEN_URL = f"{API_ENDPOINT}/oauth2/token"
 USER_URL = f"{API_ENDPOINT}/users/@me"
-bot = None
-pathlib.Path(APPS_DIRECTORY).mkdir(exist_ok=True)
+ACCESSIBLE_GUILDS_TTL = 60
+backend = None
 oauth_states = {}
-sessions = {}
-PANELS_DIRECTORY = "storage"
-pathlib.Path(PANELS_DIRECTORY).mkdir(exist_ok=True)
+
+
+async def guild_processor(request):
+    return {
+        "guilds": request.get("guilds", []),
+        "current_guild_id": request.get("guild_id"),
+    }
 
 
 def setup_jinja2(app):
     aiohttp_jinja2.setup(
         app,
         loader=jinja2.FileSystemLoader("static/templates"),
-        context_processors=[aiohttp_jinja2.request_processor],
+        context_processors=[aiohttp_jinja2.request_processor, guild_processor],
         filters={"json": json.dumps},
     )
 
 
 class SimpleAccessFormatter(logging.Formatter):
     def format(self, record):
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S,%f")[:-3]
-        parts = record.getMessage().split('"')
-        if len(parts) >= 3:
-            ip = parts[0].split()[0]
-            request = parts[1]
-            status_size = parts[2].strip()
-            return f"{timestamp} - {ip} {request} {status_size}"
-        return f"{timestamp} - {record.getMessage()}"
+        timestamp = self.formatTime(record)
+        if not hasattr(record, "first_request_line"):
+            return f"{timestamp} - {record.getMessage()}"
+        return f"{timestamp} - {record.remote_address} {record.first_request_line} {record.response_status} {record.response_size}"
 
 
 access_log_format = SimpleAccessFormatter()
 
 
+async def authenticate(request):
+    session_id = request.cookies.get("session_id")
+    user = await backend.get_session(session_id) if session_id else None
+    if not user:
+        return web.HTTPFound("/auth/login")
+    request["session_id"] = session_id
+    request["user"] = user
+    request["guild_id"] = user.get("guild_id", SERVER_ID)
+    server = await backend.get_guild(request["guild_id"])
+    if not server:
+        return web.Response(text="Server not found", status=404)
+    member = await backend.get_member(request["guild_id"], user["user_id"])
+    if not member:
+        return web.Response(text="User not found in server", status=404)
+    request["member"] = member
+    request["user_permissions"] = {
+        "is_admin": member["is_admin"],
+    }
+    return None
+
+
 def auth_required(handler):
     async def wrapper(request):
-        session_id = request.cookies.get("session_id")
-        if not session_id or session_id not in sessions:
-            return web.HTTPFound("/auth/login")
-        user = sessions[session_id]
-        request["user"] = user
-        server = bot.get_guild(int(SERVER_ID))
-        if not server:
-            return web.Response(text="Server not found", status=404)
-        member = server.get_member(int(user["user_id"]))
-        if not member:
-            return web.Response(text="User not found in server", status=404)
-        is_admin = member.guild_permissions.administrator
-        request["user_permissions"] = {
-            "is_admin": is_admin,
-        }
+        if "member" not in request:
+            error_response = await authenticate(request)
+            if error_response is not None:
+                return error_response
+        request["guilds"] = await get_session_guilds(request)
         return await handler(request)
 
     return wrapper
@@ -91,21 +118,10 @@ async def auth_middleware(request, handler):
         "/auth/logout",
     ] or request.path.startswith("/static/"):
         return await handler(request)
-    session_id = request.cookies.get("session_id")
-    if not session_id or session_id not in sessions:
-        return web.HTTPFound("/auth/login")
-    user = sessions[session_id]
-    request["user"] = user
-    server = bot.get_guild(int(SERVER_ID))
-    if not server:
-        return web.Response(text="Server not found", status=404)
-    member = server.get_member(int(user["user_id"]))
-    if not member:
-        return web.Response(text="User not found in server", status=404)
-    is_admin = member.guild_permissions.administrator
-    request["user_permissions"] = {
-        "is_admin": is_admin,
-    }
+    error_response = await authenticate(request)
+    if error_response is not None:
+        return error_response
+    is_admin = request["user_permissions"]["is_admin"]
     admin_routes = [
         "/positions",
         "/panel-creator",
@@ -132,10 +148,12 @@ async def error_middleware(request, handler):
 
 
 async def handle_404(request):
-    server_info = await get_server_info()
+    server_info = await get_server_info(request.get("guild_id"))
     user_info = {}
     if "user" in request and "user_id" in request["user"]:
-        user_info = await get_user_info(request["user"]["user_id"])
+        user_info = await get_user_info(
+            request["user"]["user_id"], request.get("guild_id")
+        )
     return aiohttp_jinja2.render_template(
         "404.html",
         request,
@@ -148,25 +166,23 @@ async def handle_404(request):
 
 
 async def handle_403(request, context="general"):
-    server_info = await get_server_info()
+    server_info = await get_server_info(request.get("guild_id"))
     user_info = {"name": "Guest", "avatar": None, "id": None}
     is_admin = False
     if "user" in request and "user_id" in request["user"]:
-        user_info = await get_user_info(request["user"]["user_id"])
+        user_info = await get_user_info(
+            request["user"]["user_id"], request.get("guild_id")
+        )
         is_admin = request.get("user_permissions", {}).get("is_admin", False)
-    elif hasattr(request, "_user_data"):
+    elif hasattr(request, "_user_data") and SERVER_ID:
         user_data = request._user_data
-        server = bot.get_guild(int(SERVER_ID))
-        if server:
-            member = server.get_member(int(user_data["id"]))
-            if member:
-                user_info = {
-                    "name": member.name,
-                    "avatar": member.display_avatar.url
-                    if member.display_avatar
-                    else None,
-                    "id": str(member.id),
-                }
+        member = await backend.get_member(SERVER_ID, user_data["id"])
+        if member:
+            user_info = {
+                "name": member["name"],
+                "avatar": member["avatar"],
+                "id": member["id"],
+            }
     return aiohttp_jinja2.render_template(
         "403.html",
         request,
@@ -182,41 +198,52 @@ async def handle_403(request, context="general"):
 
 async def get_session(request):
     session_id = request.cookies.get("session_id")
-    if not session_id or session_id not in sessions:
+    session = await backend.get_session(session_id) if session_id else None
+    if not session:
         raise web.HTTPUnauthorized(text="Invalid session")
-    return sessions[session_id]
+    return session
 
 
-async def get_user_info(user_id):
-    server = bot.get_guild(int(SERVER_ID))
-    if not server:
-        return None
-    member = server.get_member(int(user_id))
-    if not member:
-        return None
-    return {
-        "id": str(member.id),
-        "name": member.name,
-        "avatar": member.display_avatar.url if member.display_avatar else None,
-        "roles": [str(role.id) for role in member.roles],
-        "is_admin": member.guild_permissions.administrator,
-    }
+async def get_user_info(user_id, guild_id=None):
+    return await backend.get_member(guild_id or SERVER_ID, user_id)
 
 
 def has_position_viewer_access(member, position_data):
     if not member:
         return False
-    if member.guild_permissions.administrator:
+    if member["is_admin"]:
         return True
     viewer_roles = position_data.get("viewer_roles", [])
-    member_role_ids = [str(role.id) for role in member.roles]
-    return any(role_id in member_role_ids for role_id in viewer_roles)
+    return any(role_id in member["roles"] for role_id in viewer_roles)
+
+
+async def get_accessible_guilds(user_id):
+    guilds = []
+    for guild in await backend.get_user_guilds(user_id):
+        member = guild.pop("member")
+        if not member["is_admin"] and not any(
+            has_position_viewer_access(member, position_data)
+            for position_data in load_questions(guild["id"]).values()
+        ):
+            continue
+        guilds.append(guild)
+    return guilds
+
+
+async def get_session_guilds(request):
+    user = request["user"]
+    now = datetime.datetime.now().timestamp()
+    if now - user.get("guilds_checked_at", 0) > ACCESSIBLE_GUILDS_TTL:
+        user["guilds"] = await get_accessible_guilds(user["user_id"])
+        user["guilds_checked_at"] = now
+        await backend.save_session(request["session_id"], user)
+    return user["guilds"]
 
 
 def get_accessible_positions(member, all_positions):
     if not member:
         return {}
-    if member.guild_permissions.administrator:
+    if member["is_admin"]:
         return all_positions
     accessible_positions = {}
     for position, data in all_positions.items():
@@ -225,46 +252,21 @@ def get_accessible_positions(member, all_positions):
     return accessible_positions
 
 
-async def get_application_stats():
+async def get_application_stats(guild_id=None):
     try:
-        applications = []
-        for filename in os.listdir(APPS_DIRECTORY):
-            if filename.endswith(".json"):
-                with open(os.path.join(APPS_DIRECTORY, filename), "r") as f:
-                    applications.append(json.load(f))
-        total = len(applications)
-        pending = sum(
-            1
-            for app in applications
-            if app.get("status", "pending").lower() == "pending"
-        )
-        approved = sum(
-            1 for app in applications if app.get("status", "").lower() == "approved"
-        )
-        rejected = sum(
-            1 for app in applications if app.get("status", "").lower() == "rejected"
-        )
+        counts = await asyncio.to_thread(count_applications, guild_id)
         return {
-            "total": total,
-            "pending": pending,
-            "approved": approved,
-            "rejected": rejected,
+            "total": sum(counts.values()),
+            "pending": counts.get("pending", 0),
+            "approved": counts.get("approved", 0),
+            "rejected": counts.get("rejected", 0),
         }
     except Exception:
         return {"total": 0, "pending": 0, "approved": 0, "rejected": 0}
 
 
-async def load_applications():
-    applications = []
-    for filename in os.listdir(APPS_DIRECTORY):
-        if filename.endswith(".json"):
-            with open(os.path.join(APPS_DIRECTORY, filename), "r") as f:
-                app = json.load(f)
-                app["id"] = filename[:-5]
-                if "status" not in app:
-                    app["status"] = "pending"
-                applications.append(app)
-    return applications
+async def load_applications(guild_id=None):
+    return await asyncio.to_thread(list_applications, guild_id)
 
 
 routes = web.RouteTableDef()
@@ -309,29 +311,27 @@ async def auth_callback(request):
                 if user_response.status != 200:
                     return web.Response(text="Failed to get user info", status=400)
                 user_data = await user_response.json()
-                server = bot.get_guild(int(SERVER_ID))
-                if not server:
-                    return web.Response(text="Server not found", status=404)
-                member = server.get_member(int(user_data["id"]))
-                if not member:
-                    return web.Response(text="User not found in server", status=404)
-                is_admin = member.guild_permissions.administrator
-                all_positions = load_questions()
-                has_any_viewer_access = False
-                for position_data in all_positions.values():
-                    if has_position_viewer_access(member, position_data):
-                        has_any_viewer_access = True
-                        break
-                if not is_admin and not has_any_viewer_access:
+                guilds = await get_accessible_guilds(user_data["id"])
+                if not guilds:
                     request._user_data = user_data
                     return await handle_403(request)
+                guild_ids = [guild["id"] for guild in guilds]
                 session_id = secrets.token_urlsafe(32)
-                sessions[session_id] = {
-                    "user_id": user_data["id"],
-                    "username": user_data["username"],
-                    "avatar": user_data.get("avatar"),
-                    "created_at": datetime.datetime.now().timestamp(),
-                }
+                created_at = datetime.datetime.now().timestamp()
+                await backend.save_session(
+                    session_id,
+                    {
+                        "user_id": user_data["id"],
+                        "username": user_data["username"],
+                        "avatar": user_data.get("avatar"),
+                        "guild_id": SERVER_ID
+                        if SERVER_ID in guild_ids
+                        else guild_ids[0],
+                        "guilds": guilds,
+                        "guilds_checked_at": created_at,
+                        "created_at": created_at,
+                    },
+                )
                 response = web.HTTPFound("/")
                 response.set_cookie(
                     "session_id", session_id, httponly=True, max_age=86400
@@ -342,40 +342,55 @@ async def auth_callback(request):
 @routes.get("/auth/logout")
 async def auth_logout(request):
     session_id = request.cookies.get("session_id")
-    if session_id and session_id in sessions:
-        del sessions[session_id]
+    if session_id:
+        await backend.delete_session(session_id)
     response = web.HTTPFound("/auth/login")
     response.del_cookie("session_id")
     return response
 
 
-async def get_server_info():
-    server = bot.get_guild(int(SERVER_ID))
+@routes.get("/guilds/{guild_id}")
+@auth_required
+async def switch_guild(request):
+    guild_id = request.match_info["guild_id"]
+    if guild_id not in [guild["id"] for guild in request["guilds"]]:
+        return await handle_403(request)
+    request["user"]["guild_id"] = guild_id
+    await backend.save_session(request["session_id"], request["user"])
+    return web.HTTPFound("/")
+
+
+async def get_server_info(guild_id=None):
+    server = await backend.get_guild(guild_id or SERVER_ID)
     if server:
         return {
-            "name": server.name,
-            "icon": server.icon.url if server.icon else None,
-            "member_count": server.member_count,
+            "name": server["name"],
+            "icon": server["icon"],
+            "member_count": server["member_count"],
         }
     return None
 
 
+def get_assignable_roles(guild):
+    return [
+        {"id": role["id"], "name": role["name"], "color": role["color"]}
+        for role in guild["roles"]
+        if role["name"] != "@everyone" and not role["managed"]
+    ]
+
+
 @routes.get("/")
 @auth_required
 async def index(request):
     session = await get_session(request)
     user_id = session["user_id"]
-    server = await get_server_info()
-    user = await get_user_info(user_id)
-    stats = await get_application_stats()
-    positions = load_questions()
-    panels = load_panels()
-    guild = bot.get_guild(int(SERVER_ID))
-    roles = [
-        {"id": str(role.id), "name": role.name}
-        for role in guild.roles
-        if role.name != "@everyone" and not role.managed
-    ]
+    guild_id = request["guild_id"]
+    server = await get_server_info(guild_id)
+    user = await get_user_info(user_id, guild_id)
+    stats = await get_application_stats(guild_id)
+    positions = load_questions(guild_id)
+    panels = load_panels(guild_id)
+    roles = get_assignable_roles(await backend.get_guild(guild_id))
     return aiohttp_jinja2.render_template(
         "index.html",
         request,
@@ -397,28 +412,39 @@ async def applications(request):
     user = request["user"]
     user_permissions = request["user_permissions"]
     is_admin = user_permissions.get("is_admin", False)
-    server = bot.get_guild(int(SERVER_ID))
-    if not server:
-        return web.Response(text="Server not found", status=404)
-    member = server.get_member(int(user["user_id"]))
-    if not member:
-        return web.Response(text="User not found in server", status=404)
-    all_positions = load_questions()
+    guild_id = request["guild_id"]
+    member = request["member"]
+    all_positions = load_questions(guild_id)
     accessible_positions = get_accessible_positions(member, all_positions)
     if not accessible_positions and not is_admin:
         return await handle_403(request, "no_positions")
     status = request.query.get("status")
     position = request.query.get("position")
     sort = request.query.get("sort")
+    query = request.query.get("q", "").strip()
+    user_id = request.query.get("user_id")
     page = int(request.query.get("page", 1))
     per_page = 10
-    all_applications = await load_applications()
+    if query:
+        all_applications = await asyncio.to_thread(
+            search_applications,
+            query,
+            guild_id,
+            None if is_admin else list(accessible_positions),
+            500,
+        )
+    else:
+        all_applications = await load_applications(guild_id)
     if not is_admin:
         all_applications = [
             app
             for app in all_applications
             if app.get("position") in accessible_positions
         ]
+    if user_id:
+        all_applications = [
+            app for app in all_applications if str(app.get("user_id")) == user_id
+        ]
     if status:
         all_applications = [
             app
@@ -433,7 +459,7 @@ async def applications(request):
         all_applications.sort(key=lambda app: app.get("id", ""), reverse=True)
     elif sort == "oldest":
         all_applications.sort(key=lambda app: app.get("id", ""))
-    else:
+    elif not query:
         all_applications.sort(key=lambda app: app.get("id", ""), reverse=True)
     total_applications = len(all_applications)
     total_pages = math.ceil(total_applications / per_page)
@@ -444,6 +470,9 @@ async def applications(request):
     start_index = (page - 1) * per_page
     end_index = start_index + per_page
     applications = all_applications[start_index:end_index]
+    members = await backend.get_members(
+        guild_id, [app.get("user_id", "0") for app in applications]
+    )
     for app in applications:
         status = app.get("status", "pending").lower()
         if status == "approved":
@@ -452,26 +481,18 @@ async def applications(request):
             app["status_color"] = "danger"
         else:
             app["status_color"] = "warning"
-        if server:
-            member = server.get_member(int(app.get("user_id", "0")))
-            if member:
-                app["user_avatar"] = (
-                    str(member.display_avatar.url) if member.display_avatar else None
-                )
-                app["user_name"] = member.name
-                app["user_left_server"] = False
-            else:
-                app["user_avatar"] = None
-                app["user_name"] = app.get("user_name", "Unknown User")
-                app["user_left_server"] = True
+        member = members.get(str(app.get("user_id", "0")))
+        if member:
+            app["user_avatar"] = member["avatar"]
+            app["user_name"] = member["name"]
+            app["user_left_server"] = False
         else:
             app["user_avatar"] = None
             app["user_name"] = app.get("user_name", "Unknown User")
             app["user_left_server"] = True
-    questions = load_questions()
-    positions = list(questions.keys())
-    server_info = await get_server_info()
-    user_info = await get_user_info(user["user_id"])
+    positions = list(all_positions.keys())
+    server_info = await get_server_info(guild_id)
+    user_info = await get_user_info(user["user_id"], guild_id)
     context = {
         "applications": applications,
         "total_pages": total_pages,
@@ -490,27 +511,106 @@ async def applications(request):
         context["position"] = position
     if sort:
         context["sort"] = sort
+    if query:
+        context["q"] = query
+    if user_id:
+        context["user_id"] = user_id
     return aiohttp_jinja2.render_template("applications.html", request, context)
 
 
+@routes.get("/api/applicants")
+@auth_required
+async def lookup_applicants_api(request):
+    prefix = request.query.get("prefix", "").strip()
+    if not prefix:
+        return web.json_response({"results": []})
+    guild_id = request["guild_id"]
+    positions = None
+    if not request["user_permissions"]["is_admin"]:
+        positions = set(
+            get_accessible_positions(request["member"], load_questions(guild_id))
+        )
+    results = await asyncio.to_thread(lookup_applicants, prefix, guild_id, positions)
+    return web.json_response({"results": results})
+
+
+@routes.get("/api/search")
+@auth_required
+async def search_applications_api(request):
+    query = request.query.get("q", "").strip()
+    try:
+        limit = min(int(request.query.get("limit", 20)), 100)
+    except ValueError:
+        return web.json_response({"error": "Invalid limit"}, status=400)
+    if not query:
+        return web.json_response({"results": []})
+    guild_id = request["guild_id"]
+    positions = None
+    if not request["user_permissions"]["is_admin"]:
+        positions = list(
+            get_accessible_positions(request["member"], load_questions(guild_id))
+        )
+    results = await asyncio.to_thread(
+        search_applications, query, guild_id, positions, limit
+    )
+    return web.json_response({"results": results})
+
+
+@routes.get("/api/analytics/trends")
+@auth_required
+async def application_trends_api(request):
+    try:
+        days = min(max(int(request.query.get("days", 30)), 1), 365)
+    except ValueError:
+        return web.json_response({"error": "Invalid days"}, status=400)
+    guild_id = request["guild_id"]
+    positions = None
+    if not request["user_permissions"]["is_admin"]:
+        positions = set(
+            get_accessible_positions(request["member"], load_questions(guild_id))
+        )
+    trends = await asyncio.to_thread(get_application_trends, guild_id, days, positions)
+    return web.json_response(trends)
+
+
+@routes.get("/api/analytics/reports")
+@auth_required
+async def application_reports_api(request):
+    try:
+        days = max(int(request.query.get("days", 0)), 0)
+    except ValueError:
+        return web.json_response({"error": "Invalid days"}, status=400)
+    guild_id = request["guild_id"]
+    positions = None
+    if not request["user_permissions"]["is_admin"]:
+        positions = set(
+            get_accessible_positions(request["member"], load_questions(guild_id))
+        )
+    reports = await asyncio.to_thread(
+        get_application_reports, guild_id, days, positions
+    )
+    return web.json_response(reports)
+
+
+@routes.get("/api/metrics/rest")
+@auth_required
+async def rest_metrics_api(request):
+    if not request["user_permissions"]["is_admin"]:
+        return web.json_response({"error": "Admin privileges required"}, status=403)
+    return web.json_response({"flows": await backend.get_rest_metrics()})
+
+
 @routes.get("/positions")
 @auth_required
 async def questions(request):
     user = request["user"]
-    positions = load_questions()
-    server = await get_server_info()
-    user_info = await get_user_info(user["user_id"])
-    guild = bot.get_guild(int(SERVER_ID))
-    channels = [
-        {"id": str(channel.id), "name": channel.name}
-        for channel in guild.channels
-        if isinstance(channel, discord.TextChannel)
-    ]
-    roles = [
-        {"id": str(role.id), "name": role.name, "color": f"#{role.color.value:06x}"}
-        for role in guild.roles
-        if role.name != "@everyone" and not role.managed
-    ]
+    guild_id = request["guild_id"]
+    positions = load_questions(guild_id)
+    server = await get_server_info(guild_id)
+    user_info = await get_user_info(user["user_id"], guild_id)
+    guild = await backend.get_guild(guild_id)
+    channels = guild["text_channels"]
+    roles = get_assignable_roles(guild)
     return aiohttp_jinja2.render_template(
         "positions.html",
         request,
@@ -531,22 +631,13 @@ async def application(request):
     user = request["user"]
     user_permissions = request["user_permissions"]
     application_id = request.match_info["id"]
-    app_path = os.path.join(APPS_DIRECTORY, f"{application_id}.json")
-    if not os.path.exists(app_path):
+    guild_id = request["guild_id"]
+    application = load_application(application_id, guild_id)
+    if application is None:
         return web.Response(text="Application not found", status=404)
-    try:
-        with open(app_path, "r") as f:
-            application = json.load(f)
-    except Exception:
-        return web.Response(text="Failed to load application", status=500)
     is_admin = user_permissions.get("is_admin", False)
-    server = bot.get_guild(int(SERVER_ID))
-    if not server:
-        return web.Response(text="Server not found", status=404)
-    member = server.get_member(int(user["user_id"]))
-    if not member:
-        return web.Response(text="User not found in server", status=404)
-    all_positions = load_questions()
+    member = request["member"]
+    all_positions = load_questions(guild_id)
     app_position = application.get("position")
     if not app_position or app_position not in all_positions:
         return web.Response(text="Application position not found", status=404)
@@ -561,25 +652,20 @@ async def application(request):
         application["status_color"] = "danger"
     else:
         application["status_color"] = "warning"
-    server_info = await get_server_info()
-    if server:
-        member = server.get_member(int(application.get("user_id", "0")))
-        if member:
-            application["user_avatar"] = (
-                str(member.display_avatar.url) if member.display_avatar else None
-            )
-            application["user_name"] = member.name
-            application["user_left_server"] = False
-        else:
-            application["user_avatar"] = None
-            application["user_name"] = application.get("user_name", "Unknown User")
-            application["user_left_server"] = True
+    server_info = await get_server_info(guild_id)
+    member = await backend.get_member(guild_id, application.get("user_id", "0"))
+    if member:
+        application["user_avatar"] = member["avatar"]
+        application["user_name"] = member["name"]
+        application["user_left_server"] = False
     else:
         application["user_avatar"] = None
         application["user_name"] = application.get("user_name", "Unknown User")
         application["user_left_server"] = True
-    questions_text = application.get("questions", [])
+    questions_text = get_application_questions(application, guild_id)
     answers = application.get("answers", [])
+    for pair in application.get("questions_answers", []):
+        answers.append(pair.get("answer", ""))
     application["questions"] = [
         {
             "question": questions_text[i],
@@ -588,12 +674,30 @@ async def application(request):
         for i in range(len(questions_text))
     ]
     application["id"] = application_id
-    user_info = await get_user_info(user["user_id"])
+    accessible_positions = get_accessible_positions(request["member"], all_positions)
+    duplicates = await asyncio.to_thread(
+        get_application_duplicates,
+        application_id,
+        guild_id,
+        None if is_admin else set(accessible_positions),
+    )
+    history = await asyncio.to_thread(
+        get_application_history, application.get("user_id"), guild_id
+    )
+    history = [
+        entry
+        for entry in history
+        if entry["id"] != application_id
+        and (is_admin or entry["position"] in accessible_positions)
+    ]
+    user_info = await get_user_info(user["user_id"], guild_id)
     return aiohttp_jinja2.render_template(
         "application.html",
         request,
         {
             "application": application,
+            "history": history,
+            "duplicates": duplicates,
             "user": user_info,
             "server": server_info,
             "is_admin": is_admin,
@@ -604,11 +708,9 @@ async def application(request):
 @routes.delete("/api/applications/{app_id}")
 async def delete_application(request):
     app_id = request.match_info["app_id"]
-    json_path = os.path.join(APPS_DIRECTORY, f"{app_id}.json")
-    if not os.path.exists(json_path):
-        return web.json_response({"error": "Application not found"}, status=404)
     try:
-        os.remove(json_path)
+        if not delete_application_record(app_id, request["guild_id"]):
+            return web.json_response({"error": "Application not found"}, status=404)
         return web.json_response({"message": "Application deleted successfully"})
     except Exception as e:
         return web.json_response({"error": str(e)}, status=500)
@@ -622,11 +724,16 @@ async def add_position(request):
         copy_from = data.get("copy_from")
         if not position_name:
             return web.Response(text="Position name is required", status=400)
-        questions = load_questions()
+        questions = load_questions(request["guild_id"])
         if position_name in questions:
             return web.Response(text="Position already exists", status=400)
         if copy_from and copy_from in questions:
             questions[position_name] = questions[copy_from].copy()
+            save_blocklist(
+                position_name,
+                load_blocklists(request["guild_id"]).get(copy_from, []),
+                request["guild_id"],
+            )
         else:
             questions[position_name] = {
                 "enabled": True,
@@ -640,7 +747,7 @@ async def add_position(request):
                 "button_roles": [],
                 "denied_removal_roles": [],
             }
-        save_questions(questions)
+        save_questions(questions, request["guild_id"])
         return web.Response(text="Position added successfully")
     except Exception as e:
         return web.Response(text=str(e), status=500)
@@ -653,10 +760,14 @@ async def delete_position(request):
         position = data.get("position")
         if not position:
             return web.Response(text="Position name is required", status=400)
-        questions = load_questions()
+        questions = load_questions(request["guild_id"])
         if position in questions:
             del questions[position]
-            save_questions(questions)
+            save_questions(questions, request["guild_id"])
+            save_blocklist(position, [], request["guild_id"])
+            panel_ids = update_panel_positions(request["guild_id"], position)
+            if panel_ids:
+                await backend.render_panels(request["guild_id"], panel_ids)
             return web.Response(text="Position deleted successfully")
         else:
             return web.Response(text="Position not found", status=404)
@@ -672,10 +783,10 @@ async def add_question(request):
         question = data.get("question")
         if not position or not question:
             return web.Response(text="Position and question are required", status=400)
-        questions = load_questions()
+        questions = load_questions(request["guild_id"])
         if position in questions:
             questions[position].append(question)
-            save_questions(questions)
+            save_questions(questions, request["guild_id"])
             return web.Response(text="Question added successfully")
         else:
             return web.Response(text="Position not found", status=404)
@@ -691,10 +802,10 @@ async def remove_question(request):
         index = data.get("index")
         if position is None or index is None:
             return web.Response(text="Position and index are required", status=400)
-        questions = load_questions()
+        questions = load_questions(request["guild_id"])
         if position in questions and 0 <= index < len(questions[position]):
             questions[position].pop(index)
-            save_questions(questions)
+            save_questions(questions, request["guild_id"])
             return web.Response(text="Question removed successfully")
         else:
             return web.Response(text="Position or index not found", status=404)
@@ -713,10 +824,10 @@ async def update_question(request):
             return web.Response(
                 text="Position, index, and question are required", status=400
             )
-        questions = load_questions()
+        questions = load_questions(request["guild_id"])
         if position in questions and 0 <= index < len(questions[position]):
             questions[position][index] = question
-            save_questions(questions)
+            save_questions(questions, request["guild_id"])
             return web.Response(text="Question updated successfully")
         else:
             return web.Response(text="Position or index not found", status=404)
@@ -729,9 +840,10 @@ async def update_question(request):
 async def panel_creator(request):
     session = await get_session(request)
     user_id = session["user_id"]
-    user = await get_user_info(user_id)
-    server = await get_server_info()
-    positions = load_questions().keys()
+    guild_id = request["guild_id"]
+    user = await get_user_info(user_id, guild_id)
+    server = await get_server_info(guild_id)
+    positions = load_questions(guild_id).keys()
     return aiohttp_jinja2.render_template(
         "panel_creator.html",
         request,
@@ -754,10 +866,9 @@ async def create_panel(request):
             return web.Response(
                 text="Invalid channel ID. Channel ID must be a number.", status=400
             )
-        channel = bot.get_channel(channel_id)
-        if not channel:
+        channel = await backend.get_channel(channel_id)
+        if not channel or channel["guild_id"] != request["guild_id"]:
             return web.Response(text="Channel not found", status=404)
-        panel_id = str(uuid.uuid4())
         embed = discord.Embed(
             title=data["title"],
             url=data["url"] if data["url"] else None,
@@ -783,32 +894,23 @@ async def create_panel(request):
                     data["footer"]["icon_url"] if data["footer"]["icon_url"] else None
                 ),
             )
-        select_options = [
-            discord.SelectOption(
-                label=position,
-                value=position,
-                description=f"Apply for {position} position",
-            )
-            for position in data["positions"]
-        ]
-        view = StaffApplicationView(bot, select_options, panel_id)
-        message = await channel.send(embed=embed, view=view)
-        bot.add_view(view, message_id=message.id)
-        panel_data = {
-            "id": panel_id,
-            "channel_id": str(channel.id),
-            "message_id": str(message.id),
-            "positions": data["positions"],
-        }
-        panels = load_panels()
-        panels[panel_id] = panel_data
-        if not save_panels(panels):
+        panel_id = await backend.create_panel(
+            channel_id, embed.to_dict(), data["positions"]
+        )
+        if not panel_id:
             return web.Response(text="Failed to save panel data", status=500)
         return web.Response(text="Panel created successfully")
     except Exception as e:
         return web.Response(text=str(e), status=500)
 
 
+@routes.get("/api/panels/job")
+@auth_required
+async def get_panel_job(request):
+    job = await backend.get_panel_job(request["guild_id"])
+    return web.json_response({"job": job})
+
+
 @routes.post("/api/applications/{app_id}/status")
 @auth_required
 async def update_application_status(request):
@@ -817,8 +919,8 @@ async def update_application_status(request):
             {"success": False, "error": "Admin privileges required"}, status=403
         )
     app_id = request.match_info["app_id"]
-    app_path = os.path.join(APPS_DIRECTORY, f"{app_id}.json")
-    if not os.path.exists(app_path):
+    application = load_application(app_id, request["guild_id"])
+    if application is None:
         return web.json_response(
             {"success": False, "error": "Application not found"}, status=404
         )
@@ -829,16 +931,24 @@ async def update_application_status(request):
             return web.json_response(
                 {"success": False, "error": "Invalid status"}, status=400
             )
-        with open(app_path, "r") as f:
-            application = json.load(f)
+        version = data.get("version", application.get("version", 0))
         application["status"] = "approved" if status == "approve" else "rejected"
         application["processed_by"] = {
             "id": request["user"]["user_id"],
             "name": request["user"]["name"],
             "timestamp": datetime.datetime.now(UTC).isoformat(),
         }
-        with open(app_path, "w") as f:
-            json.dump(application, f)
+        application.pop("claim", None)
+        if not save_application(
+            app_id, application, request["guild_id"], expected_version=version
+        ):
+            return web.json_response(
+                {
+                    "success": False,
+                    "error": "The application was changed by someone else. Reload and try again.",
+                },
+                status=409,
+            )
         return web.json_response({"success": True})
     except Exception as e:
         return web.json_response({"success": False, "error": str(e)}, status=500)
@@ -856,9 +966,10 @@ async def update_position(request):
             return web.Response(
                 text="Position name and settings are required", status=400
             )
-        questions = load_questions()
+        questions = load_questions(request["guild_id"])
         if original_position not in questions:
             return web.Response(text="Position not found", status=404)
+        was_enabled = questions[original_position].get("enabled", True)
         if position_name != original_position:
             if position_name in questions:
                 return web.Response(
@@ -902,9 +1013,31 @@ async def update_position(request):
                 "viewer_roles": settings.get("viewer_roles", []),
                 "auto_thread": settings.get("auto_thread", False),
                 "time_limit": settings.get("time_limit", 60),
+                "answer_mode": settings.get("answer_mode", "dm"),
+                "screening_action": settings.get("screening_action", "flag"),
+                "reapply_cooldown_days": settings.get("reapply_cooldown_days", 0),
+                "log_mode": settings.get("log_mode", "immediate"),
+                "digest_window": settings.get("digest_window", 15),
+                "max_active_sessions": settings.get("max_active_sessions", 0),
             }
         )
-        save_questions(questions)
+        save_questions(questions, request["guild_id"])
+        if position_name != original_position:
+            rename_blocklist(original_position, position_name, request["guild_id"])
+        if "blocked_patterns" in settings:
+            save_blocklist(
+                position_name, settings["blocked_patterns"], request["guild_id"]
+            )
+        if position_name != original_position:
+            panel_ids = update_panel_positions(
+                request["guild_id"], original_position, position_name
+            )
+        elif questions[position_name]["enabled"] != was_enabled:
+            panel_ids = get_panel_index(request["guild_id"]).get(position_name, [])
+        else:
+            panel_ids = []
+        if panel_ids:
+            await backend.render_panels(request["guild_id"], panel_ids)
         return web.Response(text="Position updated successfully")
     except Exception as e:
         return web.Response(text=str(e), status=500)
@@ -914,29 +1047,23 @@ async def update_position(request):
 @auth_required
 async def edit_position(request):
     position = request.match_info["position"]
-    questions = load_questions()
+    guild_id = request["guild_id"]
+    questions = load_questions(guild_id)
     if position not in questions:
         return web.Response(text="Position not found", status=404)
     settings = questions[position]
-    guild = bot.get_guild(int(SERVER_ID))
-    channels = [
-        {"id": str(channel.id), "name": channel.name}
-        for channel in guild.channels
-        if isinstance(channel, discord.TextChannel)
-    ]
-    roles = [
-        {"id": str(role.id), "name": role.name, "color": f"#{role.color.value:06x}"}
-        for role in guild.roles
-        if role.name != "@everyone" and not role.managed
-    ]
-    user = await get_user_info(request["user"]["user_id"])
-    server = await get_server_info()
+    guild = await backend.get_guild(guild_id)
+    channels = guild["text_channels"]
+    roles = get_assignable_roles(guild)
+    user = await get_user_info(request["user"]["user_id"], guild_id)
+    server = await get_server_info(guild_id)
     return aiohttp_jinja2.render_template(
         "edit_position.html",
         request,
         {
             "position": position,
             "settings": settings,
+            "blocked_patterns": load_blocklists(guild_id).get(position, []),
             "channels": channels,
             "roles": roles,
             "user": user,
@@ -951,8 +1078,8 @@ async def edit_position(request):
 async def validate_channel(request):
     channel_id = request.match_info["channel_id"]
     try:
-        channel = bot.get_channel(int(channel_id))
-        if channel is None:
+        channel = await backend.get_channel(int(channel_id))
+        if channel is None or channel["guild_id"] != request["guild_id"]:
             return web.Response(status=404, text="Channel not found")
         return web.Response(status=200, text="Channel exists")
     except ValueError:
@@ -961,37 +1088,40 @@ async def validate_channel(request):
         return web.Response(status=500, text=f"Error: {str(e)}")
 
 
-async def start_web_server(bot_instance):
-    global bot
-    bot = bot_instance
+async def start_web_server(bot_instance=None, backend_instance=None):
+    global backend
+    backend = backend_instance or LocalBackend(bot_instance)
     app = web.Application(middlewares=[auth_middleware, error_middleware])
     setup_jinja2(app)
     app.add_routes(routes)
     app.router.add_static("/static", "static")
-    logging.basicConfig(level=logging.INFO)
-    aiohttp_logger = logging.getLogger("aiohttp.access")
-    aiohttp_logger.setLevel(logging.INFO)
     access_logger = logging.getLogger("aiohttp.access")
     access_logger.setLevel(logging.INFO)
-    access_logger.propagate = False
-    handler = logging.StreamHandler()
-    handler.setFormatter(access_log_format)
-    access_logger.addHandler(handler)
+    if not access_logger.handlers:
+        access_logger.propagate = False
+        handler = logging.StreamHandler()
+        handler.setFormatter(access_log_format)
+        queue_handlers(access_logger, handler)
     runner = web.AppRunner(app)
     await runner.setup()
-    site = web.TCPSite(runner, WEB_HOST, WEB_PORT)
+    site = web.TCPSite(
+        runner, WEB_HOST, WEB_PORT, reuse_port=backend_instance is not None
+    )
     await site.start()
     return runner, site
 
 
 if __name__ == "__main__":
-    import asyncio
-
-    loop = asyncio.get_event_loop()
-    runner, site = loop.run_until_complete(start_web_server(bot))
+    setup_logging(log_file=None)
+    loop = asyncio.new_event_loop()
+    ipc_backend = IPCBackend(sys.argv[1] if len(sys.argv) > 1 else IPC_SOCKET)
+    runner, site = loop.run_until_complete(
+        start_web_server(backend_instance=ipc_backend)
+    )
     try:
         loop.run_forever()
     except KeyboardInterrupt:
         pass
     finally:
         loop.run_until_complete(runner.cleanup())
+        loop.run_until_complete(ipc_backend.close())